@@ -0,0 +1,327 @@
+"""A430仿真器与环境的性能基准
+
+用法：
+    python benchmarks/a430_benchmarks.py --num-aircraft 1 64 4096 --output results.json
+    pytest benchmarks --benchmark-json results.json  # 需要安装pytest-benchmark
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from typing import Callable
+
+import gymnasium as gym
+import numpy as np
+
+import a430py  # noqa: F401
+from a430py.simulator.a430_batch_sim import A430BatchSimulator
+from a430py.simulator.a430_sim import A430Simulator
+
+NUM_AIRCRAFT = [1, 64, 4096]
+BACKENDS = ["ctypes", "numpy"]
+
+# 配平状态：TAS 8m/s，高度2m
+TRIM_STATE = [8.0, 5.344264, 0.0, 0.0, 5.344264, 0.0, 0.0, 0.0, 0.0, 2.0]
+# 列顺序：fStickLat, fStickLon, fThrottle, fRudder
+TRIM_ACTION = [0.0, -1.998228, 0.689030, 0.0]
+# A430Gym的动作中fRudder在fThrottle之前
+TRIM_GYM_ACTION = np.array([0.0, -1.998228, 0.0, 0.689030])
+
+
+def _simulators(
+    num_aircraft: int, backend: str, zero_copy: bool = True
+) -> list[A430Simulator]:
+    sims = [
+        A430Simulator(config={}, zero_copy=zero_copy, backend=backend)
+        for _ in range(num_aircraft)
+    ]
+    for sim in sims:
+        sim.reset(fTAS=8)
+    return sims
+
+
+def _gym_envs(num_aircraft: int, backend: str, env_checker: bool) -> list[gym.Env]:
+    envs = [
+        gym.make(
+            "A430Gym-v0",
+            disable_env_checker=not env_checker,
+            max_steps=sys.maxsize,
+            backend=backend,
+        )
+        for _ in range(num_aircraft)
+    ]
+    for env in envs:
+        env.reset()
+    return envs
+
+
+def setup_simulator_step(num_aircraft: int, backend: str) -> Callable[[], None]:
+    """num_aircraft个A430Simulator各step一拍"""
+    sims = _simulators(num_aircraft, backend)
+
+    def run() -> None:
+        for sim in sims:
+            sim.step(*TRIM_ACTION)
+
+    return run
+
+
+def setup_simulator_step_array(num_aircraft: int, backend: str) -> Callable[[], None]:
+    """num_aircraft个A430Simulator各通过step_array前进一拍"""
+    sims = _simulators(num_aircraft, backend)
+    action = np.array(TRIM_ACTION)
+
+    def run() -> None:
+        for sim in sims:
+            sim.step_array(action)
+
+    return run
+
+
+def setup_simulator_step_dict(num_aircraft: int, backend: str) -> Callable[[], None]:
+    """num_aircraft个A430Simulator（zero_copy=False，每步返回dict）各step一拍"""
+    sims = _simulators(num_aircraft, backend, zero_copy=False)
+
+    def run() -> None:
+        for sim in sims:
+            sim.step(*TRIM_ACTION)
+
+    return run
+
+
+def setup_simulator_reset(num_aircraft: int, backend: str) -> Callable[[], None]:
+    """num_aircraft个A430Simulator各重新创建一次飞机"""
+    sims = _simulators(num_aircraft, backend)
+
+    def run() -> None:
+        for sim in sims:
+            sim.reset(fTAS=8)
+
+    return run
+
+
+def setup_simulator_reset_in_place(
+    num_aircraft: int, backend: str
+) -> Callable[[], None]:
+    """num_aircraft个A430Simulator各原地重置一次"""
+    sims = _simulators(num_aircraft, backend)
+
+    def run() -> None:
+        for sim in sims:
+            sim.reset(fTAS=8, in_place=True)
+
+    return run
+
+
+def setup_step_from_customized_observation(
+    num_aircraft: int, backend: str
+) -> Callable[[], None]:
+    """逐个样本调用step_from_customized_observation，共num_aircraft个样本"""
+    sim = A430Simulator(config={}, backend=backend)
+    sim.reset()
+    samples = [(TRIM_STATE, TRIM_ACTION)] * num_aircraft
+
+    def run() -> None:
+        for state, action in samples:
+            sim.step_from_customized_observation(*state, *action)
+
+    return run
+
+
+def setup_step_from_customized_observations(
+    num_aircraft: int, backend: str
+) -> Callable[[], None]:
+    """一次调用step_from_customized_observations处理num_aircraft个样本"""
+    sim = A430Simulator(config={}, backend=backend)
+    sim.reset()
+    observations = np.tile(TRIM_STATE, (num_aircraft, 1))
+    actions = np.tile(TRIM_ACTION, (num_aircraft, 1))
+    out = np.empty((num_aircraft, len(sim.output_fields)))
+
+    def run() -> None:
+        sim.step_from_customized_observations(observations, actions, out=out)
+
+    return run
+
+
+def setup_gym_step(num_aircraft: int, backend: str) -> Callable[[], None]:
+    """num_aircraft个A430Gym（gym.make，关闭环境检查）各step一次"""
+    envs = _gym_envs(num_aircraft, backend, env_checker=False)
+
+    def run() -> None:
+        for env in envs:
+            env.step(TRIM_GYM_ACTION)
+
+    return run
+
+
+def setup_gym_step_checked(num_aircraft: int, backend: str) -> Callable[[], None]:
+    """num_aircraft个A430Gym（gym.make，开启环境检查）各step一次"""
+    envs = _gym_envs(num_aircraft, backend, env_checker=True)
+
+    def run() -> None:
+        for env in envs:
+            env.step(TRIM_GYM_ACTION)
+
+    return run
+
+
+def setup_batch_simulator_step(num_aircraft: int, backend: str) -> Callable[[], None]:
+    """A430BatchSimulator推进num_aircraft架飞机一拍"""
+    batch_sim = A430BatchSimulator(num_planes=num_aircraft, config={}, backend=backend)
+    batch_sim.reset(fTAS=8)
+    actions = np.tile(TRIM_ACTION, (num_aircraft, 1))
+
+    def run() -> None:
+        batch_sim.step(actions)
+
+    return run
+
+
+def setup_vector_env_step(num_aircraft: int, backend: str) -> Callable[[], None]:
+    """A430Gym-vec-v0推进num_aircraft个环境一步"""
+    env = gym.make_vec(
+        "A430Gym-vec-v0",
+        num_envs=num_aircraft,
+        vectorization_mode="vector_entry_point",
+        max_steps=sys.maxsize,
+        copy=False,
+        backend=backend,
+    )
+    env.reset()
+    actions = np.tile(TRIM_GYM_ACTION, (num_aircraft, 1))
+
+    def run() -> None:
+        env.step(actions)
+
+    return run
+
+
+# 基准名 -> setup函数；setup返回的run每次调用推进（或重置）num_aircraft架飞机一拍
+BENCHMARKS: dict[str, Callable[[int, str], Callable[[], None]]] = {
+    "simulator_step": setup_simulator_step,
+    "simulator_step_array": setup_simulator_step_array,
+    "simulator_step_dict": setup_simulator_step_dict,
+    "simulator_reset": setup_simulator_reset,
+    "simulator_reset_in_place": setup_simulator_reset_in_place,
+    "step_from_customized_observation": setup_step_from_customized_observation,
+    "step_from_customized_observations": setup_step_from_customized_observations,
+    "gym_step": setup_gym_step,
+    "gym_step_checked": setup_gym_step_checked,
+    "batch_simulator_step": setup_batch_simulator_step,
+    "vector_env_step": setup_vector_env_step,
+}
+
+
+def measure(run: Callable[[], None], repeat: int = 5, min_time: float = 0.2) -> dict:
+    """重复repeat轮，每轮调用run若干次使耗时不少于min_time，返回单次调用的耗时统计（秒）"""
+    run()  # 预热
+
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        iterations = max(
+            iterations * 2, int(iterations * min_time / max(elapsed, 1e-9))
+        )
+
+    timings = [elapsed / iterations]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            run()
+        timings.append((time.perf_counter() - start) / iterations)
+
+    return dict(
+        iterations=iterations,
+        repeat=repeat,
+        mean_s=statistics.mean(timings),
+        median_s=statistics.median(timings),
+        min_s=min(timings),
+        stdev_s=statistics.stdev(timings) if repeat > 1 else 0.0,
+    )
+
+
+def run_benchmark(
+    name: str,
+    num_aircraft: int,
+    backend: str = "ctypes",
+    repeat: int = 5,
+    min_time: float = 0.2,
+) -> dict:
+    run = BENCHMARKS[name](num_aircraft, backend)
+    result = dict(name=name, num_aircraft=num_aircraft, backend=backend)
+    result.update(measure(run, repeat=repeat, min_time=min_time))
+    result["per_aircraft_us"] = result["median_s"] / num_aircraft * 1e6
+    result["aircraft_steps_per_s"] = num_aircraft / result["median_s"]
+    return result
+
+
+def get_metadata() -> dict:
+    try:
+        a430py_version = version("a430py")
+    except PackageNotFoundError:
+        a430py_version = None
+    return dict(
+        a430py=a430py_version,
+        python=platform.python_version(),
+        numpy=np.__version__,
+        gymnasium=gym.__version__,
+        platform=platform.platform(),
+        processor=platform.processor(),
+        timestamp=datetime.now(timezone.utc).isoformat(),
+    )
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description="A430 simulator/env benchmarks.")
+    parser.add_argument(
+        "--benchmarks",
+        nargs="+",
+        default=list(BENCHMARKS.keys()),
+        choices=list(BENCHMARKS.keys()),
+    )
+    parser.add_argument("--num-aircraft", nargs="+", type=int, default=NUM_AIRCRAFT)
+    parser.add_argument("--backends", nargs="+", default=["ctypes"], choices=BACKENDS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--output", type=str, default=None, help="JSON output path.")
+    args = parser.parse_args(argv)
+
+    results = []
+    for backend in args.backends:
+        for name in args.benchmarks:
+            for num_aircraft in args.num_aircraft:
+                result = run_benchmark(
+                    name,
+                    num_aircraft,
+                    backend=backend,
+                    repeat=args.repeat,
+                    min_time=args.min_time,
+                )
+                results.append(result)
+                print(
+                    f"{backend:>6} {name:<34} N={num_aircraft:<5} "
+                    f"{result['median_s'] * 1e3:10.3f} ms/call "
+                    f"{result['per_aircraft_us']:10.3f} us/aircraft "
+                    f"{result['aircraft_steps_per_s']:14.1f} aircraft/s"
+                )
+
+    report = dict(metadata=get_metadata(), results=results)
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
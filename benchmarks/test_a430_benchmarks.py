@@ -0,0 +1,15 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from a430_benchmarks import BENCHMARKS, NUM_AIRCRAFT  # noqa: E402
+
+
+@pytest.mark.parametrize("num_aircraft", NUM_AIRCRAFT)
+@pytest.mark.parametrize("name", list(BENCHMARKS.keys()))
+@pytest.mark.parametrize("backend", ["ctypes", "numpy"])
+def test_benchmark(benchmark, name: str, num_aircraft: int, backend: str):
+    run = BENCHMARKS[name](num_aircraft, backend)
+    benchmark.group = name
+    benchmark.extra_info.update(num_aircraft=num_aircraft, backend=backend)
+    benchmark(run)
@@ -1,6 +1,72 @@
-from gymnasium.envs.registration import register
+import importlib
+import importlib.util
+import sys
 
-register(
-    id="A430Gym-v0",
-    entry_point="a430py.env.a430_gym:A430Gym",
-)
+# 环境的注册信息，gymnasium被导入时才真正注册，import a430py本身不导入gymnasium、numpy
+ENV_SPECS = [
+    dict(
+        id="A430Gym-v0",
+        entry_point="a430py.env.a430_gym:A430Gym",
+    ),
+    dict(
+        id="A430Gym-vec-v0",
+        vector_entry_point="a430py.env.a430_vector_env:A430VectorEnv",
+    ),
+    dict(
+        id="A430Gym-sharded-vec-v0",
+        vector_entry_point="a430py.env.a430_sharded_vector_env:A430ShardedVectorEnv",
+    ),
+]
+
+# 按需导入的公开对象：名字 -> 所在模块
+_LAZY_ATTRS = {
+    "A430Simulator": "a430py.simulator.a430_sim",
+    "A430BatchSimulator": "a430py.simulator.a430_batch_sim",
+    "A430Gym": "a430py.env.a430_gym",
+    "A430VectorEnv": "a430py.env.a430_vector_env",
+    "A430ShardedVectorEnv": "a430py.env.a430_sharded_vector_env",
+}
+
+
+def register_envs() -> None:
+    """向gymnasium注册A430环境，可以重复调用"""
+    from gymnasium.envs.registration import register, registry
+
+    for spec in ENV_SPECS:
+        if spec["id"] not in registry:
+            register(**spec)
+
+
+class _RegisterEnvsOnImport(object):
+    """sys.meta_path上的钩子：gymnasium.envs.registration执行完毕后立即调用register_envs，只触发一次"""
+
+    module_name = "gymnasium.envs.registration"
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname != self.module_name:
+            return None
+        sys.meta_path.remove(self)
+
+        spec = importlib.util.find_spec(fullname)
+        if spec is None or spec.loader is None:
+            return spec
+        exec_module = spec.loader.exec_module
+
+        def exec_module_and_register(module):
+            exec_module(module)
+            register_envs()
+
+        spec.loader.exec_module = exec_module_and_register
+        return spec
+
+
+if _RegisterEnvsOnImport.module_name in sys.modules:
+    register_envs()
+else:
+    sys.meta_path.insert(0, _RegisterEnvsOnImport())
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRS:
+        return getattr(importlib.import_module(_LAZY_ATTRS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
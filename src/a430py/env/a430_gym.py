@@ -1,10 +1,123 @@
 import gymnasium as gym
 import numpy as np
 
+from a430py.env.a430_reward import RewardSpec
 from a430py.simulator.a430_sim import A430Simulator
+from a430py.simulator.utils.a430_trajectory import TrajectoryRecorder
+from a430py.simulator.utils.async_logger import AsyncLogger
+from a430py.simulator.utils.profiler import Profiler
+
+# 观测各字段的取值范围，用于observation_space和observation_normalization="bounds"
+OBSERVATION_BOUNDS = {
+    "fRoll": (-180.0, 180.0),
+    "fPitch": (-90.0, 90.0),
+    "fYaw": (-180.0, 180.0),
+    "fP": (-300.0, 300.0),
+    "fQ": (-300.0, 300.0),
+    "fR": (-300.0, 300.0),
+    "fnpos": (-np.inf, np.inf),
+    "fepos": (-np.inf, np.inf),
+    "fAlt": (0.0, 100.0),
+    "fTAS": (0.0, 100.0),
+    "fAlpha": (-30.0, 30.0),
+    "fBeta": (-30.0, 30.0),
+}
+OBSERVATION_NORMALIZATIONS = (None, "bounds", "running")
+
+
+class RunningMeanStd(object):
+    """逐个样本更新的均值、方差（Welford算法），同时维护归一化的仿射系数：(x - mean) / std = x * scale + offset"""
+
+    def __init__(self, shape: tuple[int, ...], epsilon: float = 1e-8) -> None:
+        self.epsilon = epsilon
+        self.count = 0
+        self.mean = np.zeros(shape, dtype=np.float64)
+        self.var = np.ones(shape, dtype=np.float64)
+        self.scale = np.ones(shape, dtype=np.float32)
+        self.offset = np.zeros(shape, dtype=np.float32)
+        self._m2 = np.zeros(shape, dtype=np.float64)
+        self._delta = np.zeros(shape, dtype=np.float64)
+
+    def update(self, x: np.ndarray) -> None:
+        self.count += 1
+        np.subtract(x, self.mean, out=self._delta)
+        self.mean += self._delta / self.count
+        # m2 += (x - mean_old) * (x - mean_new)
+        self._m2 += self._delta * (x - self.mean)
+        self._update_affine()
+
+    def update_batch(self, x: np.ndarray) -> None:
+        """一次合并(B, ...)的一批样本（Chan的并行算法），结果与逐个样本update一致"""
+        batch_count = len(x)
+        if batch_count == 0:
+            return
+        batch_mean = x.mean(axis=0, dtype=np.float64)
+        batch_m2 = np.square(x - batch_mean).sum(axis=0, dtype=np.float64)
+        total_count = self.count + batch_count
+        np.subtract(batch_mean, self.mean, out=self._delta)
+        self.mean += self._delta * (batch_count / total_count)
+        self._m2 += batch_m2 + np.square(self._delta) * (
+            self.count * batch_count / total_count
+        )
+        self.count = total_count
+        self._update_affine()
+
+    def _update_affine(self) -> None:
+        if self.count > 1:
+            np.divide(self._m2, self.count, out=self.var)
+        np.divide(
+            1.0, np.sqrt(self.var + self.epsilon), out=self.scale, casting="unsafe"
+        )
+        np.multiply(-self.mean, self.scale, out=self.offset, casting="unsafe")
+
+
+def observation_space_params(
+    observation_keys: list[str],
+    observation_normalization: str | None = None,
+    observation_clip: float = 10.0,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """按OBSERVATION_BOUNDS与归一化方式计算观测空间的上下界，以及"bounds"归一化的仿射系数
+
+    Args:
+        observation_keys (list[str]): 观测字段，均须在OBSERVATION_BOUNDS中.
+        observation_normalization (str | None, optional): 观测归一化方式，见A430Gym. Defaults to None.
+        observation_clip (float, optional): "running"归一化后的截断范围. Defaults to 10.0.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: float32的low、high、scale、offset，
+            "bounds"归一化为x * scale + offset，其他方式下scale为1、offset为0.
+    """
+    assert (
+        observation_normalization in OBSERVATION_NORMALIZATIONS
+    ), f"observation_normalization must be one of {OBSERVATION_NORMALIZATIONS}!"
+
+    observation_low = np.array(
+        [OBSERVATION_BOUNDS[ky][0] for ky in observation_keys], dtype=np.float32
+    )
+    observation_high = np.array(
+        [OBSERVATION_BOUNDS[ky][1] for ky in observation_keys], dtype=np.float32
+    )
+    observation_scale = np.ones(len(observation_keys), dtype=np.float32)
+    observation_offset = np.zeros(len(observation_keys), dtype=np.float32)
+    if observation_normalization == "bounds":
+        # [low, high] -> [-1, 1]：x * 2 / (high - low) - (high + low) / (high - low)
+        finite = np.isfinite(observation_low) & np.isfinite(observation_high)
+        half_range = (observation_high[finite] - observation_low[finite]) / 2
+        center = (observation_high[finite] + observation_low[finite]) / 2
+        observation_scale[finite] = 1.0 / half_range
+        observation_offset[finite] = -center / half_range
+        observation_low[finite] = -1.0
+        observation_high[finite] = 1.0
+    elif observation_normalization == "running":
+        observation_low[:] = -observation_clip
+        observation_high[:] = observation_clip
+    return observation_low, observation_high, observation_scale, observation_offset
 
 
 class A430Gym(gym.Env):
+    # enable_profiling时计时的方法，阶段名为"gym.{方法名}"
+    profiled_methods = ["step", "reset", "get_observation"]
+
     def __init__(
         self,
         initial_lon: float = 120.0,
@@ -14,12 +127,62 @@ class A430Gym(gym.Env):
         initial_yaw: float = 90.0,
         max_steps: int = 100,
         custom_aircraft_config: dict = {},
+        zero_copy: bool = False,
+        frame_skip: int = 1,
+        frame_skip_aggregate_keys: list[str] | None = None,
+        backend: str = "ctypes",
+        recorder: TrajectoryRecorder | AsyncLogger | None = None,
+        observation_normalization: str | None = None,
+        observation_clip: float = 10.0,
+        normalize_action: bool = False,
+        reward_spec: dict | None = None,
+        reset_cache_size: int = 0,
+        initial_condition_pool: list[dict] | None = None,
     ):
+        """A430 Gymnasium环境
+
+        观测总是按预计算的下标从simulator的输出缓冲区一次性取出，写入预分配的float32数组，与observation_space一致.
+
+        Args:
+            zero_copy (bool, optional): 为True时reset/step直接返回预分配的观测数组，会在下一次调用时被覆盖；
+                为False时返回其拷贝. Defaults to False.
+            frame_skip (int, optional): 每个动作重复仿真的拍数，只在最后一拍构造观测. Defaults to 1.
+            frame_skip_aggregate_keys (list[str] | None, optional): 需要在子步间统计min/max/mean的输出字段，
+                统计结果放在info的substep_min/substep_max/substep_mean中，顺序与该列表一致. Defaults to None.
+            backend (str, optional): 动力学后端的名字，如"ctypes"、"numpy"，见A430Simulator. Defaults to "ctypes".
+            recorder (TrajectoryRecorder | AsyncLogger | None, optional): 轨迹记录器，挂载到simulator上，frame_skip大于1时逐拍记录. Defaults to None.
+            observation_normalization (str | None, optional): 观测归一化方式，None不归一化；"bounds"按OBSERVATION_BOUNDS线性映射到[-1, 1]，
+                超出范围的值截断到[-1, 1]，范围无限的字段（fnpos、fepos）不变；"running"按运行均值、标准差标准化后截断到[-observation_clip, observation_clip]，
+                update_observation_stats为False时不再更新统计量（如评估时）. Defaults to None.
+            observation_clip (float, optional): "running"归一化后的截断范围. Defaults to 10.0.
+            normalize_action (bool, optional): 为True时动作空间为[-1, 1]，线性映射到原始的动作范围. Defaults to False.
+            reward_spec (dict | None, optional): 声明式的奖励、终止条件，见RewardSpec，在未归一化的输出上计算；
+                为None时奖励为0，只在max_steps时结束. Defaults to None.
+            reset_cache_size (int, optional): simulator缓存的初始状态个数，大于0时reset命中缓存只需恢复快照，见A430Simulator. Defaults to 0.
+            initial_condition_pool (list[dict] | None, optional): 有限的随机初始条件池，每项为dLon、dLat、fAlt、fTAS、fYaw的子集，
+                覆盖initial_*；reset时用np_random从中均匀抽取一项，池不大于reset_cache_size时每个初始条件只新建一次飞机. Defaults to None.
+        """
+        assert frame_skip > 0, "frame_skip must be positive!"
+        assert (
+            observation_normalization in OBSERVATION_NORMALIZATIONS
+        ), f"observation_normalization must be one of {OBSERVATION_NORMALIZATIONS}!"
+        assert initial_condition_pool is None or (
+            len(initial_condition_pool) > 0
+        ), "initial_condition_pool must not be empty!"
+
         self.initial_lon = initial_lon
         self.initial_lat = initial_lat
         self.initial_alt = initial_alt
         self.initial_tas = initial_tas
         self.initial_yaw = initial_yaw
+        self.zero_copy = zero_copy
+        self.frame_skip = frame_skip
+        self.frame_skip_aggregate_keys = frame_skip_aggregate_keys
+        self.observation_normalization = observation_normalization
+        self.observation_clip = observation_clip
+        self.normalize_action = normalize_action
+        self.update_observation_stats = True
+        self.initial_condition_pool = initial_condition_pool
 
         self.observation_keys = [
             "fRoll",
@@ -45,21 +208,26 @@ class A430Gym(gym.Env):
 
         self.step_cnt = 0
         self.max_steps = max_steps
+        self.profiler: Profiler | None = None
 
         # 1.Define spaces
-        ## 1.1 Observation space: vt, phi, theta, psi, alpha, beta, p, q, r, h
+        ## 1.1 Observation space: 与observation_keys一一对应
+        (
+            observation_low,
+            observation_high,
+            self._observation_scale,
+            self._observation_offset,
+        ) = observation_space_params(
+            self.observation_keys, observation_normalization, observation_clip
+        )
+        self.observation_stats: RunningMeanStd | None = None
+        if self.observation_normalization == "running":
+            self.observation_stats = RunningMeanStd((len(self.observation_keys),))
         self.observation_space = gym.spaces.Box(
-            low=np.array(
-                [0.0, -180.0, -90.0, -180.0, -30.0, -30.0, -300.0, -300.0, -300.0, 0.0],
-                dtype=np.float32,
-            ),
-            high=np.array(
-                [100.0, 180.0, 90.0, 180.0, 30.0, 30.0, 300.0, 300.0, 300.0, 100.0],
-                dtype=np.float32,
-            ),
+            low=observation_low, high=observation_high, dtype=np.float32
         )
         ## 1.2 Action space: fStickLat, fStickLon, fRudder, fThrottle
-        self.action_space = gym.spaces.Box(
+        self.raw_action_space = gym.spaces.Box(
             low=np.array(
                 [
                     -10.0,
@@ -71,9 +239,21 @@ class A430Gym(gym.Env):
             ),
             high=np.array([10.0, 10.0, 10.0, 1.0], dtype=np.float32),
         )
+        if self.normalize_action:
+            self.action_space = gym.spaces.Box(
+                low=-1.0, high=1.0, shape=(len(self.action_keys),), dtype=np.float32
+            )
+        else:
+            self.action_space = self.raw_action_space
 
-        # 2.Init simulator
-        self.simulator = A430Simulator(config=custom_aircraft_config)
+        # 2.Init simulator，观测从输出缓冲区取出，simulator不必构造dict
+        self.simulator = A430Simulator(
+            config=custom_aircraft_config,
+            zero_copy=True,
+            backend=backend,
+            recorder=recorder,
+            reset_cache_size=reset_cache_size,
+        )
         self.simulator.init_plane_model(
             dLon=self.initial_lon,
             dLat=self.initial_lat,
@@ -82,44 +262,130 @@ class A430Gym(gym.Env):
             fYaw=self.initial_yaw,
         )
 
+        # observation_keys在输出缓冲区float32部分中的下标
+        self._observation_index = np.array(
+            [
+                self.simulator.output_float_fields.index(ky)
+                for ky in self.observation_keys
+            ]
+        )
+        self._observation = np.zeros(len(self.observation_keys), dtype=np.float32)
+
+        # 奖励、终止条件在(1, 20)的float32输出视图上计算
+        self.reward_spec = (
+            None
+            if reward_spec is None
+            else RewardSpec(reward_spec, self.simulator.output_float_fields)
+        )
+        self._output_matrix = self.simulator.output_float_array.reshape(1, -1)
+        self._reward = np.zeros(1, dtype=np.float64)
+        self._termination = np.zeros(1, dtype=np.bool_)
+
+        # 动作列顺序(fStickLat, fStickLon, fRudder, fThrottle) -> AircraftInput列顺序，以及[-1, 1]到原始范围的仿射系数
+        self._action_to_input_index = np.array(
+            [self.action_keys.index(ky) for ky in self.simulator.input_fields]
+        )
+        self._input = np.zeros(len(self.action_keys), dtype=np.float32)
+        raw_low = self.raw_action_space.low[self._action_to_input_index]
+        raw_high = self.raw_action_space.high[self._action_to_input_index]
+        self._action_scale = (raw_high - raw_low) / 2
+        self._action_offset = (raw_high + raw_low) / 2
+
+        # 子步统计量的累加缓冲区
+        if self.frame_skip_aggregate_keys is not None:
+            self._aggregate_index = np.array(
+                [
+                    self.simulator.output_float_fields.index(ky)
+                    for ky in self.frame_skip_aggregate_keys
+                ]
+            )
+            self._substep_values = np.zeros(len(self.frame_skip_aggregate_keys))
+            self._substep_min = np.zeros(len(self.frame_skip_aggregate_keys))
+            self._substep_max = np.zeros(len(self.frame_skip_aggregate_keys))
+            self._substep_sum = np.zeros(len(self.frame_skip_aggregate_keys))
+
+    def enable_profiling(self, profiler: Profiler | None = None) -> Profiler:
+        """开启逐阶段计时，simulator与环境共用同一个Profiler，环境的step/reset/get_observation计入"gym.*"，
+        其余阶段见A430Simulator.enable_profiling"""
+        self.disable_profiling()
+        self.profiler = self.simulator.enable_profiling(profiler)
+        self.profiler.instrument(self, self.profiled_methods, "gym")
+        return self.profiler
+
+    def disable_profiling(self) -> None:
+        if self.profiler is None:
+            return
+        Profiler.uninstrument(self, self.profiled_methods)
+        self.simulator.disable_profiling()
+        self.profiler = None
+
+    def stats(self) -> dict:
+        """各阶段的计时统计，见Profiler.stats；未开启计时时为空dict"""
+        return self.simulator.stats()
+
     def close(self):
-        del self.simulator
+        self.simulator.close()
 
     def reset(self, *, seed=None, options=None):
         super().reset(seed=seed, options=options)
 
         self.step_cnt = 0
 
-        obs_dict = self.simulator.reset(
+        initial_condition = dict(
             dLon=self.initial_lon,
             dLat=self.initial_lat,
             fAlt=self.initial_alt,
             fTAS=self.initial_tas,
             fYaw=self.initial_yaw,
         )
+        if self.initial_condition_pool is not None:
+            initial_condition.update(
+                self.initial_condition_pool[
+                    self.np_random.integers(len(self.initial_condition_pool))
+                ]
+            )
+        obs_dict = self.simulator.reset(**initial_condition)
         info = {}
         return self.get_observation(obs_dict=obs_dict), info
 
     def step(self, action):
-        obs_dict = self.simulator.step(
-            fStickLat=action[0],
-            fStickLon=action[1],
-            fRudder=action[2],
-            fThrottle=action[3],
-        )
+        info = {}
+
+        # 一次取出并重排为AircraftInput的列顺序，需要时再映射到原始范围
+        aircraft_input = np.take(action, self._action_to_input_index, out=self._input)
+        if self.normalize_action:
+            aircraft_input *= self._action_scale
+            aircraft_input += self._action_offset
+
+        if self.frame_skip == 1 and self.frame_skip_aggregate_keys is None:
+            obs_dict = self.simulator.step_array(aircraft_input)
+        else:
+            self.simulator.set_aircraft_input(*aircraft_input)
+            if self.frame_skip_aggregate_keys is None:
+                self.simulator.update(update_times=self.frame_skip)
+            else:
+                info.update(self._update_with_aggregation())
+            obs_dict = self.simulator.get_aircraft_output_view()
 
         self.step_cnt += 1
-        reward = 0
+        reward = 0.0
+        terminated = False
+
+        if self.reward_spec is not None:
+            self.reward_spec.evaluate(
+                self._output_matrix,
+                rewards=self._reward,
+                terminations=self._termination,
+            )
+            reward = float(self._reward[0])
+            terminated = bool(self._termination[0])
 
         if self.step_cnt >= self.max_steps:
             terminated = True
             truncated = True
         else:
-            terminated = False
             truncated = False
 
-        info = {}
-
         return (
             self.get_observation(obs_dict=obs_dict),
             reward,
@@ -128,8 +394,62 @@ class A430Gym(gym.Env):
             info,
         )
 
-    def get_observation(self, obs_dict: dict) -> np.ndarray:
-        return np.array([obs_dict[ky] for ky in self.observation_keys])
+    def _update_with_aggregation(self) -> dict:
+        """推进frame_skip拍，逐拍原地更新所选字段的min/max/sum，不保存每一拍的输出"""
+        output_float_array = self.simulator.output_float_array
+
+        for i in range(self.frame_skip):
+            self.simulator.update()
+            self.simulator.get_aircraft_output_view()
+            np.take(output_float_array, self._aggregate_index, out=self._substep_values)
+            if i == 0:
+                self._substep_min[:] = self._substep_values
+                self._substep_max[:] = self._substep_values
+                self._substep_sum[:] = self._substep_values
+            else:
+                np.minimum(
+                    self._substep_min, self._substep_values, out=self._substep_min
+                )
+                np.maximum(
+                    self._substep_max, self._substep_values, out=self._substep_max
+                )
+                self._substep_sum += self._substep_values
+
+        return {
+            "substep_min": self._substep_min.copy(),
+            "substep_max": self._substep_max.copy(),
+            "substep_mean": self._substep_sum / self.frame_skip,
+        }
+
+    def get_observation(self, obs_dict: dict | np.ndarray | None = None) -> np.ndarray:
+        """按预计算的下标从simulator的输出缓冲区取出观测，需要时做归一化；obs_dict仅为兼容保留，不再使用"""
+        observation = np.take(
+            self.simulator.output_float_array,
+            self._observation_index,
+            out=self._observation,
+        )
+        if self.observation_stats is not None:
+            if self.update_observation_stats:
+                self.observation_stats.update(observation)
+            observation *= self.observation_stats.scale
+            observation += self.observation_stats.offset
+            np.clip(
+                observation,
+                -self.observation_clip,
+                self.observation_clip,
+                out=observation,
+            )
+        elif self.observation_normalization is not None:
+            observation *= self._observation_scale
+            observation += self._observation_offset
+            # 超出OBSERVATION_BOUNDS的值截断到[-1, 1]，与observation_space一致
+            np.clip(
+                observation,
+                self.observation_space.low,
+                self.observation_space.high,
+                out=observation,
+            )
+        return observation if self.zero_copy else observation.copy()
 
     def get_action(self, act_dict: dict) -> np.ndarray:
         return np.array([act_dict[ky] for ky in self.action_keys])
@@ -138,4 +458,4 @@ class A430Gym(gym.Env):
         print(
             f"In python, check config, m = {self.simulator._config['m']}, B = {self.simulator._config['B']}"
         )
-        self.simulator.a430_model.check_config(self.simulator.planePtr)
+        self.simulator.backend.check_config(self.simulator.planePtr)
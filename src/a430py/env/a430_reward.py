@@ -0,0 +1,138 @@
+import numpy as np
+
+ERROR_TYPES = ("squared", "abs")
+SPEC_KEYS = (
+    "tracking",
+    "error",
+    "alive_reward",
+    "termination_reward",
+    "altitude_floor",
+    "attitude_limits",
+    "envelope",
+    "stall_alpha",
+)
+
+
+class RewardSpec(object):
+    """声明式的奖励、终止条件，编译为作用在(N, F)输出矩阵上的numpy表达式，N个环境一次计算完成
+
+    spec示例：
+        {
+            "tracking": {"fTAS": dict(target=8.0, weight=1.0, scale=1.0), "fRoll": dict(target=0.0, weight=0.1)},
+            "error": "squared",  # 或"abs"
+            "alive_reward": 0.1,  # 每步的常数奖励
+            "termination_reward": -100.0,  # 终止时额外的奖励
+            "altitude_floor": 1.0,  # fAlt低于该值时终止
+            "attitude_limits": {"fRoll": 60.0, "fPitch": 45.0},  # 绝对值超过限制时终止
+            "envelope": {"fTAS": (4.0, 30.0)},  # 超出[low, high]时终止
+            "stall_alpha": 15.0,  # fAlpha超过该值（失速）时终止
+        }
+    奖励为alive_reward - sum(weight * error((x - target) / scale))，终止的环境再加上termination_reward。
+    """
+
+    def __init__(self, spec: dict, fields: list[str]) -> None:
+        """编译spec
+
+        Args:
+            spec (dict): 奖励、终止条件，键见SPEC_KEYS，均可省略.
+            fields (list[str]): 输出矩阵各列的字段名，如simulator.output_float_fields.
+        """
+        unknown_keys = set(spec.keys()) - set(SPEC_KEYS)
+        assert len(unknown_keys) == 0, f"unknown reward spec keys: {unknown_keys}!"
+        error = spec.get("error", "squared")
+        assert error in ERROR_TYPES, f"error must be one of {ERROR_TYPES}!"
+
+        self.spec = spec
+        self.fields = list(fields)
+        self.squared_error = error == "squared"
+        self.alive_reward = float(spec.get("alive_reward", 0.0))
+        self.termination_reward = float(spec.get("termination_reward", 0.0))
+
+        # 跟踪误差：列下标、目标值（可以替换为(N, T)的逐环境目标）、权重、尺度
+        tracking = spec.get("tracking", {})
+        self.tracking_keys = list(tracking.keys())
+        self._tracking_index = self._index(self.tracking_keys)
+        self.targets = np.array(
+            [tracking[ky]["target"] for ky in self.tracking_keys], dtype=np.float64
+        )
+        self.weights = np.array(
+            [tracking[ky].get("weight", 1.0) for ky in self.tracking_keys],
+            dtype=np.float64,
+        )
+        scales = np.array(
+            [tracking[ky].get("scale", 1.0) for ky in self.tracking_keys],
+            dtype=np.float64,
+        )
+        assert np.all(scales > 0.0), "tracking scale must be positive!"
+        self._inv_scales = 1.0 / scales
+
+        # 所有终止条件合并为逐字段的包络[low, high]
+        envelope = {
+            ky: [float(low), float(high)]
+            for ky, (low, high) in spec.get("envelope", {}).items()
+        }
+
+        def restrict(ky: str, low: float, high: float) -> None:
+            bounds = envelope.setdefault(ky, [-np.inf, np.inf])
+            bounds[0] = max(bounds[0], low)
+            bounds[1] = min(bounds[1], high)
+
+        if spec.get("altitude_floor") is not None:
+            restrict("fAlt", spec["altitude_floor"], np.inf)
+        for ky, limit in spec.get("attitude_limits", {}).items():
+            restrict(ky, -limit, limit)
+        if spec.get("stall_alpha") is not None:
+            restrict("fAlpha", -np.inf, spec["stall_alpha"])
+
+        self.envelope_keys = list(envelope.keys())
+        self._envelope_index = self._index(self.envelope_keys)
+        self.envelope_low = np.array([envelope[ky][0] for ky in self.envelope_keys])
+        self.envelope_high = np.array([envelope[ky][1] for ky in self.envelope_keys])
+
+    def _index(self, keys: list[str]) -> np.ndarray:
+        for ky in keys:
+            assert ky in self.fields, f"unknown field: {ky}!"
+        return np.array([self.fields.index(ky) for ky in keys], dtype=np.intp)
+
+    def evaluate(
+        self,
+        values: np.ndarray,
+        rewards: np.ndarray | None = None,
+        terminations: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """计算N个环境的奖励与终止标志
+
+        Args:
+            values (np.ndarray): (N, F)的输出矩阵，列与fields对应.
+            rewards (np.ndarray | None, optional): (N,)的奖励输出数组，为None时新建. Defaults to None.
+            terminations (np.ndarray | None, optional): (N,)的bool输出数组，为None时新建. Defaults to None.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: rewards, terminations.
+        """
+        num_envs = len(values)
+        if rewards is None:
+            rewards = np.empty(num_envs, dtype=np.float64)
+        if terminations is None:
+            terminations = np.empty(num_envs, dtype=np.bool_)
+
+        rewards[...] = self.alive_reward
+        if len(self._tracking_index) > 0:
+            errors = np.take(values, self._tracking_index, axis=1).astype(np.float64)
+            errors -= self.targets
+            errors *= self._inv_scales
+            if self.squared_error:
+                np.square(errors, out=errors)
+            else:
+                np.abs(errors, out=errors)
+            rewards -= errors @ self.weights
+
+        if len(self._envelope_index) > 0:
+            bounded = np.take(values, self._envelope_index, axis=1)
+            outside = (bounded < self.envelope_low) | (bounded > self.envelope_high)
+            np.any(outside, axis=1, out=terminations)
+            if self.termination_reward != 0.0:
+                rewards[terminations] += self.termination_reward
+        else:
+            terminations[...] = False
+        return rewards, terminations
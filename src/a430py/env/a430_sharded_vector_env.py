@@ -0,0 +1,275 @@
+import multiprocessing as mp
+import traceback
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+from gymnasium.vector import AutoresetMode, VectorEnv
+from gymnasium.vector.utils import batch_space
+
+from a430py.env.a430_vector_env import A430VectorEnv
+
+
+def _split_envs(num_envs: int, num_workers: int) -> list[tuple[int, int]]:
+    """把num_envs个环境尽量均匀地划分给num_workers个进程，返回每个进程的[start, end)"""
+    bounds = np.linspace(0, num_envs, num_workers + 1).round().astype(int)
+    return [(int(start), int(end)) for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def _shared_array(
+    shm: SharedMemory, shape: tuple, dtype, start: int | None = None, end=None
+) -> np.ndarray:
+    array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    if start is None:
+        return array
+    return array[start:end]
+
+
+def _worker(
+    pipe,
+    parent_pipe,
+    shm_names: dict,
+    num_envs: int,
+    start: int,
+    end: int,
+    env_kwargs: dict,
+) -> None:
+    parent_pipe.close()
+    shms = {ky: SharedMemory(name=name) for ky, name in shm_names.items()}
+    env = None
+    try:
+        env = A430VectorEnv(num_envs=end - start, copy=False, **env_kwargs)
+        obs_dim = env.single_observation_space.shape[0]
+        act_dim = env.single_action_space.shape[0]
+
+        actions = _shared_array(
+            shms["actions"], (num_envs, act_dim), np.float32, start, end
+        )
+        observations = _shared_array(
+            shms["observations"], (num_envs, obs_dim), np.float32, start, end
+        )
+        rewards = _shared_array(shms["rewards"], (num_envs,), np.float64, start, end)
+        terminations = _shared_array(
+            shms["terminations"], (num_envs,), np.bool_, start, end
+        )
+        truncations = _shared_array(
+            shms["truncations"], (num_envs,), np.bool_, start, end
+        )
+
+        while True:
+            command, data = pipe.recv()
+            if command == "step":
+                obs, rew, term, trunc, info = env.step(actions)
+                observations[...] = obs
+                rewards[...] = rew
+                terminations[...] = term
+                truncations[...] = trunc
+                pipe.send((True, info))
+            elif command == "reset":
+                seed, options = data
+                obs, info = env.reset(seed=seed, options=options)
+                observations[...] = obs
+                pipe.send((True, info))
+            elif command == "close":
+                pipe.send((True, None))
+                break
+            else:
+                raise RuntimeError(f"Unknown command: {command}!")
+    except (KeyboardInterrupt, Exception):
+        pipe.send((False, traceback.format_exc()))
+    finally:
+        if env is not None:
+            env.close()
+        for shm in shms.values():
+            shm.close()
+        pipe.close()
+
+
+class A430ShardedVectorEnv(VectorEnv):
+    """把num_envs架飞机划分到num_workers个进程中仿真的向量化环境
+
+    每个进程持有一个A430VectorEnv（即一个A430BatchSimulator），动作、观测、奖励等通过
+    multiprocessing.shared_memory交换，管道中只传递命令，不传递数组。
+    """
+
+    metadata = {"autoreset_mode": AutoresetMode.NEXT_STEP}
+
+    def __init__(
+        self,
+        num_envs: int = 1,
+        num_workers: int | None = None,
+        context: str | None = None,
+        copy: bool = True,
+        **env_kwargs,
+    ):
+        """A430多进程向量化环境
+
+        Args:
+            num_envs (int, optional): 飞机（环境）总数. Defaults to 1.
+            num_workers (int | None, optional): 进程数，为None时使用CPU核数（不超过num_envs）. Defaults to None.
+            context (str | None, optional): multiprocessing的启动方式，如"fork"、"spawn"、"forkserver". Defaults to None.
+            copy (bool, optional): 为False时reset/step直接返回共享内存上的数组，下一次调用时会被覆盖. Defaults to True.
+            env_kwargs: 传给每个进程中A430VectorEnv的其余参数.
+        """
+        if num_workers is None:
+            num_workers = mp.cpu_count()
+        num_workers = max(1, min(num_workers, num_envs))
+
+        self.num_envs = num_envs
+        self.num_workers = num_workers
+        self.copy = copy
+        self.env_kwargs = env_kwargs
+        self.closed = False
+
+        # 用一个单机环境得到空间定义与autoreset方式，随即释放
+        dummy_env = A430VectorEnv(num_envs=1, **env_kwargs)
+        self.single_observation_space = dummy_env.single_observation_space
+        self.single_action_space = dummy_env.single_action_space
+        self.metadata = dict(dummy_env.metadata)
+        self.autoreset_mode = dummy_env.autoreset_mode
+        dummy_env.close()
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+        self.action_space = batch_space(self.single_action_space, num_envs)
+
+        obs_dim = self.single_observation_space.shape[0]
+        act_dim = self.single_action_space.shape[0]
+        buffer_specs = {
+            "actions": ((num_envs, act_dim), np.float32),
+            "observations": ((num_envs, obs_dim), np.float32),
+            "rewards": ((num_envs,), np.float64),
+            "terminations": ((num_envs,), np.bool_),
+            "truncations": ((num_envs,), np.bool_),
+        }
+        self._shms = {
+            ky: SharedMemory(
+                create=True, size=max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            )
+            for ky, (shape, dtype) in buffer_specs.items()
+        }
+        self._actions = _shared_array(self._shms["actions"], *buffer_specs["actions"])
+        self._observations = _shared_array(
+            self._shms["observations"], *buffer_specs["observations"]
+        )
+        self._rewards = _shared_array(self._shms["rewards"], *buffer_specs["rewards"])
+        self._terminations = _shared_array(
+            self._shms["terminations"], *buffer_specs["terminations"]
+        )
+        self._truncations = _shared_array(
+            self._shms["truncations"], *buffer_specs["truncations"]
+        )
+
+        ctx = mp.get_context(context)
+        self.env_slices = _split_envs(num_envs, num_workers)
+        self.parent_pipes, self.processes = [], []
+        for start, end in self.env_slices:
+            parent_pipe, child_pipe = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                name=f"A430ShardedWorker-{start}-{end}",
+                args=(
+                    child_pipe,
+                    parent_pipe,
+                    {ky: shm.name for ky, shm in self._shms.items()},
+                    num_envs,
+                    start,
+                    end,
+                    env_kwargs,
+                ),
+                daemon=True,
+            )
+            process.start()
+            child_pipe.close()
+            self.parent_pipes.append(parent_pipe)
+            self.processes.append(process)
+
+    def _receive(self) -> list:
+        results, errors = [], []
+        for pipe in self.parent_pipes:
+            success, data = pipe.recv()
+            if success:
+                results.append(data)
+            else:
+                errors.append(data)
+        if errors:
+            self.close(terminate=True)
+            raise RuntimeError("A430 worker process failed:\n" + "\n".join(errors))
+        return results
+
+    def _merge_infos(self, infos: list) -> dict:
+        merged = {}
+        for (start, end), info in zip(self.env_slices, infos):
+            self._merge_info(merged, info, start, end)
+        return merged
+
+    def _merge_info(self, merged: dict, info: dict, start: int, end: int) -> None:
+        # 嵌套的dict（如final_info）逐层合并
+        for ky, value in info.items():
+            if isinstance(value, dict):
+                self._merge_info(merged.setdefault(ky, {}), value, start, end)
+                continue
+            if ky not in merged:
+                if isinstance(value, np.ndarray):
+                    merged[ky] = np.zeros(
+                        (self.num_envs, *value.shape[1:]), dtype=value.dtype
+                    )
+                else:
+                    merged[ky] = value
+                    continue
+            if isinstance(value, np.ndarray):
+                merged[ky][start:end] = value
+
+    def reset(self, *, seed=None, options=None):
+        super().reset(seed=seed, options=options)
+
+        for pipe, (start, end) in zip(self.parent_pipes, self.env_slices):
+            worker_seed = None if seed is None else seed + start
+            worker_options = options
+            if options is not None and "reset_mask" in options:
+                worker_options = {
+                    **options,
+                    "reset_mask": np.asarray(options["reset_mask"])[start:end],
+                }
+            pipe.send(("reset", (worker_seed, worker_options)))
+        infos = self._receive()
+
+        observations = self._observations
+        return (
+            np.copy(observations) if self.copy else observations,
+            self._merge_infos(infos),
+        )
+
+    def step_async(self, actions) -> None:
+        self._actions[...] = actions
+        for pipe in self.parent_pipes:
+            pipe.send(("step", None))
+
+    def step_wait(self):
+        infos = self._receive()
+        return (
+            np.copy(self._observations) if self.copy else self._observations,
+            np.copy(self._rewards) if self.copy else self._rewards,
+            np.copy(self._terminations) if self.copy else self._terminations,
+            np.copy(self._truncations) if self.copy else self._truncations,
+            self._merge_infos(infos),
+        )
+
+    def step(self, actions):
+        self.step_async(actions)
+        return self.step_wait()
+
+    def close_extras(self, terminate: bool = False, **kwargs):
+        if terminate:
+            for process in self.processes:
+                if process.is_alive():
+                    process.terminate()
+        else:
+            for pipe, process in zip(self.parent_pipes, self.processes):
+                if process.is_alive():
+                    pipe.send(("close", None))
+                    pipe.recv()
+        for process in self.processes:
+            process.join()
+        for pipe in self.parent_pipes:
+            pipe.close()
+        for shm in self._shms.values():
+            shm.close()
+            shm.unlink()
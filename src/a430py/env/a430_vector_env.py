@@ -0,0 +1,287 @@
+import gymnasium as gym
+import numpy as np
+from gymnasium.vector import AutoresetMode, VectorEnv
+from gymnasium.vector.utils import batch_space
+
+from a430py.env.a430_gym import RunningMeanStd, observation_space_params
+from a430py.env.a430_reward import RewardSpec
+from a430py.simulator.a430_batch_sim import A430BatchSimulator
+from a430py.simulator.a430_config_sampler import NUM_PLANE_CONSTS, ConfigSampler
+
+
+class A430VectorEnv(VectorEnv):
+    """在同一进程内用A430BatchSimulator同时仿真num_envs架飞机的向量化环境
+
+    观测、动作的含义与A430Gym一致，观测为(num_envs, 12)的float32数组，观测空间与归一化方式也与A430Gym相同。
+    """
+
+    metadata = {"autoreset_mode": AutoresetMode.NEXT_STEP}
+
+    def __init__(
+        self,
+        num_envs: int = 1,
+        initial_lon: float = 120.0,
+        initial_lat: float = 30.0,
+        initial_alt: float = 10.0,
+        initial_tas: float = 8.0,
+        initial_yaw: float = 90.0,
+        max_steps: int = 100,
+        custom_aircraft_config: dict = {},
+        autoreset_mode: str | AutoresetMode = AutoresetMode.NEXT_STEP,
+        copy: bool = True,
+        backend: str = "ctypes",
+        config_sampler: ConfigSampler | None = None,
+        reward_spec: dict | None = None,
+        observation_normalization: str | None = None,
+        observation_clip: float = 10.0,
+    ):
+        """A430向量化环境
+
+        Args:
+            num_envs (int, optional): 飞机（环境）数量. Defaults to 1.
+            autoreset_mode (str | AutoresetMode, optional): 自动重置方式，与gymnasium 1.x的定义一致. Defaults to AutoresetMode.NEXT_STEP.
+            copy (bool, optional): 为False时reset/step直接返回内部预分配的数组，下一次调用时会被覆盖. Defaults to True.
+            backend (str, optional): 动力学后端的名字，"numpy"时所有飞机在数组上一次性推进. Defaults to "ctypes".
+            config_sampler (ConfigSampler | None, optional): 不为None时，每次重置环境前用np_random为这些环境重新采样飞机参数. Defaults to None.
+            reward_spec (dict | None, optional): 声明式的奖励、终止条件，见RewardSpec，所有环境一次计算. Defaults to None.
+            observation_normalization (str | None, optional): 观测归一化方式，见A430Gym；"running"的统计量由所有环境共享，
+                每次按一批观测更新. Defaults to None.
+            observation_clip (float, optional): "running"归一化后的截断范围. Defaults to 10.0.
+        """
+        self.num_envs = num_envs
+        self.initial_lon = initial_lon
+        self.initial_lat = initial_lat
+        self.initial_alt = initial_alt
+        self.initial_tas = initial_tas
+        self.initial_yaw = initial_yaw
+        self.max_steps = max_steps
+        self.copy = copy
+        self.config_sampler = config_sampler
+        self.observation_normalization = observation_normalization
+        self.observation_clip = observation_clip
+        self.update_observation_stats = True
+
+        self.autoreset_mode = (
+            autoreset_mode
+            if isinstance(autoreset_mode, AutoresetMode)
+            else AutoresetMode(autoreset_mode)
+        )
+        self.metadata = {**self.metadata, "autoreset_mode": self.autoreset_mode}
+
+        self.observation_keys = [
+            "fRoll",
+            "fPitch",
+            "fYaw",
+            "fP",
+            "fQ",
+            "fR",
+            "fnpos",
+            "fepos",
+            "fAlt",
+            "fTAS",
+            "fAlpha",
+            "fBeta",
+        ]
+
+        self.action_keys = [
+            "fStickLat",  # 副翼指令
+            "fStickLon",  # 升降舵指令
+            "fRudder",
+            "fThrottle",  # 油门指令
+        ]
+
+        # 1.Define spaces
+        (
+            observation_low,
+            observation_high,
+            self._observation_scale,
+            self._observation_offset,
+        ) = observation_space_params(
+            self.observation_keys, observation_normalization, observation_clip
+        )
+        self.observation_stats: RunningMeanStd | None = None
+        if self.observation_normalization == "running":
+            self.observation_stats = RunningMeanStd((len(self.observation_keys),))
+        self.single_observation_space = gym.spaces.Box(
+            low=observation_low, high=observation_high, dtype=np.float32
+        )
+        self.single_action_space = gym.spaces.Box(
+            low=np.array([-10.0, -10.0, -10.0, 0.0], dtype=np.float32),
+            high=np.array([10.0, 10.0, 10.0, 1.0], dtype=np.float32),
+        )
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+        self.action_space = batch_space(self.single_action_space, num_envs)
+
+        # 2.Init simulator
+        self.simulator = A430BatchSimulator(
+            num_planes=num_envs, config=custom_aircraft_config, backend=backend
+        )
+        self.simulator.init_plane_model(
+            dLon=self.initial_lon,
+            dLat=self.initial_lat,
+            fAlt=self.initial_alt,
+            fTAS=self.initial_tas,
+            fYaw=self.initial_yaw,
+        )
+
+        # 3.Preallocate buffers
+        # 动作列顺序(fStickLat, fStickLon, fRudder, fThrottle) -> AircraftInput列顺序
+        self._action_to_input_index = np.array(
+            [self.action_keys.index(ky) for ky in self.simulator.input_fields]
+        )
+        self._inputs = np.zeros((num_envs, len(self.action_keys)), dtype=np.float32)
+        # observation_keys在输出缓冲区float32部分中的下标
+        self._observation_index = np.array(
+            [
+                self.simulator.output_float_fields.index(ky)
+                for ky in self.observation_keys
+            ]
+        )
+        self._observations = np.zeros(
+            (num_envs, len(self.observation_keys)), dtype=np.float32
+        )
+        self._rewards = np.zeros(num_envs, dtype=np.float64)
+        self._terminations = np.zeros(num_envs, dtype=np.bool_)
+        self._truncations = np.zeros(num_envs, dtype=np.bool_)
+        self._autoreset_envs = np.zeros(num_envs, dtype=np.bool_)
+        self.step_cnts = np.zeros(num_envs, dtype=np.int64)
+
+        self.reward_spec = (
+            None
+            if reward_spec is None
+            else RewardSpec(reward_spec, self.simulator.output_float_fields)
+        )
+
+    def close_extras(self, **kwargs):
+        self.simulator.close()
+
+    def reset(self, *, seed=None, options=None):
+        super().reset(seed=seed, options=options)
+
+        if options is not None and "reset_mask" in options:
+            reset_mask = np.asarray(options["reset_mask"], dtype=np.bool_)
+            assert reset_mask.shape == (
+                self.num_envs,
+            ), f"reset_mask must have shape {(self.num_envs,)}!"
+        else:
+            reset_mask = np.ones(self.num_envs, dtype=np.bool_)
+
+        self._reset_envs(np.flatnonzero(reset_mask))
+        self._autoreset_envs[reset_mask] = False
+
+        observations = self._get_observations(update_mask=reset_mask)
+        info = {}
+        return np.copy(observations) if self.copy else observations, info
+
+    def step(self, actions):
+        np.take(actions, self._action_to_input_index, axis=1, out=self._inputs)
+        self.simulator.step_view(self._inputs)
+        self.step_cnts += 1
+
+        np.greater_equal(self.step_cnts, self.max_steps, out=self._truncations)
+        if self.reward_spec is None:
+            self._rewards[:] = 0.0
+            self._terminations[:] = self._truncations
+        else:
+            self.reward_spec.evaluate(
+                self.simulator.output_float_array,
+                rewards=self._rewards,
+                terminations=self._terminations,
+            )
+            # 与reward_spec为None时一致，到达max_steps时terminated、truncated同时为True
+            self._terminations |= self._truncations
+
+        info = {}
+
+        if self.autoreset_mode == AutoresetMode.NEXT_STEP:
+            # 上一步结束的环境在本步重置，动作被忽略
+            if self._autoreset_envs.any():
+                self._reset_envs(np.flatnonzero(self._autoreset_envs))
+                self._rewards[self._autoreset_envs] = 0.0
+                self._terminations[self._autoreset_envs] = False
+                self._truncations[self._autoreset_envs] = False
+            np.logical_or(
+                self._terminations, self._truncations, out=self._autoreset_envs
+            )
+            observations = self._get_observations()
+        elif self.autoreset_mode == AutoresetMode.SAME_STEP:
+            # 结束的环境在本步立即重置，结束时的观测、步数放在info["final_obs"]、info["final_info"]中
+            done_envs = np.logical_or(self._terminations, self._truncations)
+            if done_envs.any():
+                final_observations = self._get_observations().copy()
+                final_step_cnts = self.step_cnts.copy()
+                self._reset_envs(np.flatnonzero(done_envs))
+                info["final_obs"] = final_observations
+                info["_final_obs"] = done_envs
+                info["final_info"] = {
+                    "step_cnt": final_step_cnts,
+                    "_step_cnt": done_envs,
+                }
+                info["_final_info"] = done_envs
+                # 只有重置的环境得到新的观测
+                observations = self._get_observations(update_mask=done_envs)
+            else:
+                observations = self._get_observations()
+        else:
+            observations = self._get_observations()
+
+        return (
+            np.copy(observations) if self.copy else observations,
+            np.copy(self._rewards) if self.copy else self._rewards,
+            np.copy(self._terminations) if self.copy else self._terminations,
+            np.copy(self._truncations) if self.copy else self._truncations,
+            info,
+        )
+
+    def _reset_envs(self, env_ids: np.ndarray) -> None:
+        if self.config_sampler is not None:
+            params = self.config_sampler.sample(len(env_ids), rng=self.np_random)
+            self.simulator.set_plane_params(
+                params[:, :NUM_PLANE_CONSTS], params[:, NUM_PLANE_CONSTS:], env_ids
+            )
+        self.simulator.reset_planes(
+            env_ids,
+            dLon=self.initial_lon,
+            dLat=self.initial_lat,
+            fAlt=self.initial_alt,
+            fTAS=self.initial_tas,
+            fYaw=self.initial_yaw,
+        )
+        self.step_cnts[env_ids] = 0
+
+    def _get_observations(self, update_mask: np.ndarray | None = None) -> np.ndarray:
+        """按预计算的下标从(N, 20)的float32输出视图中一次性取出，需要时做归一化
+
+        Args:
+            update_mask (np.ndarray | None, optional): "running"归一化时只用这些环境的观测更新统计量，为None时用全部环境. Defaults to None.
+        """
+        observations = np.take(
+            self.simulator.output_float_array,
+            self._observation_index,
+            axis=1,
+            out=self._observations,
+        )
+        if self.observation_stats is not None:
+            if self.update_observation_stats:
+                self.observation_stats.update_batch(
+                    observations if update_mask is None else observations[update_mask]
+                )
+            observations *= self.observation_stats.scale
+            observations += self.observation_stats.offset
+            np.clip(
+                observations,
+                -self.observation_clip,
+                self.observation_clip,
+                out=observations,
+            )
+        elif self.observation_normalization is not None:
+            observations *= self._observation_scale
+            observations += self._observation_offset
+            # 超出OBSERVATION_BOUNDS的值截断到[-1, 1]，与single_observation_space一致
+            np.clip(
+                observations,
+                self.single_observation_space.low,
+                self.single_observation_space.high,
+                out=observations,
+            )
+        return observations
@@ -0,0 +1,691 @@
+import functools
+import os
+import platform
+import threading
+from ctypes import (
+    CDLL,
+    POINTER,
+    byref,
+    c_double,
+    c_int,
+    c_uint64,
+    memmove,
+    pointer,
+    sizeof,
+)
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from a430py.simulator.a430_numpy_model import SNAPSHOT_DTYPE, A430NumpyModel
+from a430py.simulator.utils.a430_types import (
+    AeroCoeffs,
+    AircraftInput,
+    AircraftOutput,
+    InitializeInfo,
+    PlaneConsts,
+    StateInfo,
+)
+from a430py.simulator.utils.profiler import Profiler
+
+SRC_ROOT_DIR = Path(__file__).parent.parent
+
+
+@functools.cache
+def get_dll_path() -> str:
+    """查找并校验动态库路径，结果在进程内缓存；可以用环境变量A430PY_LIB_PATH指定路径"""
+    env_path = os.environ.get("A430PY_LIB_PATH")
+    osType = platform.system()
+    if env_path:
+        candidates = [Path(env_path)]
+    elif osType == "Linux":
+        candidates = [
+            # use in production environment
+            SRC_ROOT_DIR / "simulator" / "libs" / "liba430plane.so",
+            # use in development environment
+            SRC_ROOT_DIR.parent.parent / "build" / "liba430plane.so",
+        ]
+    elif osType == "Windows":
+        candidates = [SRC_ROOT_DIR / "simulator" / "libs" / "a430plane.dll"]
+    else:
+        raise Exception("Unsupported OS, only Linux and Windows are supported!!!")
+
+    for tmp_path in candidates:
+        if tmp_path.is_file():
+            return str(tmp_path)
+    raise FileNotFoundError(
+        f"A430 native library not found, tried: {[str(p) for p in candidates]}"
+    )
+
+
+def init_dll_func_types(a430_model: CDLL) -> None:
+    """设定dll函数输入输出"""
+    a430_model.initialize.argtypes = [c_double, c_int, InitializeInfo]
+    a430_model.initialize.restype = c_uint64
+
+    a430_model.initialize2.argtypes = [
+        c_double,
+        c_int,
+        InitializeInfo,
+        PlaneConsts,
+        AeroCoeffs,
+    ]
+    a430_model.initialize2.restype = c_uint64
+
+    a430_model.set_input.argtypes = [c_uint64, AircraftInput]
+    a430_model.update.argtypes = [c_uint64]
+    a430_model.get_plane_consts.argtypes = [c_uint64, POINTER(PlaneConsts)]
+    a430_model.get_aero_coeffs.argtypes = [c_uint64, POINTER(AeroCoeffs)]
+    a430_model.check_config.argtypes = [c_uint64]
+    a430_model.get_output.argtypes = [c_uint64, POINTER(AircraftOutput)]
+    a430_model.get_delta.argtypes = [c_uint64, POINTER(AircraftOutput)]
+    a430_model.terminate_plane.argtypes = [c_uint64]
+    a430_model.set_state.argtypes = [c_uint64, StateInfo]
+
+
+_LIBRARIES: dict[str | None, CDLL] = {}
+_LIBRARIES_LOCK = threading.Lock()
+
+
+def load_library(dll_path: str | None = None) -> CDLL:
+    """加载动态库并设定函数输入输出，每个路径在进程内只加载一次，之后直接返回缓存的CDLL
+
+    Args:
+        dll_path (str | None, optional): 动态库路径，为None时使用get_dll_path的结果. Defaults to None.
+    """
+    a430_model = _LIBRARIES.get(dll_path)
+    if a430_model is not None:
+        return a430_model
+
+    with _LIBRARIES_LOCK:
+        if dll_path not in _LIBRARIES:
+            a430_model = CDLL(get_dll_path() if dll_path is None else dll_path)
+            init_dll_func_types(a430_model)
+            _LIBRARIES[dll_path] = a430_model
+        return _LIBRARIES[dll_path]
+
+
+def param_structs(params, struct_cls: type, num_planes: int) -> list:
+    """把共用的PlaneConsts/AeroCoeffs结构体或(N,)的对应结构化数组转换为逐架飞机的结构体列表"""
+    if isinstance(params, np.ndarray):
+        assert len(params) == num_planes, "params must have one row per plane!"
+        return list((struct_cls * num_planes).from_buffer(np.ascontiguousarray(params)))
+    return [params] * num_planes
+
+
+def param_values(params) -> np.ndarray:
+    """PlaneConsts/AeroCoeffs结构体返回(k,)，对应的(N,)结构化数组返回(N, k)的float64视图"""
+    if isinstance(params, np.ndarray):
+        params = np.ascontiguousarray(params)
+        return params.view(np.float64).reshape(len(params), -1)
+    return np.frombuffer(params, dtype=np.float64)
+
+
+class A430Backend(object):
+    """飞机动力学后端的接口
+
+    每架飞机由create返回的整数句柄标识，结构体参数的含义与liba430plane一致，
+    输出通过pointer/byref写入调用方提供的AircraftOutput缓冲区。
+    *_batch方法同时处理多架飞机，输入输出为对应结构体的numpy结构化数组，默认实现逐架调用单机接口，
+    vectorized为True的后端会在数组上一次性完成。
+    *_batch方法的plane_consts、aero_coeffs可以是所有飞机共用的结构体，也可以是(N,)的对应结构化数组。
+    can_set_params为True的后端支持set_params，不重建飞机、不改变状态即可修改参数。
+    can_snapshot为True的后端支持get_snapshot/restore_snapshot，快照为完整的飞机状态（含位置），不含参数。
+    """
+
+    vectorized = False
+    can_set_params = False
+    can_snapshot = False
+
+    def create(
+        self,
+        step_time: float,
+        order: int,
+        init_info: InitializeInfo,
+        plane_consts: PlaneConsts,
+        aero_coeffs: AeroCoeffs,
+    ) -> int:
+        """创建一架飞机，返回其句柄"""
+        raise NotImplementedError
+
+    def reset(
+        self,
+        plane: int,
+        step_time: float,
+        order: int,
+        init_info: InitializeInfo,
+        plane_consts: PlaneConsts,
+        aero_coeffs: AeroCoeffs,
+    ) -> int:
+        """把飞机重置到init_info，返回重置后的句柄（可能与原句柄不同）"""
+        self.terminate(plane)
+        return self.create(step_time, order, init_info, plane_consts, aero_coeffs)
+
+    def set_state(self, plane: int, state: StateInfo) -> None:
+        raise NotImplementedError
+
+    def set_input(self, plane: int, aircraft_input: AircraftInput) -> None:
+        raise NotImplementedError
+
+    def update(self, plane: int, update_times: int = 1) -> None:
+        """以当前控制量推进update_times拍"""
+        raise NotImplementedError
+
+    def read_output(self, plane: int, aircraft_output) -> None:
+        """把飞机输出写入aircraft_output（AircraftOutput的pointer或byref）"""
+        raise NotImplementedError
+
+    def read_delta(self, plane: int, aircraft_output) -> None:
+        """把最近一拍输出的变化量写入aircraft_output（AircraftOutput的pointer或byref）"""
+        raise NotImplementedError
+
+    def read_plane_consts(self, plane: int, plane_consts) -> None:
+        raise NotImplementedError
+
+    def read_aero_coeffs(self, plane: int, aero_coeffs) -> None:
+        raise NotImplementedError
+
+    def check_config(self, plane: int) -> None:
+        raise NotImplementedError
+
+    def set_params(
+        self, plane: int, plane_consts: PlaneConsts, aero_coeffs: AeroCoeffs
+    ) -> None:
+        """修改一架已创建的飞机的参数，飞机状态不变，只有can_set_params为True的后端支持"""
+        raise NotImplementedError
+
+    def get_snapshot(self, plane: int) -> bytes:
+        """返回飞机完整状态的快照，只有can_snapshot为True的后端支持"""
+        raise NotImplementedError
+
+    def restore_snapshot(self, plane: int, snapshot: bytes) -> None:
+        """把快照（可以来自同一后端的其他飞机）写入飞机，只有can_snapshot为True的后端支持"""
+        raise NotImplementedError
+
+    def terminate(self, plane: int) -> None:
+        """销毁飞机，句柄随即失效"""
+        raise NotImplementedError
+
+    def create_batch(
+        self,
+        step_time: float,
+        order: int,
+        init_infos: np.ndarray,
+        plane_consts: PlaneConsts | np.ndarray,
+        aero_coeffs: AeroCoeffs | np.ndarray,
+    ) -> np.ndarray:
+        """按(N,)的InitializeInfo结构化数组创建N架飞机，返回(N,)的句柄数组"""
+        num_planes = len(init_infos)
+        init_info_structs = (InitializeInfo * num_planes).from_buffer(
+            np.ascontiguousarray(init_infos)
+        )
+        return np.array(
+            [
+                self.create(step_time, order, init_info, pc, ac)
+                for init_info, pc, ac in zip(
+                    init_info_structs,
+                    param_structs(plane_consts, PlaneConsts, num_planes),
+                    param_structs(aero_coeffs, AeroCoeffs, num_planes),
+                )
+            ],
+            dtype=np.uint64,
+        )
+
+    def reset_batch(
+        self,
+        planes: np.ndarray,
+        step_time: float,
+        order: int,
+        init_infos: np.ndarray,
+        plane_consts: PlaneConsts | np.ndarray,
+        aero_coeffs: AeroCoeffs | np.ndarray,
+    ) -> np.ndarray:
+        """把planes中的飞机分别重置到init_infos，返回重置后的句柄数组"""
+        num_planes = len(init_infos)
+        init_info_structs = (InitializeInfo * num_planes).from_buffer(
+            np.ascontiguousarray(init_infos)
+        )
+        return np.array(
+            [
+                self.reset(plane, step_time, order, init_info, pc, ac)
+                for plane, init_info, pc, ac in zip(
+                    planes.tolist(),
+                    init_info_structs,
+                    param_structs(plane_consts, PlaneConsts, num_planes),
+                    param_structs(aero_coeffs, AeroCoeffs, num_planes),
+                )
+            ],
+            dtype=np.uint64,
+        )
+
+    def set_params_batch(
+        self,
+        planes: np.ndarray,
+        plane_consts: PlaneConsts | np.ndarray,
+        aero_coeffs: AeroCoeffs | np.ndarray,
+    ) -> None:
+        """修改planes中飞机的参数，飞机状态不变，只有can_set_params为True的后端支持"""
+        num_planes = len(planes)
+        for plane, pc, ac in zip(
+            planes.tolist(),
+            param_structs(plane_consts, PlaneConsts, num_planes),
+            param_structs(aero_coeffs, AeroCoeffs, num_planes),
+        ):
+            self.set_params(plane, pc, ac)
+
+    def get_snapshot_batch(self, planes: np.ndarray) -> np.ndarray:
+        """返回(N, 快照字节数)的uint8数组，每行为一架飞机的快照"""
+        return np.stack(
+            [
+                np.frombuffer(self.get_snapshot(plane), dtype=np.uint8)
+                for plane in planes.tolist()
+            ]
+        )
+
+    def restore_snapshot_batch(self, planes: np.ndarray, snapshots: np.ndarray) -> None:
+        """把(N, 快照字节数)的快照逐行写入planes中的飞机"""
+        for plane, snapshot in zip(planes.tolist(), snapshots):
+            self.restore_snapshot(plane, snapshot.tobytes())
+
+    def set_state_batch(self, planes: np.ndarray, states: np.ndarray) -> None:
+        """以(N,)的StateInfo结构化数组设置planes中飞机的状态，位置保持不变"""
+        state_structs = (StateInfo * len(states)).from_buffer(
+            np.ascontiguousarray(states)
+        )
+        for plane, state in zip(planes.tolist(), state_structs):
+            self.set_state(plane, state)
+
+    def step_batch(
+        self,
+        planes: np.ndarray,
+        inputs: np.ndarray,
+        outputs: np.ndarray,
+        update_times: int = 1,
+    ) -> None:
+        """以(N,)的AircraftInput结构化数组为控制量推进planes中的飞机，输出写入(N,)的AircraftOutput结构化数组"""
+        input_structs = (AircraftInput * len(inputs)).from_buffer(inputs)
+        output_structs = (AircraftOutput * len(outputs)).from_buffer(outputs)
+        for plane, aircraft_input, aircraft_output in zip(
+            planes.tolist(), input_structs, output_structs
+        ):
+            self.set_input(plane, aircraft_input)
+            self.update(plane, update_times)
+            self.read_output(plane, byref(aircraft_output))
+
+    def read_output_batch(self, planes: np.ndarray, outputs: np.ndarray) -> None:
+        """把planes中飞机的输出写入(N,)的AircraftOutput结构化数组"""
+        output_structs = (AircraftOutput * len(outputs)).from_buffer(outputs)
+        for plane, aircraft_output in zip(planes.tolist(), output_structs):
+            self.read_output(plane, byref(aircraft_output))
+
+    def terminate_batch(self, planes: np.ndarray) -> None:
+        for plane in planes.tolist():
+            self.terminate(plane)
+
+    def bind(
+        self,
+        plane: int,
+        aircraft_input: AircraftInput,
+        aircraft_output: AircraftOutput,
+    ) -> Callable[..., None]:
+        """返回推进这架飞机的函数step(update_times=1)：以aircraft_input为控制量推进update_times拍，输出写入aircraft_output
+
+        参数在绑定时一次性准备好，调用方只需原地修改aircraft_input的内容再调用step。
+        """
+        set_input = self.set_input
+        update = self.update
+        read_output = self.read_output
+        aircraft_output_ptr = pointer(aircraft_output)
+
+        def step(update_times: int = 1) -> None:
+            set_input(plane, aircraft_input)
+            update(plane, update_times)
+            read_output(plane, aircraft_output_ptr)
+
+        return step
+
+
+class A430CtypesBackend(A430Backend):
+    """通过ctypes调用原生库liba430plane的后端
+
+    动态库由load_library在进程内加载一次，所有实例共用同一个CDLL，创建后端只需取出已设定类型的函数。
+    """
+
+    def __init__(self, dll_path: str | None = None) -> None:
+        self.a430_model = load_library(dll_path)
+        self._initialize2 = self.a430_model.initialize2
+        self._set_state = self.a430_model.set_state
+        self._set_input = self.a430_model.set_input
+        self._update = self.a430_model.update
+        self._get_output = self.a430_model.get_output
+        self._get_delta = self.a430_model.get_delta
+        self._terminate_plane = self.a430_model.terminate_plane
+        # 不设argtypes的函数指针：参数均为预先构造的ctypes对象，调用时不再经过逐个参数的from_param转换
+        self._raw_set_input = self._raw_function("set_input")
+        self._raw_update = self._raw_function("update")
+        self._raw_get_output = self._raw_function("get_output")
+
+        # step_batch按句柄与缓冲区地址缓存逐架飞机的结构体视图
+        self._batch_key = None
+        self._batch_handles: list[tuple] = []
+
+    def _raw_function(self, name: str):
+        func = self.a430_model._FuncPtr((name, self.a430_model))
+        func.restype = None
+        return func
+
+    def create(self, step_time, order, init_info, plane_consts, aero_coeffs) -> int:
+        return self._initialize2(step_time, order, init_info, plane_consts, aero_coeffs)
+
+    def set_state(self, plane: int, state: StateInfo) -> None:
+        self._set_state(plane, state)
+
+    def set_input(self, plane: int, aircraft_input: AircraftInput) -> None:
+        self._set_input(plane, aircraft_input)
+
+    def update(self, plane: int, update_times: int = 1) -> None:
+        update = self._update
+        for _ in range(update_times):
+            update(plane)
+
+    def read_output(self, plane: int, aircraft_output) -> None:
+        self._get_output(plane, aircraft_output)
+
+    def read_delta(self, plane: int, aircraft_output) -> None:
+        self._get_delta(plane, aircraft_output)
+
+    def read_plane_consts(self, plane: int, plane_consts) -> None:
+        self.a430_model.get_plane_consts(plane, plane_consts)
+
+    def read_aero_coeffs(self, plane: int, aero_coeffs) -> None:
+        self.a430_model.get_aero_coeffs(plane, aero_coeffs)
+
+    def check_config(self, plane: int) -> None:
+        self.a430_model.check_config(plane)
+
+    def terminate(self, plane: int) -> None:
+        self._terminate_plane(plane)
+
+    def bind(self, plane, aircraft_input, aircraft_output) -> Callable[..., None]:
+        set_input = self._raw_set_input
+        update = self._raw_update
+        get_output = self._raw_get_output
+        plane_arg = c_uint64(plane)
+        aircraft_output_ptr = pointer(aircraft_output)
+
+        def step(update_times: int = 1) -> None:
+            set_input(plane_arg, aircraft_input)
+            for _ in range(update_times):
+                update(plane_arg)
+            get_output(plane_arg, aircraft_output_ptr)
+
+        return step
+
+    def step_batch(self, planes, inputs, outputs, update_times: int = 1) -> None:
+        key = (planes.tobytes(), inputs.ctypes.data, outputs.ctypes.data)
+        if key != self._batch_key:
+            input_structs = (AircraftInput * len(inputs)).from_buffer(inputs)
+            output_structs = (AircraftOutput * len(outputs)).from_buffer(outputs)
+            self._batch_handles = [
+                (c_uint64(plane), aircraft_input, pointer(aircraft_output))
+                for plane, aircraft_input, aircraft_output in zip(
+                    planes.tolist(), input_structs, output_structs
+                )
+            ]
+            self._batch_key = key
+
+        set_input = self._raw_set_input
+        update = self._raw_update
+        get_output = self._raw_get_output
+        for plane, aircraft_input, aircraft_output_ptr in self._batch_handles:
+            set_input(plane, aircraft_input)
+            for _ in range(update_times):
+                update(plane)
+            get_output(plane, aircraft_output_ptr)
+
+
+class A430NumpyBackend(A430Backend):
+    """纯numpy实现的后端，所有飞机存放在同一个A430NumpyModel中，句柄即飞机在其中的下标
+
+    同一个后端中的飞机共用step_time与order；容量不足时按倍数扩容。
+    """
+
+    vectorized = True
+    can_set_params = True
+    can_snapshot = True
+
+    def __init__(self) -> None:
+        self.model: A430NumpyModel | None = None
+        self._free_planes: list[int] = []
+
+    def _allocate(self, num_planes: int, step_time: float, order: int) -> np.ndarray:
+        if self.model is None:
+            self.model = A430NumpyModel(
+                num_planes=num_planes, step_time=step_time, order=order
+            )
+            return np.arange(num_planes, dtype=np.intp)
+
+        assert (
+            self.model.step_time == step_time and self.model.order == order
+        ), "all planes of a numpy backend must share step_time and order!"
+        if len(self._free_planes) < num_planes:
+            capacity = self.model.num_planes
+            new_capacity = max(
+                2 * capacity, capacity + num_planes - len(self._free_planes)
+            )
+            self.model.resize(new_capacity)
+            self._free_planes.extend(range(capacity, new_capacity))
+        planes = self._free_planes[:num_planes]
+        del self._free_planes[:num_planes]
+        return np.array(planes, dtype=np.intp)
+
+    def _plane_ids(self, planes: np.ndarray) -> np.ndarray | None:
+        """句柄恰好为0..N-1且N等于容量时返回None，直接在整个数组上计算"""
+        plane_ids = np.asarray(planes, dtype=np.intp)
+        if len(plane_ids) == self.model.num_planes and np.array_equal(
+            plane_ids, np.arange(len(plane_ids))
+        ):
+            return None
+        return plane_ids
+
+    def _initialize(
+        self,
+        plane_ids: np.ndarray | None,
+        init_infos: np.ndarray,
+        plane_consts: PlaneConsts | np.ndarray,
+        aero_coeffs: AeroCoeffs | np.ndarray,
+    ) -> None:
+        self.model.set_params(
+            param_values(plane_consts), param_values(aero_coeffs), plane_ids
+        )
+        self.model.initialize(init_infos, plane_ids)
+
+    def create(self, step_time, order, init_info, plane_consts, aero_coeffs) -> int:
+        planes = self._allocate(1, step_time, order)
+        init_infos = np.frombuffer(init_info, dtype=np.dtype(InitializeInfo))
+        self._initialize(planes, init_infos, plane_consts, aero_coeffs)
+        return int(planes[0])
+
+    def reset(
+        self, plane, step_time, order, init_info, plane_consts, aero_coeffs
+    ) -> int:
+        init_infos = np.frombuffer(init_info, dtype=np.dtype(InitializeInfo))
+        self._initialize(
+            np.array([plane], dtype=np.intp), init_infos, plane_consts, aero_coeffs
+        )
+        return plane
+
+    def set_state(self, plane: int, state: StateInfo) -> None:
+        self.model.set_state(np.frombuffer(state, dtype=np.float64), [plane])
+
+    def set_input(self, plane: int, aircraft_input: AircraftInput) -> None:
+        self.model.set_input(np.frombuffer(aircraft_input, dtype=np.float32), [plane])
+
+    def update(self, plane: int, update_times: int = 1) -> None:
+        self.model.update(update_times, [plane])
+
+    def _read_record(self, records: np.ndarray, plane: int, target, size: int) -> None:
+        # 按行偏移：plane_consts、aero_coeffs是(N, k)的float64矩阵，一行才是一架飞机
+        memmove(target, records.ctypes.data + plane * records.strides[0], size)
+
+    def read_output(self, plane: int, aircraft_output) -> None:
+        self._read_record(
+            self.model.output_array, plane, aircraft_output, sizeof(AircraftOutput)
+        )
+
+    def read_delta(self, plane: int, aircraft_output) -> None:
+        self._read_record(
+            self.model.delta_array, plane, aircraft_output, sizeof(AircraftOutput)
+        )
+
+    def read_plane_consts(self, plane: int, plane_consts) -> None:
+        self._read_record(
+            self.model.plane_consts, plane, plane_consts, sizeof(PlaneConsts)
+        )
+
+    def read_aero_coeffs(self, plane: int, aero_coeffs) -> None:
+        self._read_record(
+            self.model.aero_coeffs, plane, aero_coeffs, sizeof(AeroCoeffs)
+        )
+
+    def check_config(self, plane: int) -> None:
+        plane_consts = PlaneConsts()
+        self.read_plane_consts(plane, byref(plane_consts))
+        print(
+            f"In numpy backend, check config, m = {plane_consts.m}, B = {plane_consts.B}"
+        )
+
+    def set_params(self, plane, plane_consts, aero_coeffs) -> None:
+        self.model.set_params(
+            param_values(plane_consts), param_values(aero_coeffs), [plane]
+        )
+
+    def get_snapshot(self, plane: int) -> bytes:
+        return self.model.get_snapshots([plane]).tobytes()
+
+    def restore_snapshot(self, plane: int, snapshot: bytes) -> None:
+        self.model.set_snapshots(np.frombuffer(snapshot, dtype=SNAPSHOT_DTYPE), [plane])
+
+    def terminate(self, plane: int) -> None:
+        self._free_planes.append(plane)
+
+    def create_batch(
+        self, step_time, order, init_infos, plane_consts, aero_coeffs
+    ) -> np.ndarray:
+        planes = self._allocate(len(init_infos), step_time, order)
+        self._initialize(self._plane_ids(planes), init_infos, plane_consts, aero_coeffs)
+        return planes.astype(np.uint64)
+
+    def reset_batch(
+        self, planes, step_time, order, init_infos, plane_consts, aero_coeffs
+    ) -> np.ndarray:
+        self._initialize(self._plane_ids(planes), init_infos, plane_consts, aero_coeffs)
+        return np.asarray(planes, dtype=np.uint64)
+
+    def set_params_batch(self, planes, plane_consts, aero_coeffs) -> None:
+        self.model.set_params(
+            param_values(plane_consts),
+            param_values(aero_coeffs),
+            self._plane_ids(planes),
+        )
+
+    def get_snapshot_batch(self, planes) -> np.ndarray:
+        snapshots = self.model.get_snapshots(self._plane_ids(planes))
+        return snapshots.view(np.uint8).reshape(len(snapshots), -1)
+
+    def restore_snapshot_batch(self, planes, snapshots) -> None:
+        self.model.set_snapshots(
+            np.ascontiguousarray(snapshots).view(SNAPSHOT_DTYPE).reshape(-1),
+            self._plane_ids(planes),
+        )
+
+    def set_state_batch(self, planes, states) -> None:
+        self.model.set_state(
+            np.ascontiguousarray(states).view(np.float64).reshape(-1, 10),
+            self._plane_ids(planes),
+        )
+
+    def step_batch(self, planes, inputs, outputs, update_times: int = 1) -> None:
+        plane_ids = self._plane_ids(planes)
+        self.model.set_input(inputs.view(np.float32).reshape(-1, 4), plane_ids)
+        self.model.update(update_times, plane_ids)
+        self._copy_outputs(outputs, plane_ids)
+
+    def read_output_batch(self, planes, outputs) -> None:
+        self._copy_outputs(outputs, self._plane_ids(planes))
+
+    def _copy_outputs(self, outputs: np.ndarray, plane_ids: np.ndarray | None) -> None:
+        if plane_ids is None:
+            outputs[...] = self.model.output_array
+        else:
+            outputs[...] = self.model.output_array[plane_ids]
+
+    def terminate_batch(self, planes: np.ndarray) -> None:
+        self._free_planes.extend(np.asarray(planes, dtype=np.intp).tolist())
+
+
+class A430ProfiledBackend(A430Backend):
+    """为另一个后端的每个接口计时的代理，阶段名为"backend.{方法名}"，其余属性（如a430_model）透传给被代理的后端"""
+
+    profiled_methods = [
+        "create",
+        "reset",
+        "set_state",
+        "set_input",
+        "update",
+        "read_output",
+        "read_delta",
+        "read_plane_consts",
+        "read_aero_coeffs",
+        "check_config",
+        "set_params",
+        "get_snapshot",
+        "restore_snapshot",
+        "terminate",
+        "create_batch",
+        "reset_batch",
+        "set_params_batch",
+        "get_snapshot_batch",
+        "restore_snapshot_batch",
+        "set_state_batch",
+        "step_batch",
+        "read_output_batch",
+        "terminate_batch",
+    ]
+
+    def __init__(self, backend: A430Backend, profiler: Profiler) -> None:
+        self.backend = backend
+        self.vectorized = backend.vectorized
+        self.can_set_params = backend.can_set_params
+        self.can_snapshot = backend.can_snapshot
+        for method_name in self.profiled_methods:
+            setattr(
+                self,
+                method_name,
+                profiler.timed(f"backend.{method_name}", getattr(backend, method_name)),
+            )
+
+    def __getattr__(self, name: str):
+        if name == "backend":
+            raise AttributeError(name)
+        return getattr(self.backend, name)
+
+
+BACKENDS: dict[str, type] = {
+    "ctypes": A430CtypesBackend,
+    "numpy": A430NumpyBackend,
+}
+
+
+def register_backend(name: str, backend_cls: type) -> None:
+    """注册自定义后端，之后可以在A430Simulator、A430Gym等处按名字选用"""
+    BACKENDS[name] = backend_cls
+
+
+def make_backend(backend: str | A430Backend) -> A430Backend:
+    """按名字创建后端，传入A430Backend实例时原样返回"""
+    if isinstance(backend, A430Backend):
+        return backend
+    assert backend in BACKENDS, f"backend must be one of {list(BACKENDS.keys())}!"
+    return BACKENDS[backend]()
@@ -0,0 +1,342 @@
+from ctypes import c_float
+
+import numpy as np
+
+from a430py.simulator.a430_backend import A430Backend, make_backend, param_values
+from a430py.simulator.a430_sim import PARAM_STRUCTS, A430Simulator
+from a430py.simulator.utils.a430_types import (
+    AeroCoeffs,
+    AircraftInput,
+    AircraftOutput,
+    InitializeInfo,
+    PlaneConsts,
+)
+
+
+class A430BatchSimulator(object):
+    """同时仿真N架飞机，输入输出均为numpy数组，不构造逐架飞机的dict
+
+    动作数组的列顺序与AircraftInput一致：fStickLat, fStickLon, fThrottle, fRudder；
+    输出数组的列顺序与output_fields（即AircraftOutput）一致。
+    所有飞机通过后端的*_batch接口推进，vectorized的后端（如"numpy"）在数组上一次性完成，不再逐架调用。
+    每架飞机的参数存放在plane_consts_array、aero_coeffs_array中，set_config为所有飞机设置同一套参数，
+    update_config、set_plane_params只修改取值发生变化的飞机。
+    """
+
+    def __init__(
+        self, num_planes: int, config: dict, backend: str | A430Backend = "ctypes"
+    ) -> None:
+        assert num_planes > 0, "num_planes must be positive!"
+
+        self.num_planes = num_planes
+        self.backend = backend
+        self.step_time = 0.01  # 单拍时间，秒
+        self.order = 1  # 龙格-库塔的阶数
+        self.custom_config = config
+        self._config: dict = A430Simulator.get_default_config()
+        self.output_fields = [name for name, _ in AircraftOutput._fields_]
+        self.input_fields = [name for name, _ in AircraftInput._fields_]
+
+        self.initDll()
+        self.initArgs()
+
+        self.set_config(config=config)
+
+    def initDll(self) -> None:
+        """创建动力学后端"""
+        self.backend: A430Backend = make_backend(self.backend)
+
+    def initArgs(self) -> None:
+        """初始化输入输出缓冲区，均为与ctypes结构体内存布局相同的numpy结构化数组"""
+        n = self.num_planes
+
+        self.init_info_array = np.zeros(n, dtype=np.dtype(InitializeInfo))
+        self.aircraft_input_array = np.zeros(n, dtype=np.dtype(AircraftInput))
+        self.aircraft_output_array = np.zeros(n, dtype=np.dtype(AircraftOutput))
+
+        # AircraftInput全部为float32，可以直接视为(N, 4)的矩阵
+        self._input_matrix = self.aircraft_input_array.view(np.float32).reshape(n, 4)
+        # AircraftOutput前2个字段为float64，其余20个字段为float32，output_float_array是后者的(N, 20)视图
+        self.output_float_fields = [
+            name for name, tp in AircraftOutput._fields_ if tp is c_float
+        ]
+        output_bytes = self.aircraft_output_array.view(np.uint8).reshape(n, -1)
+        self._output_doubles = output_bytes[:, : AircraftOutput.fAlt.offset].view(
+            np.float64
+        )
+        self.output_float_array = output_bytes[:, AircraftOutput.fAlt.offset :].view(
+            np.float32
+        )
+        self._output_matrix = np.zeros((n, len(self.output_fields)), dtype=np.float64)
+
+        self.plane_consts: PlaneConsts = PlaneConsts()
+        self.aero_coeffs: AeroCoeffs = AeroCoeffs()
+        # 逐架飞机的参数，PlaneConsts、AeroCoeffs全部为float64，_*_matrix是(N, 8)、(N, 27)的视图
+        self.plane_consts_array = np.zeros(n, dtype=np.dtype(PlaneConsts))
+        self.aero_coeffs_array = np.zeros(n, dtype=np.dtype(AeroCoeffs))
+        self._plane_consts_matrix = param_values(self.plane_consts_array)
+        self._aero_coeffs_matrix = param_values(self.aero_coeffs_array)
+
+        self.planePtrs: np.ndarray = np.zeros(0, dtype=np.uint64)
+
+    def get_config(self) -> dict:
+        return self._config
+
+    def set_config(self, config: dict) -> None:
+        """为所有飞机设置同一套参数，在下一次init_plane_model/reset时生效"""
+        self.custom_config = config
+        self._config.update(config)
+
+        assert set(A430Simulator.get_default_config().keys()) <= set(
+            self._config.keys()
+        ), f"config must contain keys: {A430Simulator.get_default_config().keys()}!"
+
+        self.plane_consts = PlaneConsts(
+            **{ky: self._config[ky] for ky, _ in PlaneConsts._fields_}
+        )
+        self.aero_coeffs = AeroCoeffs(
+            **{ky: self._config[ky] for ky, _ in AeroCoeffs._fields_}
+        )
+        self._plane_consts_matrix[...] = param_values(self.plane_consts)
+        self._aero_coeffs_matrix[...] = param_values(self.aero_coeffs)
+
+    def update_config(
+        self, config: dict, plane_ids: list[int] | np.ndarray | None = None
+    ) -> np.ndarray:
+        """增量修改部分飞机的参数，返回参数发生变化的飞机编号，见set_plane_params
+
+        Args:
+            config (dict): 要修改的参数，键为PlaneConsts、AeroCoeffs的字段名，值可以是标量，也可以是与plane_ids等长的数组.
+            plane_ids (list[int] | np.ndarray | None, optional): 要修改的飞机编号，为None时为所有飞机. Defaults to None.
+        """
+        plane_ids = self._get_plane_ids(plane_ids)
+        plane_consts = self.plane_consts_array[plane_ids]
+        aero_coeffs = self.aero_coeffs_array[plane_ids]
+        for ky, value in config.items():
+            assert ky in PARAM_STRUCTS, f"unknown config key: {ky}!"
+            if PARAM_STRUCTS[ky] == "plane_consts":
+                plane_consts[ky] = value
+            else:
+                aero_coeffs[ky] = value
+        return self.set_plane_params(plane_consts, aero_coeffs, plane_ids)
+
+    def set_plane_params(
+        self,
+        plane_consts: np.ndarray,
+        aero_coeffs: np.ndarray,
+        plane_ids: list[int] | np.ndarray | None = None,
+    ) -> np.ndarray:
+        """逐架替换飞机参数，与当前参数相同的飞机不做任何事，返回参数发生变化的飞机编号
+
+        后端支持set_params（如"numpy"）时直接修改已创建飞机的参数，飞机状态保持不变；
+        否则（如"ctypes"，原生库只能在initialize2时设置参数）在这些飞机下一次reset/reset_planes时生效。
+
+        Args:
+            plane_consts (np.ndarray): PlaneConsts结构化数组，或列顺序与PlaneConsts一致的(M, 8)矩阵，每行对应plane_ids中的一架飞机.
+            aero_coeffs (np.ndarray): AeroCoeffs结构化数组，或列顺序与AeroCoeffs一致的(M, 27)矩阵.
+            plane_ids (list[int] | np.ndarray | None, optional): 要修改的飞机编号，为None时为所有飞机. Defaults to None.
+        """
+        plane_ids = self._get_plane_ids(plane_ids)
+        plane_consts = self._to_param_matrix(plane_consts, len(plane_ids))
+        aero_coeffs = self._to_param_matrix(aero_coeffs, len(plane_ids))
+
+        changed = np.any(
+            plane_consts != self._plane_consts_matrix[plane_ids], axis=1
+        ) | np.any(aero_coeffs != self._aero_coeffs_matrix[plane_ids], axis=1)
+        changed_ids = plane_ids[changed]
+        if len(changed_ids) == 0:
+            return changed_ids
+
+        self._plane_consts_matrix[changed_ids] = plane_consts[changed]
+        self._aero_coeffs_matrix[changed_ids] = aero_coeffs[changed]
+        if self.backend.can_set_params and len(self.planePtrs) > 0:
+            self.backend.set_params_batch(
+                self.planePtrs[changed_ids],
+                self.plane_consts_array[changed_ids],
+                self.aero_coeffs_array[changed_ids],
+            )
+        return changed_ids
+
+    def _get_plane_ids(self, plane_ids: list[int] | np.ndarray | None) -> np.ndarray:
+        if plane_ids is None:
+            return np.arange(self.num_planes)
+        return np.asarray(plane_ids, dtype=np.int64).reshape(-1)
+
+    @staticmethod
+    def _to_param_matrix(params: np.ndarray, num_planes: int) -> np.ndarray:
+        """结构化数组或矩阵统一转换为(num_planes, 字段数)的float64矩阵，单行时广播到所有飞机"""
+        params = np.asarray(params)
+        if params.dtype.names is not None:
+            params = param_values(params.reshape(-1))
+        else:
+            params = np.asarray(params, dtype=np.float64)
+        params = np.atleast_2d(params)
+        return np.broadcast_to(params, (num_planes, params.shape[1]))
+
+    def set_init_info(
+        self,
+        dLon: float | np.ndarray = 120.0,
+        dLat: float | np.ndarray = 30.0,
+        fAlt: float | np.ndarray = 10.0,
+        fTAS: float | np.ndarray = 80.0,
+        fYaw: float | np.ndarray = 90.0,
+    ) -> None:
+        """设置飞机初始状态，各参数可以是标量，也可以是长度为N的数组"""
+        self.init_info_array["dLon"] = dLon
+        self.init_info_array["dLat"] = dLat
+        self.init_info_array["fAlt"] = fAlt
+        self.init_info_array["fTAS"] = fTAS
+        self.init_info_array["fYaw"] = fYaw
+
+    def init_plane_model(
+        self,
+        dLon: float | np.ndarray = 120.0,
+        dLat: float | np.ndarray = 30.0,
+        fAlt: float | np.ndarray = 10.0,
+        fTAS: float | np.ndarray = 8.0,
+        fYaw: float | np.ndarray = 90.0,
+    ) -> None:
+        self.set_init_info(dLon=dLon, dLat=dLat, fAlt=fAlt, fTAS=fTAS, fYaw=fYaw)
+
+        # 创建飞机实例
+        self.planePtrs = self.backend.create_batch(
+            self.step_time,
+            self.order,
+            self.init_info_array,
+            self.plane_consts_array,
+            self.aero_coeffs_array,
+        )
+
+    def terminate_planes(self) -> None:
+        self.backend.terminate_batch(self.planePtrs)
+        self.planePtrs = np.zeros(0, dtype=np.uint64)
+
+    def close(self) -> None:
+        """销毁所有飞机实例，可重复调用；之后调用reset会重新创建飞机"""
+        if hasattr(self, "backend") and hasattr(self, "planePtrs"):
+            self.terminate_planes()
+
+    def __enter__(self) -> "A430BatchSimulator":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        # 飞机销毁
+        self.close()
+
+    def reset(
+        self,
+        dLon: float | np.ndarray = 120.0,
+        dLat: float | np.ndarray = 30.0,
+        fAlt: float | np.ndarray = 10.0,
+        fTAS: float | np.ndarray = 80.0,
+        fYaw: float | np.ndarray = 90.0,
+    ) -> np.ndarray:
+        self.terminate_planes()
+        self.init_plane_model(dLon=dLon, dLat=dLat, fAlt=fAlt, fTAS=fTAS, fYaw=fYaw)
+        self.backend.read_output_batch(self.planePtrs, self.aircraft_output_array)
+
+        return self.get_aircraft_output()
+
+    def reset_planes(
+        self,
+        plane_ids: list[int] | np.ndarray,
+        dLon: float | np.ndarray = 120.0,
+        dLat: float | np.ndarray = 30.0,
+        fAlt: float | np.ndarray = 10.0,
+        fTAS: float | np.ndarray = 80.0,
+        fYaw: float | np.ndarray = 90.0,
+    ) -> None:
+        """只重置plane_ids中的飞机，其输出刷新到aircraft_output_array中，其余飞机不受影响
+
+        Args:
+            plane_ids (list[int] | np.ndarray): 需要重置的飞机编号.
+            其余参数可以是标量，也可以是与plane_ids等长的数组.
+        """
+        plane_ids = np.asarray(plane_ids, dtype=np.int64)
+        self.init_info_array["dLon"][plane_ids] = dLon
+        self.init_info_array["dLat"][plane_ids] = dLat
+        self.init_info_array["fAlt"][plane_ids] = fAlt
+        self.init_info_array["fTAS"][plane_ids] = fTAS
+        self.init_info_array["fYaw"][plane_ids] = fYaw
+
+        self.planePtrs[plane_ids] = self.backend.reset_batch(
+            self.planePtrs[plane_ids],
+            self.step_time,
+            self.order,
+            self.init_info_array[plane_ids],
+            self.plane_consts_array[plane_ids],
+            self.aero_coeffs_array[plane_ids],
+        )
+        # aircraft_output_array[plane_ids]是拷贝，先读到临时数组再写回
+        outputs = np.empty(len(plane_ids), dtype=self.aircraft_output_array.dtype)
+        self.backend.read_output_batch(self.planePtrs[plane_ids], outputs)
+        self.aircraft_output_array[plane_ids] = outputs
+
+    def get_snapshots(
+        self, plane_ids: list[int] | np.ndarray | None = None
+    ) -> np.ndarray:
+        """返回(M, 快照字节数)的uint8数组，每行为一架飞机完整状态的快照，见A430Simulator.get_snapshot
+
+        Args:
+            plane_ids (list[int] | np.ndarray | None, optional): 飞机编号，为None时为所有飞机. Defaults to None.
+        """
+        assert self.backend.can_snapshot, "backend does not support snapshots!"
+        return self.backend.get_snapshot_batch(
+            self.planePtrs[self._get_plane_ids(plane_ids)]
+        )
+
+    def restore_snapshots(
+        self,
+        snapshots: np.ndarray,
+        plane_ids: list[int] | np.ndarray | None = None,
+    ) -> None:
+        """把快照逐行写入plane_ids中的飞机，其输出刷新到aircraft_output_array中
+
+        Args:
+            snapshots (np.ndarray): get_snapshots返回的数组，可以来自其他飞机；只有一行时写入所有plane_ids.
+            plane_ids (list[int] | np.ndarray | None, optional): 飞机编号，为None时为所有飞机. Defaults to None.
+        """
+        assert self.backend.can_snapshot, "backend does not support snapshots!"
+        plane_ids = self._get_plane_ids(plane_ids)
+        snapshots = np.broadcast_to(
+            np.atleast_2d(snapshots), (len(plane_ids), np.shape(snapshots)[-1])
+        )
+        self.backend.restore_snapshot_batch(self.planePtrs[plane_ids], snapshots)
+
+        outputs = np.empty(len(plane_ids), dtype=self.aircraft_output_array.dtype)
+        self.backend.read_output_batch(self.planePtrs[plane_ids], outputs)
+        self.aircraft_output_array[plane_ids] = outputs
+
+    def set_aircraft_input(self, actions: np.ndarray) -> None:
+        """写入(N, 4)的控制量，列顺序为fStickLat, fStickLon, fThrottle, fRudder"""
+        self._input_matrix[...] = actions
+
+    def step(self, actions: np.ndarray) -> np.ndarray:
+        """所有飞机前进一拍
+
+        Args:
+            actions (np.ndarray): (N, 4)的控制量，列顺序为fStickLat, fStickLon, fThrottle, fRudder.
+
+        Returns:
+            np.ndarray: (N, 22)的输出，列顺序与output_fields一致。该数组在下一次调用时会被覆盖.
+        """
+        self.step_view(actions)
+        return self.get_aircraft_output()
+
+    def step_view(self, actions: np.ndarray) -> np.ndarray:
+        """所有飞机前进一拍，返回结构化输出缓冲区aircraft_output_array本身，不做任何转换"""
+        self.set_aircraft_input(actions)
+
+        self.backend.step_batch(
+            self.planePtrs, self.aircraft_input_array, self.aircraft_output_array
+        )
+        return self.aircraft_output_array
+
+    def get_aircraft_output(self) -> np.ndarray:
+        """将结构化输出整体转换为(N, 22)的float64数组，与飞机数量无关，只需两次拷贝"""
+        self._output_matrix[:, :2] = self._output_doubles
+        self._output_matrix[:, 2:] = self.output_float_array
+        return self._output_matrix
@@ -0,0 +1,136 @@
+import numpy as np
+
+from a430py.simulator.a430_sim import PARAM_STRUCTS, A430Simulator
+from a430py.simulator.utils.a430_types import AeroCoeffs, PlaneConsts
+
+# 参数矩阵的列顺序：PlaneConsts的8个字段，之后是AeroCoeffs的27个字段
+PARAM_FIELDS = list(PARAM_STRUCTS.keys())
+NUM_PLANE_CONSTS = len(PlaneConsts._fields_)
+DISTRIBUTIONS = ("uniform", "normal", "lognormal")
+
+
+def split_params(params: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """把(N, 35)的参数矩阵拆分为(N,)的PlaneConsts、AeroCoeffs结构化数组，内存连续，可以直接作为C结构体数组使用"""
+    params = np.asarray(params, dtype=np.float64).reshape(-1, len(PARAM_FIELDS))
+    plane_consts = np.ascontiguousarray(params[:, :NUM_PLANE_CONSTS])
+    aero_coeffs = np.ascontiguousarray(params[:, NUM_PLANE_CONSTS:])
+    return (
+        plane_consts.view(np.dtype(PlaneConsts)).reshape(-1),
+        aero_coeffs.view(np.dtype(AeroCoeffs)).reshape(-1),
+    )
+
+
+def params_to_configs(params: np.ndarray) -> list[dict]:
+    """把(N, 35)的参数矩阵转换为N个config dict，供A430Simulator.set_config/update_config使用"""
+    params = np.asarray(params, dtype=np.float64).reshape(-1, len(PARAM_FIELDS))
+    return [dict(zip(PARAM_FIELDS, row)) for row in params.tolist()]
+
+
+class ConfigSampler(object):
+    """飞机参数的向量化随机化采样器，一次采样得到N套参数组成的(N, 35)矩阵，列顺序为PARAM_FIELDS
+
+    每个参数的分布以基准值v为中心，scale为相对幅度：
+        "uniform": v + |v| * scale * U(-1, 1)
+        "normal": v + |v| * scale * N(0, 1)
+        "lognormal": v * exp(scale * N(0, 1))，不改变v的符号
+    采样后截断到[low, high]，未给出分布的参数固定为基准值。
+    """
+
+    def __init__(
+        self,
+        distributions: dict[str, dict],
+        base_config: dict | None = None,
+        seed: int | np.random.Generator | None = None,
+    ) -> None:
+        """创建采样器
+
+        Args:
+            distributions (dict[str, dict]): 参数名 -> 分布，如{"m": dict(dist="normal", scale=0.1, low=0.05)}，
+                dist为"uniform"、"normal"、"lognormal"之一，low、high可选.
+            base_config (dict | None, optional): 基准参数，未给出的参数使用A430Simulator的默认值. Defaults to None.
+            seed (int | np.random.Generator | None, optional): 随机数种子或Generator. Defaults to None.
+        """
+        config = A430Simulator.get_default_config()
+        if base_config is not None:
+            config.update(base_config)
+
+        self.distributions = distributions
+        self.rng = np.random.default_rng(seed)
+        self.base = np.array([config[ky] for ky in PARAM_FIELDS], dtype=np.float64)
+        self.scale = np.zeros(len(PARAM_FIELDS))
+        self.low = np.full(len(PARAM_FIELDS), -np.inf)
+        self.high = np.full(len(PARAM_FIELDS), np.inf)
+
+        columns = {dist: [] for dist in DISTRIBUTIONS}
+        for ky, spec in distributions.items():
+            assert ky in PARAM_STRUCTS, f"unknown config key: {ky}!"
+            assert (
+                spec["dist"] in DISTRIBUTIONS
+            ), f"dist must be one of {DISTRIBUTIONS}!"
+            i = PARAM_FIELDS.index(ky)
+            columns[spec["dist"]].append(i)
+            self.scale[i] = spec.get("scale", 0.0)
+            self.low[i] = spec.get("low", -np.inf)
+            self.high[i] = spec.get("high", np.inf)
+        assert np.all(self.scale >= 0.0), "scale must be non-negative!"
+        assert np.all(self.low <= self.high), "low must not be greater than high!"
+
+        self._uniform_columns = np.array(columns["uniform"], dtype=np.intp)
+        # normal与lognormal共用一次标准正态采样，前一部分为normal
+        self._normal_columns = np.array(
+            columns["normal"] + columns["lognormal"], dtype=np.intp
+        )
+        self._num_normal = len(columns["normal"])
+
+        # 预先计算采样时用到的系数：加性部分为|v| * scale，乘性部分为scale
+        self._uniform_coeffs = np.abs(self.base[self._uniform_columns]) * (
+            self.scale[self._uniform_columns]
+        )
+        normal_scale = self.scale[self._normal_columns]
+        self._normal_coeffs = np.abs(self.base[self._normal_columns]) * normal_scale
+        self._normal_coeffs[self._num_normal :] = normal_scale[self._num_normal :]
+
+    def sample(
+        self,
+        num_samples: int,
+        out: np.ndarray | None = None,
+        rng: np.random.Generator | None = None,
+    ) -> np.ndarray:
+        """采样num_samples套参数
+
+        Args:
+            num_samples (int): 采样数量N.
+            out (np.ndarray | None, optional): (N, 35)的float64输出数组，为None时新建. Defaults to None.
+            rng (np.random.Generator | None, optional): 本次使用的Generator，为None时使用采样器自己的. Defaults to None.
+
+        Returns:
+            np.ndarray: (N, 35)的参数矩阵，列顺序为PARAM_FIELDS.
+        """
+        rng = self.rng if rng is None else rng
+        if out is None:
+            out = np.empty((num_samples, len(PARAM_FIELDS)), dtype=np.float64)
+        assert out.shape == (
+            num_samples,
+            len(PARAM_FIELDS),
+        ), f"out must have shape {(num_samples, len(PARAM_FIELDS))}!"
+
+        out[...] = self.base
+        if len(self._uniform_columns) > 0:
+            noise = rng.uniform(
+                -1.0, 1.0, size=(num_samples, len(self._uniform_columns))
+            )
+            out[:, self._uniform_columns] += noise * self._uniform_coeffs
+        if len(self._normal_columns) > 0:
+            noise = rng.standard_normal((num_samples, len(self._normal_columns)))
+            noise *= self._normal_coeffs
+            k = self._num_normal
+            out[:, self._normal_columns[:k]] += noise[:, :k]
+            out[:, self._normal_columns[k:]] *= np.exp(noise[:, k:])
+        np.clip(out, self.low, self.high, out=out)
+        return out
+
+    def sample_structs(
+        self, num_samples: int, rng: np.random.Generator | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """采样num_samples套参数，返回(N,)的PlaneConsts、AeroCoeffs结构化数组，见split_params"""
+        return split_params(self.sample(num_samples, rng=rng))
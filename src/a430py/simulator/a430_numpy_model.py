@@ -0,0 +1,365 @@
+import numpy as np
+
+from a430py.simulator.utils.a430_types import (
+    AeroCoeffs,
+    AircraftOutput,
+    PlaneConsts,
+    StateInfo,
+)
+
+G = 9.81  # 重力加速度，m/s^2
+RHO = 1.225  # 空气密度，kg/m^3，飞行高度很低，取常数
+SPEED_OF_SOUND = 340.29  # 声速，m/s
+EARTH_RADIUS = 6353809.4  # 由经纬度与位移换算所用的地球半径，m
+# 原生库的诱导阻力比CDk * CL^2大，该系数由down_up_trace.csv拟合得到
+INDUCED_DRAG_GAIN = 1.15355
+
+PLANE_CONST_FIELDS = [name for name, _ in PlaneConsts._fields_]
+AERO_COEFF_FIELDS = [name for name, _ in AeroCoeffs._fields_]
+# 积分状态，前10个与StateInfo一致（角度单位rad），之后为北向、东向位移（m）及纬度、经度（deg）
+STATE_FIELDS = [name for name, _ in StateInfo._fields_] + ["npos", "epos", "lat", "lon"]
+
+# 一架飞机的快照：积分状态、控制量、输出及输出变化量，恢复后继续仿真与未中断时逐位相同
+SNAPSHOT_DTYPE = np.dtype(
+    [
+        ("state", np.float64, (len(STATE_FIELDS),)),
+        ("inputs", np.float64, (4,)),
+        ("output", np.dtype(AircraftOutput)),
+        ("delta", np.dtype(AircraftOutput)),
+    ]
+)
+
+_PC = {name: i for i, name in enumerate(PLANE_CONST_FIELDS)}
+_AC = {name: i for i, name in enumerate(AERO_COEFF_FIELDS)}
+
+
+class A430NumpyModel(object):
+    """A430六自由度动力学的numpy实现，同时仿真N架飞机，所有计算在(N, state)的数组上向量化完成
+
+    与原生库的约定一致：
+    1.状态为Stevens-Lewis形式的(vt, alpha, beta, phi, theta, psi, p, q, r, h)，外加位置；
+    2.升降舵、副翼偏角分别为fStickLon、fStickLat，单位deg；推力沿机体x轴，大小等于fThrottle（N）；
+    3.update先由当前状态和控制量计算输出，再用order阶龙格-库塔法积分一拍，即输出滞后状态一拍。
+    """
+
+    def __init__(
+        self,
+        num_planes: int,
+        step_time: float = 0.01,
+        order: int = 1,
+        plane_consts: np.ndarray | None = None,
+        aero_coeffs: np.ndarray | None = None,
+    ) -> None:
+        """创建N架飞机，飞机在initialize之前状态全为0
+
+        Args:
+            num_planes (int): 飞机数量.
+            step_time (float, optional): 单拍时间，秒. Defaults to 0.01.
+            order (int, optional): 龙格-库塔的阶数，1~4. Defaults to 1.
+            plane_consts (np.ndarray | None, optional): (8,)或(N, 8)的飞机特征参数，列顺序与PlaneConsts一致. Defaults to None.
+            aero_coeffs (np.ndarray | None, optional): (27,)或(N, 27)的气动系数，列顺序与AeroCoeffs一致. Defaults to None.
+        """
+        assert num_planes > 0, "num_planes must be positive!"
+        assert order in (1, 2, 3, 4), "order must be one of 1, 2, 3, 4!"
+
+        self.num_planes = 0
+        self.step_time = step_time
+        self.order = order
+        self.resize(num_planes)
+
+        if plane_consts is not None and aero_coeffs is not None:
+            self.set_params(plane_consts, aero_coeffs)
+
+    def resize(self, num_planes: int) -> None:
+        """改变飞机数量，前min(旧数量, 新数量)架飞机的参数、状态、控制量和输出保持不变"""
+        n = min(self.num_planes, num_planes)
+        buffer_names = [
+            "plane_consts",
+            "aero_coeffs",
+            "state",
+            "inputs",
+            "output_array",
+            "delta_array",
+        ]
+        old_buffers = {ky: getattr(self, ky) for ky in buffer_names if n > 0}
+
+        self.plane_consts = np.zeros((num_planes, len(PLANE_CONST_FIELDS)))
+        self.aero_coeffs = np.zeros((num_planes, len(AERO_COEFF_FIELDS)))
+        self.state = np.zeros((num_planes, len(STATE_FIELDS)), dtype=np.float64)
+        # 列顺序与AircraftInput一致：fStickLat, fStickLon, fThrottle, fRudder
+        self.inputs = np.zeros((num_planes, 4), dtype=np.float64)
+        self.output_array = np.zeros(num_planes, dtype=np.dtype(AircraftOutput))
+        self.delta_array = np.zeros(num_planes, dtype=np.dtype(AircraftOutput))
+
+        for ky, buffer in old_buffers.items():
+            getattr(self, ky)[:n] = buffer[:n]
+
+        # 输出的前2个字段为float64，其余20个字段为float32
+        self._output_doubles, self._output_floats = _split_output(self.output_array)
+        self._delta_doubles, self._delta_floats = _split_output(self.delta_array)
+        self.num_planes = num_planes
+
+    def set_params(
+        self,
+        plane_consts: np.ndarray,
+        aero_coeffs: np.ndarray,
+        plane_ids: np.ndarray | None = None,
+    ) -> None:
+        """设置飞机特征参数与气动系数，plane_ids为None时设置所有飞机"""
+        ids = _index(plane_ids)
+        self.plane_consts[ids] = plane_consts
+        self.aero_coeffs[ids] = aero_coeffs
+
+    def initialize(
+        self, init_info: np.ndarray, plane_ids: np.ndarray | None = None
+    ) -> None:
+        """按InitializeInfo结构化数组把飞机置于初始状态：水平直飞，姿态角、角速度为0，控制量清零"""
+        ids = _index(plane_ids)
+        state = np.zeros((len(init_info), len(STATE_FIELDS)))
+        state[:, 0] = init_info["fTAS"]
+        state[:, 5] = np.deg2rad(init_info["fYaw"])
+        state[:, 9] = init_info["fAlt"]
+        state[:, 12] = init_info["dLat"]
+        state[:, 13] = init_info["dLon"]
+        self.state[ids] = state
+        self.inputs[ids] = 0.0
+        self._refresh_output(ids)
+        self._delta_doubles[ids] = 0.0
+        self._delta_floats[ids] = 0.0
+
+    def set_state(
+        self, states: np.ndarray, plane_ids: np.ndarray | None = None
+    ) -> None:
+        """设置(N, 10)的状态，列顺序与StateInfo一致，位置保持不变"""
+        ids = _index(plane_ids)
+        self.state[ids, :10] = states
+        self._refresh_output(ids)
+
+    def set_input(
+        self, inputs: np.ndarray, plane_ids: np.ndarray | None = None
+    ) -> None:
+        """设置(N, 4)的控制量，列顺序与AircraftInput一致"""
+        self.inputs[_index(plane_ids)] = inputs
+
+    def get_snapshots(self, plane_ids: np.ndarray | None = None) -> np.ndarray:
+        """返回SNAPSHOT_DTYPE结构化数组，不含飞机参数"""
+        ids = _index(plane_ids)
+        state = self.state[ids]
+        snapshots = np.empty(len(state), dtype=SNAPSHOT_DTYPE)
+        snapshots["state"] = state
+        snapshots["inputs"] = self.inputs[ids]
+        snapshots["output"] = self.output_array[ids]
+        snapshots["delta"] = self.delta_array[ids]
+        return snapshots
+
+    def set_snapshots(
+        self, snapshots: np.ndarray, plane_ids: np.ndarray | None = None
+    ) -> None:
+        """把get_snapshots得到的快照写入plane_ids中的飞机，快照可以来自其他飞机"""
+        ids = _index(plane_ids)
+        self.state[ids] = snapshots["state"]
+        self.inputs[ids] = snapshots["inputs"]
+        self.output_array[ids] = snapshots["output"]
+        self.delta_array[ids] = snapshots["delta"]
+
+    def update(
+        self, update_times: int = 1, plane_ids: np.ndarray | None = None
+    ) -> np.ndarray:
+        """以当前控制量推进update_times拍，plane_ids为None时推进所有飞机，返回结构化输出output_array"""
+        ids = _index(plane_ids)
+        pc, ac = self.plane_consts[ids], self.aero_coeffs[ids]
+        u = self.inputs[ids]
+        x = self.state[ids]
+
+        for i in range(update_times):
+            if i == update_times - 1:
+                last_doubles = self._output_doubles[ids].copy()
+                last_floats = self._output_floats[ids].copy()
+            k1, forces = self._derivatives(x, u, pc, ac)
+            self._write_output(x, k1, forces, ids)
+            x = self._integrate(x, u, pc, ac, k1)
+            # 航向角保持在[-pi, pi)
+            x[:, 5] = np.remainder(x[:, 5] + np.pi, 2 * np.pi) - np.pi
+
+        self.state[ids] = x
+        if update_times > 0:
+            self._delta_doubles[ids] = self._output_doubles[ids] - last_doubles
+            self._delta_floats[ids] = self._output_floats[ids] - last_floats
+        return self.output_array
+
+    def _integrate(
+        self,
+        x: np.ndarray,
+        u: np.ndarray,
+        pc: np.ndarray,
+        ac: np.ndarray,
+        k1: np.ndarray,
+    ) -> np.ndarray:
+        dt = self.step_time
+        f = self._derivatives
+        if self.order == 1:
+            return x + dt * k1
+        if self.order == 2:
+            k2, _ = f(x + dt * k1, u, pc, ac)
+            return x + dt / 2 * (k1 + k2)
+        if self.order == 3:
+            k2, _ = f(x + dt / 2 * k1, u, pc, ac)
+            k3, _ = f(x - dt * k1 + 2 * dt * k2, u, pc, ac)
+            return x + dt / 6 * (k1 + 4 * k2 + k3)
+        k2, _ = f(x + dt / 2 * k1, u, pc, ac)
+        k3, _ = f(x + dt / 2 * k2, u, pc, ac)
+        k4, _ = f(x + dt * k3, u, pc, ac)
+        return x + dt / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+
+    @staticmethod
+    def _derivatives(
+        x: np.ndarray, u: np.ndarray, pc: np.ndarray, ac: np.ndarray
+    ) -> tuple[np.ndarray, tuple]:
+        """计算状态导数，同时返回机体系比力(ax, ay, az)"""
+        S, cbar, B, m = (
+            pc[:, _PC["S"]],
+            pc[:, _PC["cbar"]],
+            pc[:, _PC["B"]],
+            pc[:, _PC["m"]],
+        )
+        Jx, Jy, Jz, Jxz = (
+            pc[:, _PC["Jx"]],
+            pc[:, _PC["Jy"]],
+            pc[:, _PC["Jz"]],
+            pc[:, _PC["Jxz"]],
+        )
+
+        vt, alpha, beta, phi, theta, psi, p, q, r = x[:, :9].T
+        da, de, thrust = u[:, 0], u[:, 1], u[:, 2]
+
+        cos_a, sin_a = np.cos(alpha), np.sin(alpha)
+        cos_b, sin_b = np.cos(beta), np.sin(beta)
+        cos_phi, sin_phi = np.cos(phi), np.sin(phi)
+        cos_theta, sin_theta = np.cos(theta), np.sin(theta)
+        cos_psi, sin_psi = np.cos(psi), np.sin(psi)
+
+        # 气动系数
+        q_hat = q * cbar / (2 * vt)
+        p_hat = p * B / (2 * vt)
+        r_hat = r * B / (2 * vt)
+        CL = ac[:, _AC["CL0"]] + ac[:, _AC["CLal"]] * alpha
+        CL += ac[:, _AC["CLq"]] * q_hat + ac[:, _AC["CLde"]] * de
+        CD = ac[:, _AC["CD0"]] + INDUCED_DRAG_GAIN * ac[:, _AC["CDk"]] * CL**2
+        CD += ac[:, _AC["CDde"]] * de + ac[:, _AC["CDda"]] * da
+        CY = ac[:, _AC["Cy0"]] + ac[:, _AC["Cybe"]] * beta
+        CY += ac[:, _AC["Cyp"]] * p_hat + ac[:, _AC["Cyr"]] * r_hat
+        CY += ac[:, _AC["Cyda"]] * da
+        Cl = ac[:, _AC["Cl0"]] + ac[:, _AC["Clbe"]] * beta
+        Cl += ac[:, _AC["Clp"]] * p_hat + ac[:, _AC["Clr"]] * r_hat
+        Cl += ac[:, _AC["Clda"]] * da
+        Cm = ac[:, _AC["Cm0"]] + ac[:, _AC["Cmal"]] * alpha
+        Cm += ac[:, _AC["Cmq"]] * q_hat + ac[:, _AC["Cmde"]] * de
+        Cn = ac[:, _AC["Cn0"]] + ac[:, _AC["Cnbe"]] * beta
+        Cn += ac[:, _AC["Cnp"]] * p_hat + ac[:, _AC["Cnr"]] * r_hat
+        Cn += ac[:, _AC["Cnda"]] * da
+
+        # 机体系比力与力矩
+        qS = 0.5 * RHO * vt**2 * S
+        ax = (thrust + qS * (CL * sin_a - CD * cos_a)) / m
+        ay = qS * CY / m
+        az = -qS * (CL * cos_a + CD * sin_a) / m
+        roll_moment = qS * B * Cl
+        pitch_moment = qS * cbar * Cm
+        yaw_moment = qS * B * Cn
+
+        # 力方程
+        u_b = vt * cos_a * cos_b
+        v_b = vt * sin_b
+        w_b = vt * sin_a * cos_b
+        u_dot = r * v_b - q * w_b - G * sin_theta + ax
+        v_dot = p * w_b - r * u_b + G * cos_theta * sin_phi + ay
+        w_dot = q * u_b - p * v_b + G * cos_theta * cos_phi + az
+
+        dx = np.empty_like(x)
+        dx[:, 0] = (u_b * u_dot + v_b * v_dot + w_b * w_dot) / vt
+        dx[:, 1] = (u_b * w_dot - w_b * u_dot) / (u_b**2 + w_b**2)
+        dx[:, 2] = (vt * v_dot - v_b * dx[:, 0]) / (vt**2 * cos_b)
+
+        # 运动学方程
+        dx[:, 3] = p + np.tan(theta) * (q * sin_phi + r * cos_phi)
+        dx[:, 4] = q * cos_phi - r * sin_phi
+        dx[:, 5] = (q * sin_phi + r * cos_phi) / cos_theta
+
+        # 力矩方程
+        gamma = Jx * Jz - Jxz**2
+        dx[:, 6] = (
+            ((Jy - Jz) * Jz - Jxz**2) / gamma * r + (Jx - Jy + Jz) * Jxz / gamma * p
+        ) * q + (Jz * roll_moment + Jxz * yaw_moment) / gamma
+        dx[:, 7] = ((Jz - Jx) * p * r - Jxz * (p**2 - r**2) + pitch_moment) / Jy
+        dx[:, 8] = (
+            (Jx * (Jx - Jy) + Jxz**2) / gamma * p - (Jx - Jy + Jz) * Jxz / gamma * r
+        ) * q + (Jxz * roll_moment + Jx * yaw_moment) / gamma
+
+        # 导航方程，机体系速度转到北东地坐标系
+        v_north = (
+            u_b * cos_theta * cos_psi
+            + v_b * (sin_phi * sin_theta * cos_psi - cos_phi * sin_psi)
+            + w_b * (cos_phi * sin_theta * cos_psi + sin_phi * sin_psi)
+        )
+        v_east = (
+            u_b * cos_theta * sin_psi
+            + v_b * (sin_phi * sin_theta * sin_psi + cos_phi * cos_psi)
+            + w_b * (cos_phi * sin_theta * sin_psi - sin_phi * cos_psi)
+        )
+        v_down = -u_b * sin_theta + (v_b * sin_phi + w_b * cos_phi) * cos_theta
+        dx[:, 9] = -v_down
+        dx[:, 10] = v_north
+        dx[:, 11] = v_east
+        dx[:, 12] = np.rad2deg(v_north / EARTH_RADIUS)
+        dx[:, 13] = np.rad2deg(v_east / (EARTH_RADIUS * np.cos(np.deg2rad(x[:, 12]))))
+
+        return dx, (ax, ay, az)
+
+    def _write_output(
+        self, x: np.ndarray, dx: np.ndarray, forces: tuple, ids: slice | np.ndarray
+    ) -> None:
+        out = self.output_array
+        ax, ay, az = forces
+        out["dLat"][ids] = x[:, 12]
+        out["dLon"][ids] = x[:, 13]
+        out["fAlt"][ids] = x[:, 9]
+        out["fRoll"][ids] = np.rad2deg(x[:, 3])
+        out["fPitch"][ids] = np.rad2deg(x[:, 4])
+        out["fYaw"][ids] = np.rad2deg(x[:, 5])
+        out["fAlpha"][ids] = np.rad2deg(x[:, 1])
+        out["fBeta"][ids] = np.rad2deg(x[:, 2])
+        out["fP"][ids] = np.rad2deg(x[:, 6])
+        out["fQ"][ids] = np.rad2deg(x[:, 7])
+        out["fR"][ids] = np.rad2deg(x[:, 8])
+        out["fVn"][ids] = dx[:, 10]
+        out["fVe"][ids] = dx[:, 11]
+        # 与原生库一致，fVu下降时为正
+        out["fVu"][ids] = -dx[:, 9]
+        out["fAccBx"][ids] = ax
+        out["fAccBy"][ids] = ay
+        out["fAccBz"][ids] = az
+        out["fTAS"][ids] = x[:, 0]
+        out["fMach"][ids] = x[:, 0] / SPEED_OF_SOUND
+        out["fNvn"][ids] = -az / G
+        out["fnpos"][ids] = x[:, 10]
+        out["fepos"][ids] = x[:, 11]
+
+    def _refresh_output(self, ids: slice | np.ndarray) -> None:
+        x = self.state[ids]
+        dx, forces = self._derivatives(
+            x, self.inputs[ids], self.plane_consts[ids], self.aero_coeffs[ids]
+        )
+        self._write_output(x, dx, forces, ids)
+
+
+def _index(plane_ids: np.ndarray | None) -> slice | np.ndarray:
+    return slice(None) if plane_ids is None else plane_ids
+
+
+def _split_output(records: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """AircraftOutput结构化数组的(N, 2)的float64视图与(N, 20)的float32视图"""
+    record_bytes = records.view(np.uint8).reshape(len(records), -1)
+    return (
+        record_bytes[:, : AircraftOutput.fAlt.offset].view(np.float64),
+        record_bytes[:, AircraftOutput.fAlt.offset :].view(np.float32),
+    )
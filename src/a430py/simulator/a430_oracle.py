@@ -0,0 +1,85 @@
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+from a430py.simulator.a430_sim import A430Simulator
+
+# 每个工作进程持有一个simulator，在进程内复用
+_worker_simulator: A430Simulator | None = None
+
+
+def _init_worker(config: dict, backend: str) -> None:
+    global _worker_simulator
+    _worker_simulator = A430Simulator(config=config, backend=backend)
+
+
+def _step_chunk(
+    observations: np.ndarray,
+    actions: np.ndarray,
+    update_times: int,
+    in_place_reset: bool,
+) -> np.ndarray:
+    return _worker_simulator.step_from_customized_observations(
+        observations,
+        actions,
+        update_times=update_times,
+        in_place_reset=in_place_reset,
+    )
+
+
+def step_from_customized_observations(
+    observations: np.ndarray,
+    actions: np.ndarray,
+    update_times: int = 1,
+    config: dict = {},
+    num_workers: int | None = 1,
+    chunk_size: int = 10000,
+    in_place_reset: bool = False,
+    context: str | None = None,
+    backend: str = "ctypes",
+) -> np.ndarray:
+    """批量计算(state, action) -> next_state，可以分块分发到多个进程
+
+    Args:
+        observations (np.ndarray): (N, 10)的状态，列顺序为vt, alpha, beta, phi, theta, psi, p, q, r, h，角度单位为deg.
+        actions (np.ndarray): (N, 4)的控制量，列顺序为fStickLat, fStickLon, fThrottle, fRudder.
+        update_times (int, optional): 每个样本仿真的拍数. Defaults to 1.
+        config (dict, optional): 飞机参数. Defaults to {}.
+        num_workers (int | None, optional): 进程数，为1时在当前进程中计算，为None时使用CPU核数. Defaults to 1.
+        chunk_size (int, optional): 分发给进程的每块样本数. Defaults to 10000.
+        in_place_reset (bool, optional): 见A430Simulator.step_from_customized_observations. Defaults to False.
+        context (str | None, optional): multiprocessing的启动方式. Defaults to None.
+        backend (str, optional): 动力学后端的名字，见A430Simulator. Defaults to "ctypes".
+
+    Returns:
+        np.ndarray: (N, 22)的下一状态，列顺序与A430Simulator.output_fields一致.
+    """
+    observations = np.asarray(observations, dtype=np.float64).reshape(-1, 10)
+    actions = np.asarray(actions, dtype=np.float32).reshape(-1, 4)
+
+    if num_workers == 1 or len(observations) <= chunk_size:
+        sim = A430Simulator(config=config, backend=backend)
+        return sim.step_from_customized_observations(
+            observations,
+            actions,
+            update_times=update_times,
+            in_place_reset=in_place_reset,
+        )
+
+    chunk_starts = range(0, len(observations), chunk_size)
+    with ProcessPoolExecutor(
+        max_workers=num_workers,
+        mp_context=mp.get_context(context),
+        initializer=_init_worker,
+        initargs=(config, backend),
+    ) as executor:
+        next_observations = executor.map(
+            _step_chunk,
+            (observations[start : start + chunk_size] for start in chunk_starts),
+            (actions[start : start + chunk_size] for start in chunk_starts),
+            repeat(update_times),
+            repeat(in_place_reset),
+        )
+        return np.concatenate(list(next_observations), axis=0)
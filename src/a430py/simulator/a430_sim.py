@@ -1,10 +1,17 @@
-import gc
-import platform
-from ctypes import CDLL, POINTER, byref, c_double, c_int, c_uint64
-from pathlib import Path
+import math
+from collections import OrderedDict
+from ctypes import byref, c_float, memmove, pointer, sizeof
 
 import numpy as np
 
+from a430py.simulator.a430_backend import (  # noqa: F401
+    A430Backend,
+    A430ProfiledBackend,
+    get_dll_path,
+    init_dll_func_types,
+    make_backend,
+)
+from a430py.simulator.utils.a430_trajectory import TrajectoryRecorder
 from a430py.simulator.utils.a430_types import (
     AeroCoeffs,
     AircraftInput,
@@ -13,12 +20,77 @@ from a430py.simulator.utils.a430_types import (
     PlaneConsts,
     StateInfo,
 )
+from a430py.simulator.utils.async_logger import AsyncLogger
+from a430py.simulator.utils.profiler import Profiler
+
+# 飞机参数名 -> 所在的结构体属性
+PARAM_STRUCTS: dict[str, str] = {
+    **{name: "plane_consts" for name, _ in PlaneConsts._fields_},
+    **{name: "aero_coeffs" for name, _ in AeroCoeffs._fields_},
+}
+
 
-SRC_ROOT_DIR = Path(__file__).parent.parent
+def output_records_to_array(
+    records: np.ndarray, out: np.ndarray | None = None
+) -> np.ndarray:
+    """把AircraftOutput结构化数组整体转换为(N, 22)的float64数组，列顺序与AircraftOutput一致"""
+    # 显式给出行长度，records为空时也能reshape
+    record_bytes = records.view(np.uint8).reshape(len(records), records.itemsize)
+    if out is None:
+        out = np.empty((len(records), len(AircraftOutput._fields_)), dtype=np.float64)
+    out[:, :2] = record_bytes[:, : AircraftOutput.fAlt.offset].view(np.float64)
+    out[:, 2:] = record_bytes[:, AircraftOutput.fAlt.offset :].view(np.float32)
+    return out
 
 
 class A430Simulator(object):
-    def __init__(self, config: dict) -> None:
+    # enable_profiling时计时的方法，阶段名为"sim.{方法名}"
+    profiled_methods = [
+        "step",
+        "step_array",
+        "reset",
+        "update",
+        "set_aircraft_input",
+        "set_aircraft_state",
+        "get_aircraft_output",
+        "get_aircraft_output_view",
+        "rollout",
+        "step_from_customized_observation",
+        "step_from_customized_observations",
+    ]
+
+    def __init__(
+        self,
+        config: dict,
+        zero_copy: bool = False,
+        backend: str | A430Backend = "ctypes",
+        recorder: TrajectoryRecorder | AsyncLogger | None = None,
+        reset_cache_size: int = 0,
+    ) -> None:
+        """A430飞机仿真器
+
+        Args:
+            config (dict): 飞机参数，未给出的参数使用默认值.
+            zero_copy (bool, optional): 为True时，reset/step直接返回aircraft_output_array（复用的numpy结构化数组视图，
+                可以像dict一样用字段名索引），不再每步构造dict. Defaults to False.
+            backend (str | A430Backend, optional): 动力学后端的名字或实例，"ctypes"为原生库liba430plane，
+                "numpy"为纯numpy实现（不依赖原生库），也可以是通过register_backend注册的名字. Defaults to "ctypes".
+            recorder (TrajectoryRecorder | AsyncLogger | None, optional): 轨迹记录器，AsyncLogger在后台线程写盘，reset记录初始输出（控制量为0），
+                step/update记录每一拍之后的输出及该拍施加的控制量，rollout只记录被采样的拍. Defaults to None.
+            reset_cache_size (int, optional): 大于0时缓存最近使用的reset_cache_size个初始状态（以初始状态和飞机参数为键，LRU淘汰），
+                reset命中时不再新建飞机，而是恢复飞机刚创建时的快照，结果与新建飞机逐位相同。需要后端支持快照（如"numpy"），
+                原生库无法恢复位置，ctypes后端下不使用缓存，每次reset仍新建飞机. Defaults to 0.
+        """
+        self.zero_copy = zero_copy
+        self.backend = backend
+        self.recorder = recorder
+        self.tick_cnt = 0  # reset之后仿真的拍数
+        self.reset_cache_size = reset_cache_size
+        # 初始状态与飞机参数 -> 飞机刚创建时的快照
+        self._reset_cache: OrderedDict[bytes, bytes] = OrderedDict()
+        self._plane_params = b""  # 当前飞机实例实际使用的参数
+        self.profiler: Profiler | None = None
+        self._stepper = None  # backend.bind得到的推进函数，飞机或后端改变后置为None，下一次step时重新绑定
         self.step_time = 0.01  # 单拍时间，秒
         self.order = 1  # 龙格-库塔的阶数
         self.custom_config = config
@@ -47,6 +119,7 @@ class A430Simulator(object):
             "fnpos",
             "fepos",
         ]
+        self.input_fields = [name for name, _ in AircraftInput._fields_]
         self.plane_const_fields = [
             "S",
             "cbar",
@@ -85,38 +158,48 @@ class A430Simulator(object):
 
         self.initDll()
         self.initArgs()
-        self.initDllFuncTypes()
 
         self.set_config(config=config)
 
         # self.init_plane_model()
 
     def initDll(self) -> None:
-        """加载dll"""
-        osType = platform.system()
-        if osType == "Linux":
-
-            # use in production environment
-            tmp_path = SRC_ROOT_DIR / "simulator" / "libs" / "liba430plane.so"
-            # use in development environment
-            if not tmp_path.exists():
-                tmp_path = SRC_ROOT_DIR.parent.parent / "build" / "liba430plane.so"
-
-            dll_path = str(tmp_path)
-        elif osType == "Windows":
-            dll_path = str(SRC_ROOT_DIR / "simulator" / "libs" / "a430plane.dll")
-        else:
-            raise Exception("Unsupported OS, only Linux and Windows are supported!!!")
-
-        self.a430_model = CDLL(dll_path)
+        """创建动力学后端"""
+        self.backend: A430Backend = make_backend(self.backend)
 
     def initArgs(self) -> None:
         """初始化dll定义的部分对象"""
         self.init_info: InitializeInfo = InitializeInfo()
-        self.aircraft_input: AircraftInput = AircraftInput()
-        self.aircraft_output: AircraftOutput = AircraftOutput()
+
+        # 输入、输出、状态结构体与预分配的numpy结构化数组共享内存，dll直接读写numpy缓冲区
+        self.aircraft_input_array = np.zeros((), dtype=np.dtype(AircraftInput))
+        self.aircraft_output_array = np.zeros((), dtype=np.dtype(AircraftOutput))
+        self.aircraft_state_array = np.zeros((), dtype=np.dtype(StateInfo))
+        self.aircraft_input: AircraftInput = AircraftInput.from_buffer(
+            self.aircraft_input_array
+        )
+        self.aircraft_output: AircraftOutput = AircraftOutput.from_buffer(
+            self.aircraft_output_array
+        )
         self.aircraft_output_delta: AircraftOutput = AircraftOutput()
-        self.aircraft_state: StateInfo = StateInfo()
+        self.aircraft_state: StateInfo = StateInfo.from_buffer(
+            self.aircraft_state_array
+        )
+        self._aircraft_output_ptr = pointer(self.aircraft_output)
+        # AircraftInput全部为float32，aircraft_input_float_array是其4个字段的一维视图
+        self.aircraft_input_float_array = self.aircraft_input_array.reshape(1).view(
+            np.float32
+        )
+
+        # AircraftOutput中除dLon、dLat外均为float32，output_float_array是这20个字段的一维视图
+        self.output_float_fields = [
+            name for name, tp in AircraftOutput._fields_ if tp is c_float
+        ]
+        self.output_float_array = (
+            self.aircraft_output_array.reshape(1)
+            .view(np.uint8)[AircraftOutput.fAlt.offset :]
+            .view(np.float32)
+        )
 
         self.plane_consts: PlaneConsts = PlaneConsts()
         self.aero_coeffs: AeroCoeffs = AeroCoeffs()
@@ -124,30 +207,6 @@ class A430Simulator(object):
         self.plane_consts_for_read: PlaneConsts = PlaneConsts()
         self.aero_coeffs_for_read: AeroCoeffs = AeroCoeffs()
 
-    def initDllFuncTypes(self) -> None:
-        """设定dll函数输入输出"""
-        self.a430_model.initialize.argtypes = [c_double, c_int, InitializeInfo]
-        self.a430_model.initialize.restype = c_uint64
-
-        self.a430_model.initialize2.argtypes = [
-            c_double,
-            c_int,
-            InitializeInfo,
-            PlaneConsts,
-            AeroCoeffs,
-        ]
-        self.a430_model.initialize2.restype = c_uint64
-
-        self.a430_model.set_input.argtypes = [c_uint64, AircraftInput]
-        self.a430_model.update.argtypes = [c_uint64]
-        self.a430_model.get_plane_consts.argtypes = [c_uint64, POINTER(PlaneConsts)]
-        self.a430_model.get_aero_coeffs.argtypes = [c_uint64, POINTER(AeroCoeffs)]
-        self.a430_model.check_config.argtypes = [c_uint64]
-        self.a430_model.get_output.argtypes = [c_uint64, POINTER(AircraftOutput)]
-        self.a430_model.get_delta.argtypes = [c_uint64, POINTER(AircraftOutput)]
-        self.a430_model.terminate_plane.argtypes = [c_uint64]
-        self.a430_model.set_state.argtypes = [c_uint64, StateInfo]
-
     def init_plane_model(
         self,
         dLon: float = 120.0,
@@ -158,13 +217,16 @@ class A430Simulator(object):
     ) -> None:
         self.set_init_info(dLon=dLon, dLat=dLat, fAlt=fAlt, fTAS=fTAS, fYaw=fYaw)
         # 创建飞机实例
-        self.planePtr = self.a430_model.initialize2(
+        self.planePtr = self.backend.create(
             self.step_time,
             self.order,
             self.init_info,
             self.plane_consts,
             self.aero_coeffs,
         )
+        self._stepper = None
+        self._plane_params = bytes(self.plane_consts) + bytes(self.aero_coeffs)
+        self._capture_initial_state()
 
         # if self.custom_config == {}:
         #     # use default parameters
@@ -175,19 +237,76 @@ class A430Simulator(object):
         #     print(f"Init with initialize2!!!")
         #     self.planePtr = self.a430_model.initialize2(self.step_time, self.order, self.init_info, self.plane_consts, self.aero_coeffs)
 
-    def __del__(self) -> None:
-        # 飞机销毁
-        # print("释放simulator资源...")
+    def _get_plane_key(self) -> bytes:
+        """飞机实例由初始状态和参数唯一确定"""
+        return (
+            bytes(self.init_info) + bytes(self.plane_consts) + bytes(self.aero_coeffs)
+        )
+
+    def _capture_initial_state(self) -> None:
+        """记录新建飞机的初始状态，供reset(in_place=True)通过set_state恢复"""
+        self._plane_key = self._get_plane_key()
+        self.backend.read_output(self.planePtr, self._aircraft_output_ptr)
+        output = self.aircraft_output
+        self.initial_state = StateInfo(
+            vt=output.fTAS,
+            alpha=math.radians(output.fAlpha),
+            beta=math.radians(output.fBeta),
+            phi=math.radians(output.fRoll),
+            theta=math.radians(output.fPitch),
+            psi=math.radians(output.fYaw),
+            p=math.radians(output.fP),
+            q=math.radians(output.fQ),
+            r=math.radians(output.fR),
+            h=output.fAlt,
+        )
+
+    def enable_profiling(self, profiler: Profiler | None = None) -> Profiler:
+        """开启逐阶段计时：后端接口计入"backend.*"，profiled_methods计入"sim.*"
+
+        计时通过实例属性覆盖方法、代理后端实现，disable_profiling之后没有任何额外开销。
 
-        if hasattr(self, "a430_model") and hasattr(self, "planePtr"):
-            # print("释放c++指针：planePtr")
-            self.a430_model.terminate_plane(self.planePtr)
+        Args:
+            profiler (Profiler | None, optional): 使用的Profiler，为None时新建一个，多个simulator可以共用. Defaults to None.
 
-        if hasattr(self, "a430_model"):
-            # print("释放dll：a430_model")
-            del self.a430_model
+        Returns:
+            Profiler: 使用的Profiler.
+        """
+        self.disable_profiling()
+        self.profiler = Profiler() if profiler is None else profiler
+        self.backend = A430ProfiledBackend(self.backend, self.profiler)
+        self._stepper = None
+        self.profiler.instrument(self, self.profiled_methods, "sim")
+        return self.profiler
+
+    def disable_profiling(self) -> None:
+        if self.profiler is None:
+            return
+        Profiler.uninstrument(self, self.profiled_methods)
+        self.backend = self.backend.backend
+        self.profiler = None
+        self._stepper = None
+
+    def stats(self) -> dict:
+        """各阶段的计时统计，见Profiler.stats；未开启计时时为空dict"""
+        return {} if self.profiler is None else self.profiler.stats()
+
+    def close(self) -> None:
+        """销毁飞机实例，可重复调用；之后调用reset会重新创建飞机。动态库由进程内所有simulator共用，不随之释放"""
+        if hasattr(self, "backend") and hasattr(self, "planePtr"):
+            self.backend.terminate(self.planePtr)
+            del self.planePtr
+            self._stepper = None
+
+    def __enter__(self) -> "A430Simulator":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
 
-        gc.collect()
+    def __del__(self) -> None:
+        # 飞机销毁
+        self.close()
 
     def set_init_info(
         self,
@@ -219,12 +338,9 @@ class A430Simulator(object):
         fThrottle: float = 0.0,
         fRudder: float = 0.0,
     ) -> None:
-        self.aircraft_input.fStickLat = fStickLat
-        self.aircraft_input.fStickLon = fStickLon
-        self.aircraft_input.fThrottle = fThrottle
-        self.aircraft_input.fRudder = fRudder
+        self.aircraft_input_array[()] = (fStickLat, fStickLon, fThrottle, fRudder)
 
-        self.a430_model.set_input(self.planePtr, self.aircraft_input)
+        self.backend.set_input(self.planePtr, self.aircraft_input)
 
     def set_aircraft_state(
         self,
@@ -254,23 +370,35 @@ class A430Simulator(object):
         #     f"In set_state (python): vt = {vt}, alpha: {alpha}, beta = {beta}, phi = {phi}, theta = {theta}, psi = {psi}, p = {p}, q = {q}, r = {r}, h = {h}"
         # )
 
-        self.a430_model.set_state(self.planePtr, self.aircraft_state)
+        self.backend.set_state(self.planePtr, self.aircraft_state)
 
     def get_aircraft_output(self) -> dict:
-        self.a430_model.get_output(self.planePtr, byref(self.aircraft_output))
-        return {ky: getattr(self.aircraft_output, ky) for ky in self.output_fields}
+        self.backend.read_output(self.planePtr, self._aircraft_output_ptr)
+        return self._output_to_dict()
+
+    def _output_to_dict(self) -> dict:
+        aircraft_output = self.aircraft_output
+        return {ky: getattr(aircraft_output, ky) for ky in self.output_fields}
+
+    def get_aircraft_output_view(self) -> np.ndarray:
+        """读取飞机输出到预分配的缓冲区，返回其结构化数组视图（不分配内存，下一次读取时会被覆盖）"""
+        self.backend.read_output(self.planePtr, self._aircraft_output_ptr)
+        return self.aircraft_output_array
+
+    def _read_output(self) -> dict | np.ndarray:
+        if self.zero_copy:
+            return self.get_aircraft_output_view()
+        return self.get_aircraft_output()
 
     def get_plane_const(self) -> dict:
-        self.a430_model.get_plane_consts(
-            self.planePtr, byref(self.plane_consts_for_read)
-        )
+        self.backend.read_plane_consts(self.planePtr, byref(self.plane_consts_for_read))
         return {
             ky: getattr(self.plane_consts_for_read, ky)
             for ky in self.plane_const_fields
         }
 
     def get_aero_coeffs(self) -> dict:
-        self.a430_model.get_aero_coeffs(self.planePtr, byref(self.aero_coeffs_for_read))
+        self.backend.read_aero_coeffs(self.planePtr, byref(self.aero_coeffs_for_read))
         return {
             ky: getattr(self.aero_coeffs_for_read, ky) for ky in self.aero_coeff_fields
         }
@@ -323,6 +451,7 @@ class A430Simulator(object):
     def set_config(self, config: dict) -> None:
         self.custom_config = config
         self._config.update(config)
+        self._reset_cache.clear()
 
         assert set(self.__class__.get_default_config().keys()) <= set(
             self._config.keys()
@@ -370,6 +499,75 @@ class A430Simulator(object):
         self.aero_coeffs.Cnr = self._config["Cnr"]
         self.aero_coeffs.Cnda = self._config["Cnda"]
 
+    def update_config(self, config: dict) -> list[str]:
+        """增量修改飞机参数：只写入取值发生变化的参数，返回这些参数名，没有变化时不做任何事
+
+        后端支持set_params（如"numpy"）时直接修改当前飞机的参数，飞机状态保持不变；
+        否则（如"ctypes"，原生库只能在initialize2时设置参数）在下一次reset时生效，此时reset(in_place=True)也会重建飞机。
+
+        Args:
+            config (dict): 要修改的参数，键为PlaneConsts、AeroCoeffs的字段名.
+        """
+        changed = []
+        for ky, value in config.items():
+            assert ky in PARAM_STRUCTS, f"unknown config key: {ky}!"
+            if getattr(getattr(self, PARAM_STRUCTS[ky]), ky) != value:
+                changed.append(ky)
+        if len(changed) == 0:
+            return changed
+
+        plane_key = self._get_plane_key()
+        for ky in changed:
+            setattr(getattr(self, PARAM_STRUCTS[ky]), ky, config[ky])
+            self._config[ky] = config[ky]
+        self._apply_params(plane_key)
+        return changed
+
+    def set_plane_params(
+        self, plane_consts: PlaneConsts, aero_coeffs: AeroCoeffs
+    ) -> bool:
+        """用预先构造好的结构体整体替换飞机参数，与当前参数逐字节相同时不做任何事，返回参数是否发生变化
+
+        生效时机同update_config，适合每个episode从预先生成的参数池中换一套参数.
+        """
+        if bytes(plane_consts) == bytes(self.plane_consts) and bytes(
+            aero_coeffs
+        ) == bytes(self.aero_coeffs):
+            return False
+
+        plane_key = self._get_plane_key()
+        memmove(byref(self.plane_consts), byref(plane_consts), sizeof(PlaneConsts))
+        memmove(byref(self.aero_coeffs), byref(aero_coeffs), sizeof(AeroCoeffs))
+        self._config.update(
+            {ky: getattr(getattr(self, st), ky) for ky, st in PARAM_STRUCTS.items()}
+        )
+        self._apply_params(plane_key)
+        return True
+
+    def _apply_params(self, plane_key: bytes) -> None:
+        """参数修改后，后端支持时写入当前飞机；飞机仍处于创建时的状态则更新其标识，reset(in_place=True)不必重建"""
+        if not hasattr(self, "planePtr") or not self.backend.can_set_params:
+            return
+        self.backend.set_params(self.planePtr, self.plane_consts, self.aero_coeffs)
+        self._plane_params = bytes(self.plane_consts) + bytes(self.aero_coeffs)
+        if self._plane_key == plane_key:
+            self._plane_key = self._get_plane_key()
+
+    def get_snapshot(self) -> bytes:
+        """返回当前飞机完整状态（积分状态含位置、控制量、输出）的快照，不含飞机参数，需要后端支持（如"numpy"）"""
+        assert self.backend.can_snapshot, "backend does not support snapshots!"
+        return self.backend.get_snapshot(self.planePtr)
+
+    def restore(self, snapshot: bytes) -> dict | np.ndarray:
+        """把get_snapshot得到的快照写入当前飞机，返回恢复后的输出
+
+        快照可以来自另一个使用同类后端的simulator，恢复后以相同的控制量仿真与快照时逐位相同；
+        飞机参数、tick_cnt不变。
+        """
+        assert self.backend.can_snapshot, "backend does not support snapshots!"
+        self.backend.restore_snapshot(self.planePtr, snapshot)
+        return self._read_output()
+
     def reset(
         self,
         dLon: float = 120.0,
@@ -377,12 +575,67 @@ class A430Simulator(object):
         fAlt: float = 10.0,
         fTAS: float = 80.0,
         fYaw: float = 90.0,
-    ) -> dict:
-        if hasattr(self, "a430_model") and hasattr(self, "planePtr"):
-            self.a430_model.terminate_plane(self.planePtr)
+        in_place: bool = False,
+    ) -> dict | np.ndarray:
+        """重置飞机
+
+        Args:
+            in_place (bool, optional): 为True且初始状态、飞机参数与当前飞机实例相同时，不销毁、新建飞机，
+                而是通过set_state恢复创建时的状态并清零控制量，代价约为一拍仿真。
+                dll不提供位置的设置接口，dLon、dLat、fnpos、fepos不会回到初始值. Defaults to False.
+        """
+        self.tick_cnt = 0
+        # 后端不支持快照时不使用缓存，缓存不能改变reset的结果
+        use_cache = self.reset_cache_size > 0 and self.backend.can_snapshot
+
+        if use_cache and hasattr(self, "planePtr"):
+            self.set_init_info(dLon=dLon, dLat=dLat, fAlt=fAlt, fTAS=fTAS, fYaw=fYaw)
+            plane_key = self._get_plane_key()
+            snapshot = self._reset_cache.get(plane_key)
+            # 快照不含参数，只能恢复到参数相同的飞机上
+            if snapshot is not None and self._plane_params == bytes(
+                self.plane_consts
+            ) + bytes(self.aero_coeffs):
+                self._reset_cache.move_to_end(plane_key)
+                self.backend.restore_snapshot(self.planePtr, snapshot)
+                self._capture_initial_state()
+                self.aircraft_input_array[()] = 0
+                return self._read_reset_output()
+
+        if in_place and hasattr(self, "planePtr"):
+            self.set_init_info(dLon=dLon, dLat=dLat, fAlt=fAlt, fTAS=fTAS, fYaw=fYaw)
+            if self._get_plane_key() == self._plane_key:
+                self.backend.set_state(self.planePtr, self.initial_state)
+                self.set_aircraft_input()
+                return self._read_reset_output()
+
+        if hasattr(self, "planePtr"):
+            self.backend.terminate(self.planePtr)
 
         self.init_plane_model(dLon=dLon, dLat=dLat, fAlt=fAlt, fTAS=fTAS, fYaw=fYaw)
-        return self.get_aircraft_output()
+        # 新建的飞机控制量为0
+        self.aircraft_input_array[()] = 0
+        if use_cache:
+            self._reset_cache[self._plane_key] = self.backend.get_snapshot(
+                self.planePtr
+            )
+            if len(self._reset_cache) > self.reset_cache_size:
+                self._reset_cache.popitem(last=False)
+        return self._read_reset_output()
+
+    def _read_reset_output(self) -> dict | np.ndarray:
+        output = self._read_output()
+        if self.recorder is not None:
+            self._record()
+        return output
+
+    def _record(self) -> None:
+        """把输出缓冲区中的输出与当前控制量写入recorder"""
+        self.recorder.record(
+            self.tick_cnt * self.step_time,
+            self.aircraft_output_array,
+            self.aircraft_input_array,
+        )
 
     def step(
         self,
@@ -390,18 +643,124 @@ class A430Simulator(object):
         fStickLon: float = 0.0,
         fThrottle: float = 0.0,
         fRudder: float = 0.0,
-    ) -> dict:
-        # 设置控制量
-        self.set_aircraft_input(
-            fStickLat=fStickLat,
-            fStickLon=fStickLon,
-            fThrottle=fThrottle,
-            fRudder=fRudder,
+    ) -> dict | np.ndarray:
+        # 设置控制量，一次写入输入缓冲区
+        self.aircraft_input_array[()] = (fStickLat, fStickLon, fThrottle, fRudder)
+        # 更新飞机状态，输出直接写入输出缓冲区
+        stepper = self._stepper
+        if stepper is None:
+            stepper = self._bind_plane()
+        stepper()
+        self.tick_cnt += 1
+        if self.recorder is not None:
+            self._record()
+        if self.zero_copy:
+            return self.aircraft_output_array
+        return self._output_to_dict()
+
+    def step_array(self, action: np.ndarray) -> np.ndarray:
+        """step的数组版本：一次写入控制量，返回输出缓冲区aircraft_output_array本身（与zero_copy无关）
+
+        Args:
+            action (np.ndarray): (4,)的控制量，列顺序与AircraftInput一致：fStickLat, fStickLon, fThrottle, fRudder.
+        """
+        self.aircraft_input_float_array[:] = action
+        stepper = self._stepper
+        if stepper is None:
+            stepper = self._bind_plane()
+        stepper()
+        self.tick_cnt += 1
+        if self.recorder is not None:
+            self._record()
+        return self.aircraft_output_array
+
+    def _bind_plane(self):
+        """把当前飞机与输入、输出缓冲区绑定为推进函数，省去每拍的参数转换"""
+        self._stepper = self.backend.bind(
+            self.planePtr, self.aircraft_input, self.aircraft_output
         )
-        # 更新飞机状态
-        self.a430_model.update(self.planePtr)
-        # 读取飞机输出状态
-        return self.get_aircraft_output()
+        return self._stepper
+
+    def update(self, update_times: int = 1) -> None:
+        """以当前控制量推进update_times拍，不读取输出（挂载了recorder时逐拍读取并记录）"""
+        if self.recorder is None:
+            self.backend.update(self.planePtr, update_times)
+            self.tick_cnt += update_times
+            return
+
+        for _ in range(update_times):
+            self.backend.update(self.planePtr)
+            self.tick_cnt += 1
+            self.backend.read_output(self.planePtr, self._aircraft_output_ptr)
+            self._record()
+
+    def rollout(
+        self,
+        actions: np.ndarray,
+        record_every: int = 1,
+        out: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """按给定的动作序列连续仿真K拍，只在动作变化时设置控制量，不构造逐拍的dict
+
+        Args:
+            actions (np.ndarray): (K, 4)的控制量，列顺序为fStickLat, fStickLon, fThrottle, fRudder.
+            record_every (int, optional): 每隔多少拍记录一次输出，第record_every, 2*record_every, ...拍之后的输出被记录. Defaults to 1.
+            out (np.ndarray | None, optional): 预分配的(K // record_every, 22)的float64数组. Defaults to None.
+
+        Returns:
+            np.ndarray: (K // record_every, 22)的输出，列顺序与output_fields一致.
+        """
+        assert record_every > 0, "record_every must be positive!"
+
+        actions = np.asarray(actions, dtype=np.float32).reshape(-1, 4)
+        num_ticks = actions.shape[0]
+        num_records = num_ticks // record_every
+        if out is None:
+            out = np.empty((num_records, len(self.output_fields)), dtype=np.float64)
+        assert out.shape == (
+            num_records,
+            len(self.output_fields),
+        ), f"out must have shape {(num_records, len(self.output_fields))}!"
+
+        # 输出先按AircraftOutput的内存布局记录，结束后整体转换
+        records = np.empty(num_records, dtype=self.aircraft_output_array.dtype)
+        record_structs = (AircraftOutput * num_records).from_buffer(records)
+
+        action_changed = np.ones(num_ticks, dtype=bool)
+        action_changed[1:] = np.any(actions[1:] != actions[:-1], axis=1)
+
+        set_input = self.backend.set_input
+        update = self.backend.update
+        get_output = self.backend.read_output
+        plane_ptr = self.planePtr
+        aircraft_input = self.aircraft_input
+        input_floats = self.aircraft_input_float_array
+
+        record_id = 0
+        next_record_tick = record_every - 1
+        for tick, changed in enumerate(action_changed.tolist()):
+            if changed:
+                input_floats[:] = actions[tick]
+                set_input(plane_ptr, aircraft_input)
+            update(plane_ptr)
+            if tick == next_record_tick:
+                get_output(plane_ptr, byref(record_structs[record_id]))
+                record_id += 1
+                next_record_tick += record_every
+
+        # 同步simulator自身的输出缓冲区到最终状态
+        get_output(plane_ptr, self._aircraft_output_ptr)
+
+        if self.recorder is not None and num_records > 0:
+            record_ticks = np.arange(1, num_records + 1) * record_every
+            self.recorder.record_batch(
+                (self.tick_cnt + record_ticks) * self.step_time,
+                records,
+                actions[record_ticks - 1],
+            )
+        self.tick_cnt += num_ticks
+
+        return output_records_to_array(records, out=out)
 
     def step_from_customized_observation(
         self,
@@ -420,8 +779,18 @@ class A430Simulator(object):
         act_fThrottle: float = 0.0,
         act_fRudder: float = 0.0,
         update_times: int = 1,
+        in_place_reset: bool = False,
     ):
-        self.reset()
+        """从给定状态出发，以给定控制量仿真update_times拍
+
+        Args:
+            in_place_reset (bool, optional): 为True时用reset(in_place=True)复用飞机实例，
+                返回的fnpos、fepos减去了起始位置，与重新创建飞机时一致；dLon、dLat仍为累计值. Defaults to False.
+        """
+        self.reset(in_place=in_place_reset)
+        if in_place_reset:
+            start_npos = self.aircraft_output.fnpos
+            start_epos = self.aircraft_output.fepos
         self.set_aircraft_state(
             vt=obs_vt,
             alpha=obs_alpha,
@@ -442,4 +811,154 @@ class A430Simulator(object):
                 fRudder=act_fRudder,
             )
 
+        if in_place_reset:
+            next_obs["fnpos"] -= start_npos
+            next_obs["fepos"] -= start_epos
+
         return next_obs
+
+    def step_from_customized_observations(
+        self,
+        observations: np.ndarray,
+        actions: np.ndarray,
+        update_times: int = 1,
+        in_place_reset: bool = False,
+        out: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """step_from_customized_observation的批量版本，角度的单位转换向量化完成，不构造dict
+
+        样本在临时飞机上计算，不影响当前飞机的状态. vectorized后端上N个样本在一次批量调用中同时推进，
+        其他后端逐个样本计算.
+
+        Args:
+            observations (np.ndarray): (N, 10)的状态，列顺序为vt, alpha, beta, phi, theta, psi, p, q, r, h，角度单位为deg.
+            actions (np.ndarray): (N, 4)的控制量，列顺序为fStickLat, fStickLon, fThrottle, fRudder.
+            update_times (int, optional): 每个样本仿真的拍数. Defaults to 1.
+            in_place_reset (bool, optional): 为True时不为每个样本重新创建飞机，直接set_state，
+                fnpos、fepos减去起始位置，且每1000个样本重新创建一次飞机以限制float32累计位置的误差.
+                vectorized后端上每个样本本就是新建的飞机，忽略该参数. Defaults to False.
+            out (np.ndarray | None, optional): 预分配的(N, 22)的float64数组. Defaults to None.
+
+        Returns:
+            np.ndarray: (N, 22)的下一状态，列顺序与output_fields一致.
+        """
+        observations = np.asarray(observations, dtype=np.float64).reshape(-1, 10)
+        actions = np.asarray(actions, dtype=np.float32).reshape(-1, 4)
+        num_samples = observations.shape[0]
+        assert (
+            actions.shape[0] == num_samples
+        ), "observations and actions must have the same length!"
+        if num_samples == 0:
+            # 空批次不触碰飞机
+            records = np.empty(0, dtype=self.aircraft_output_array.dtype)
+            return output_records_to_array(records, out=out)
+
+        # StateInfo全部为float64，(N, 10)的矩阵即为N个连续的StateInfo
+        state_matrix = np.array(observations, dtype=np.float64, order="C")
+        np.deg2rad(state_matrix[:, 1:9], out=state_matrix[:, 1:9])
+        action_matrix = np.ascontiguousarray(actions)
+        records = np.empty(num_samples, dtype=self.aircraft_output_array.dtype)
+
+        # 与step_from_customized_observation中reset()的默认初始状态一致；
+        # 样本在临时飞机上计算，调用方的飞机、初始状态不受影响
+        caller_init_info = bytes(self.init_info)
+        self.set_init_info()
+        if self.backend.vectorized:
+            self._step_samples_batch(state_matrix, action_matrix, update_times, records)
+            start_positions = None
+        else:
+            start_positions = self._step_samples(
+                state_matrix, action_matrix, update_times, in_place_reset, records
+            )
+        memmove(byref(self.init_info), caller_init_info, sizeof(InitializeInfo))
+
+        out = output_records_to_array(records, out=out)
+        if start_positions is not None:
+            out[:, self.output_fields.index("fnpos")] -= start_positions[:, 0]
+            out[:, self.output_fields.index("fepos")] -= start_positions[:, 1]
+        return out
+
+    def _step_samples_batch(
+        self,
+        state_matrix: np.ndarray,
+        action_matrix: np.ndarray,
+        update_times: int,
+        records: np.ndarray,
+    ) -> None:
+        """vectorized后端：为N个样本一次创建N架临时飞机，在(N, state)的数组上同时推进，结束后销毁
+
+        每个样本都从新建的飞机出发，结果与逐个样本重新创建飞机时相同，in_place_reset无需处理起始位置。
+        """
+        num_samples = len(state_matrix)
+        init_infos = np.repeat(
+            np.frombuffer(self.init_info, dtype=np.dtype(InitializeInfo)), num_samples
+        )
+        planes = self.backend.create_batch(
+            self.step_time, self.order, init_infos, self.plane_consts, self.aero_coeffs
+        )
+        try:
+            self.backend.set_state_batch(
+                planes, state_matrix.view(np.dtype(StateInfo)).reshape(-1)
+            )
+            self.backend.step_batch(
+                planes,
+                action_matrix.view(np.dtype(AircraftInput)).reshape(-1),
+                records,
+                update_times,
+            )
+        finally:
+            self.backend.terminate_batch(planes)
+
+    def _step_samples(
+        self,
+        state_matrix: np.ndarray,
+        action_matrix: np.ndarray,
+        update_times: int,
+        in_place_reset: bool,
+        records: np.ndarray,
+    ) -> np.ndarray | None:
+        """逐个样本在一架临时飞机上计算，in_place_reset为True时返回(N, 2)的起始位置"""
+        num_samples = len(state_matrix)
+        states = (StateInfo * num_samples).from_buffer(state_matrix)
+        inputs = (AircraftInput * num_samples).from_buffer(action_matrix)
+        record_structs = (AircraftOutput * num_samples).from_buffer(records)
+        start_positions = np.zeros((num_samples, 2), dtype=np.float64)
+
+        reset_plane = self.backend.reset
+        set_state = self.backend.set_state
+        set_input = self.backend.set_input
+        update = self.backend.update
+        get_output = self.backend.read_output
+        start_output = AircraftOutput()
+        start_output_ptr = byref(start_output)
+
+        plane_ptr = self.backend.create(
+            self.step_time,
+            self.order,
+            self.init_info,
+            self.plane_consts,
+            self.aero_coeffs,
+        )
+        try:
+            for i in range(num_samples):
+                if i > 0 and (not in_place_reset or i % 1000 == 0):
+                    plane_ptr = reset_plane(
+                        plane_ptr,
+                        self.step_time,
+                        self.order,
+                        self.init_info,
+                        self.plane_consts,
+                        self.aero_coeffs,
+                    )
+
+                set_state(plane_ptr, states[i])
+                if in_place_reset:
+                    get_output(plane_ptr, start_output_ptr)
+                    start_positions[i] = (start_output.fnpos, start_output.fepos)
+                set_input(plane_ptr, inputs[i])
+                update(plane_ptr, update_times)
+                get_output(plane_ptr, byref(record_structs[i]))
+        finally:
+            self.backend.terminate(plane_ptr)
+
+        return start_positions if in_place_reset else None
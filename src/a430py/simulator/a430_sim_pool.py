@@ -0,0 +1,85 @@
+import queue
+from contextlib import contextmanager
+from typing import Iterator
+
+from a430py.simulator.a430_backend import A430Backend
+from a430py.simulator.a430_sim import A430Simulator
+
+
+class A430SimulatorPool(object):
+    """预先创建size个A430Simulator及其飞机实例，归还时重置到初始状态，不必每次销毁、新建飞机
+
+    线程安全，可供多个线程并行使用（ctypes调用dll期间会释放GIL）：每个simulator各自创建后端实例，
+    不允许多个simulator共用同一个后端实例（如numpy后端的模型数组不支持并发推进）。
+    """
+
+    def __init__(
+        self,
+        size: int,
+        config: dict,
+        zero_copy: bool = False,
+        dLon: float = 120.0,
+        dLat: float = 30.0,
+        fAlt: float = 10.0,
+        fTAS: float = 80.0,
+        fYaw: float = 90.0,
+        backend: str | A430Backend = "ctypes",
+        in_place_reset: bool = False,
+    ) -> None:
+        """创建simulator池
+
+        Args:
+            size (int): 飞机实例数量.
+            config (dict): 所有飞机共用的参数.
+            zero_copy (bool, optional): 见A430Simulator. Defaults to False.
+            backend (str | A430Backend, optional): 动力学后端的名字，每个simulator各自创建一个后端实例；
+                只有size为1时才可以传入后端实例. Defaults to "ctypes".
+            in_place_reset (bool, optional): 后端不支持快照（如"ctypes"）时归还的重置方式，默认重新创建飞机，完全回到初始状态；
+                显式设为True时用reset(in_place=True)，不新建飞机，但dLon、dLat、fnpos、fepos不会回到初始值，是不精确的重置。
+                支持快照的后端（如"numpy"）总是恢复飞机刚创建时的快照，完全回到初始状态且不新建飞机. Defaults to False.
+            其余参数为飞机的初始状态，与A430Simulator.reset的默认值一致.
+        """
+        assert size > 0, "size must be positive!"
+        assert (
+            isinstance(backend, str) or size == 1
+        ), "simulators in a pool must not share a backend instance, pass a backend name!"
+
+        self.size = size
+        self.init_kwargs = dict(dLon=dLon, dLat=dLat, fAlt=fAlt, fTAS=fTAS, fYaw=fYaw)
+        self.in_place_reset = in_place_reset
+        self.simulators: list[A430Simulator] = []
+        self._idle_simulators: queue.Queue = queue.Queue()
+
+        for _ in range(size):
+            # 只缓存初始状态一个快照，支持快照的后端归还时据此恢复
+            sim = A430Simulator(
+                config=config,
+                zero_copy=zero_copy,
+                backend=backend,
+                reset_cache_size=1,
+            )
+            sim.reset(**self.init_kwargs)
+            self.simulators.append(sim)
+            self._idle_simulators.put(sim)
+
+    def acquire(self, timeout: float | None = None) -> A430Simulator:
+        """借出一个已重置的simulator（重置到哪些状态见in_place_reset），池为空时阻塞至有simulator归还或超时（抛出queue.Empty）"""
+        return self._idle_simulators.get(timeout=timeout)
+
+    def release(self, sim: A430Simulator) -> None:
+        """归还simulator并重置，见in_place_reset"""
+        sim.reset(in_place=self.in_place_reset, **self.init_kwargs)
+        self._idle_simulators.put(sim)
+
+    @contextmanager
+    def simulator(self, timeout: float | None = None) -> Iterator[A430Simulator]:
+        sim = self.acquire(timeout=timeout)
+        try:
+            yield sim
+        finally:
+            self.release(sim)
+
+    def close(self) -> None:
+        """销毁池中所有飞机实例"""
+        for sim in self.simulators:
+            sim.close()
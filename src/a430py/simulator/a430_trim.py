@@ -0,0 +1,332 @@
+import hashlib
+from pathlib import Path
+
+import numpy as np
+
+from a430py.simulator.a430_backend import A430ProfiledBackend
+from a430py.simulator.a430_sim import A430Simulator
+from a430py.simulator.utils.a430_types import AeroCoeffs, PlaneConsts
+
+G = 9.81  # 重力加速度，m/s^2
+# 配平量：升降舵指令、油门指令、迎角（deg），水平直线飞行时俯仰角等于迎角
+TRIM_FIELDS = ["fStickLon", "fThrottle", "alpha"]
+# 默认的初值，TAS为8、高度为2附近的配平点
+DEFAULT_TRIM_GUESS = (-2.0, 0.7, 5.0)
+
+
+def config_hash(
+    plane_consts: PlaneConsts, aero_coeffs: AeroCoeffs, settings: tuple = ()
+) -> str:
+    """飞机参数及影响配平结果的其他设置（如后端、积分设置）的哈希，用作配平表的键"""
+    digest = hashlib.sha1(bytes(plane_consts) + bytes(aero_coeffs))
+    digest.update(repr(settings).encode())
+    return digest.hexdigest()[:16]
+
+
+def grid_hash(tas_grid: np.ndarray, alt_grid: np.ndarray) -> str:
+    """(TAS, 高度)网格的哈希"""
+    digest = hashlib.sha1(np.asarray(tas_grid, dtype=np.float64).tobytes())
+    digest.update(b"/")
+    digest.update(np.asarray(alt_grid, dtype=np.float64).tobytes())
+    return digest.hexdigest()[:8]
+
+
+def _grid_weights(
+    grid: np.ndarray, values: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """values在升序网格grid上线性插值的左、右下标及右侧权重"""
+    assert np.all(values >= grid[0]) and np.all(
+        values <= grid[-1]
+    ), f"values must be within [{grid[0]}, {grid[-1]}]!"
+    if len(grid) == 1:
+        zeros = np.zeros(values.shape, dtype=np.intp)
+        return zeros, zeros, np.zeros(values.shape)
+    lo = np.clip(np.searchsorted(grid, values, side="right") - 1, 0, len(grid) - 2)
+    weights = (values - grid[lo]) / (grid[lo + 1] - grid[lo])
+    return lo, lo + 1, weights
+
+
+class TrimTable(object):
+    """(TAS, 高度)规则网格上的配平表，lookup用双线性插值得到任意点的(fStickLon, fThrottle, alpha)"""
+
+    def __init__(
+        self,
+        tas_grid: np.ndarray,
+        alt_grid: np.ndarray,
+        trims: np.ndarray,
+        config_hash: str = "",
+    ) -> None:
+        """创建配平表
+
+        Args:
+            tas_grid (np.ndarray): (T,)的升序TAS网格.
+            alt_grid (np.ndarray): (A,)的升序高度网格.
+            trims (np.ndarray): (T, A, 3)的配平量，最后一维与TRIM_FIELDS对应.
+            config_hash (str, optional): 飞机参数、后端及求解设置的哈希，见TrimSolver.get_config_hash. Defaults to "".
+        """
+        self.tas_grid = np.asarray(tas_grid, dtype=np.float64)
+        self.alt_grid = np.asarray(alt_grid, dtype=np.float64)
+        self.trims = np.asarray(trims, dtype=np.float64)
+        self.config_hash = config_hash
+        assert self.trims.shape == (
+            len(self.tas_grid),
+            len(self.alt_grid),
+            len(TRIM_FIELDS),
+        ), "trims must have shape (len(tas_grid), len(alt_grid), 3)!"
+        assert np.all(np.diff(self.tas_grid) > 0) and np.all(
+            np.diff(self.alt_grid) > 0
+        ), "grids must be strictly increasing!"
+
+    def lookup(self, tas: float | np.ndarray, alt: float | np.ndarray) -> np.ndarray:
+        """双线性插值，tas、alt可以是标量或可广播的数组，返回(..., 3)的配平量，超出网格范围时报错"""
+        tas, alt = np.broadcast_arrays(
+            np.asarray(tas, dtype=np.float64), np.asarray(alt, dtype=np.float64)
+        )
+        i0, i1, wi = _grid_weights(self.tas_grid, tas)
+        j0, j1, wj = _grid_weights(self.alt_grid, alt)
+        wi, wj = wi[..., None], wj[..., None]
+        return (1 - wi) * (
+            (1 - wj) * self.trims[i0, j0] + wj * self.trims[i0, j1]
+        ) + wi * ((1 - wj) * self.trims[i1, j0] + wj * self.trims[i1, j1])
+
+    def save(self, path: str | Path) -> None:
+        np.savez(
+            path,
+            tas_grid=self.tas_grid,
+            alt_grid=self.alt_grid,
+            trims=self.trims,
+            config_hash=np.array(self.config_hash),
+        )
+
+    @staticmethod
+    def load(path: str | Path) -> "TrimTable":
+        with np.load(path) as data:
+            return TrimTable(
+                data["tas_grid"],
+                data["alt_grid"],
+                data["trims"],
+                config_hash=str(data["config_hash"]),
+            )
+
+
+class TrimSolver(object):
+    """水平直线飞行的配平求解器
+
+    对给定的TAS、高度，求(fStickLon, fThrottle, alpha)使飞机处于平衡状态：用set_state把飞机置于
+    vt=TAS、alpha=theta=alpha、h=高度、其余为0的状态，以配平量为控制量仿真update_times拍，残差为
+    (fAccBx - G * sin(fPitch), fAccBz + G * cos(fPitch), fQ)，即机体系x、z方向的加速度与俯仰角速度。
+    用牛顿法迭代，雅可比矩阵由有限差分得到：每次迭代把所有目标点的基准点和3个扰动点拼成一批，
+    通过step_from_customized_observations计算。vectorized后端(如numpy)上整批在一次批量调用中完成；
+    ctypes后端上仍是逐行循环(每行约10us)，只是复用同一架飞机、省去逐点创建飞机和构造dict的开销。
+    """
+
+    def __init__(
+        self,
+        config: dict = {},
+        backend: str = "ctypes",
+        update_times: int = 2,
+        max_iterations: int = 20,
+        tolerance: float = 1e-4,
+        perturbation: tuple[float, float, float] = (1e-3, 1e-4, 1e-3),
+    ) -> None:
+        """创建求解器及其专用的simulator
+
+        Args:
+            config (dict, optional): 飞机参数. Defaults to {}.
+            backend (str, optional): 动力学后端的名字，见A430Simulator. Defaults to "ctypes".
+            update_times (int, optional): 计算残差时仿真的拍数，输出滞后状态一拍，至少为2才能反映俯仰角加速度. Defaults to 2.
+            max_iterations (int, optional): 牛顿法的最大迭代次数. Defaults to 20.
+            tolerance (float, optional): 残差各分量绝对值的上限，小于该值视为收敛. Defaults to 1e-4.
+            perturbation (tuple[float, float, float], optional): fStickLon、fThrottle、alpha的有限差分步长. Defaults to (1e-3, 1e-4, 1e-3).
+        """
+        assert update_times >= 2, "update_times must be at least 2!"
+
+        self.simulator = A430Simulator(config=config, backend=backend)
+        self.update_times = update_times
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+        self.perturbation = np.asarray(perturbation, dtype=np.float64)
+        # (TAS网格, 高度网格, 参数哈希) -> TrimTable
+        self._tables: dict[tuple[bytes, bytes, str], TrimTable] = {}
+
+        self._residual_index = np.array(
+            [
+                self.simulator.output_fields.index(ky)
+                for ky in ["fAccBx", "fAccBz", "fQ", "fPitch"]
+            ]
+        )
+
+    def get_config_hash(self) -> str:
+        """飞机参数、后端类型、积分设置与求解设置的哈希，不同后端、设置求得的配平表互不混用"""
+        backend = self.simulator.backend
+        while isinstance(backend, A430ProfiledBackend):
+            backend = backend.backend
+        settings = (
+            f"{type(backend).__module__}.{type(backend).__qualname__}",
+            self.simulator.step_time,
+            self.simulator.order,
+            self.update_times,
+            self.max_iterations,
+            self.tolerance,
+            self.perturbation.tolist(),
+        )
+        return config_hash(
+            self.simulator.plane_consts, self.simulator.aero_coeffs, settings
+        )
+
+    def get_table_path(
+        self, tas_grid: np.ndarray, alt_grid: np.ndarray, cache_dir: str | Path
+    ) -> Path:
+        """配平表的缓存文件路径：cache_dir/trim_{get_config_hash}_{grid_hash}.npz"""
+        return (
+            Path(cache_dir)
+            / f"trim_{self.get_config_hash()}_{grid_hash(tas_grid, alt_grid)}.npz"
+        )
+
+    def residuals(
+        self, trims: np.ndarray, tas: np.ndarray, alt: np.ndarray
+    ) -> np.ndarray:
+        """计算M组配平量的残差
+
+        Args:
+            trims (np.ndarray): (M, 3)的配平量，列顺序与TRIM_FIELDS一致.
+            tas (np.ndarray): (M,)的TAS.
+            alt (np.ndarray): (M,)的高度.
+
+        Returns:
+            np.ndarray: (M, 3)的残差.
+        """
+        trims = np.asarray(trims, dtype=np.float64).reshape(-1, len(TRIM_FIELDS))
+        num_samples = len(trims)
+        # 列顺序：vt, alpha, beta, phi, theta, psi, p, q, r, h
+        observations = np.zeros((num_samples, 10), dtype=np.float64)
+        observations[:, 0] = tas
+        observations[:, 1] = trims[:, 2]
+        observations[:, 4] = trims[:, 2]
+        observations[:, 9] = alt
+        # 列顺序：fStickLat, fStickLon, fThrottle, fRudder
+        actions = np.zeros((num_samples, 4), dtype=np.float32)
+        actions[:, 1:3] = trims[:, :2]
+
+        outputs = self.simulator.step_from_customized_observations(
+            observations,
+            actions,
+            update_times=self.update_times,
+            in_place_reset=True,
+        )
+        acc_x, acc_z, q, pitch = np.take(outputs, self._residual_index, axis=1).T
+        pitch = np.deg2rad(pitch)
+        return np.stack(
+            [acc_x - G * np.sin(pitch), acc_z + G * np.cos(pitch), q], axis=1
+        )
+
+    def solve(
+        self,
+        tas: float | np.ndarray,
+        alt: float | np.ndarray,
+        initial_guess: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """对M个(TAS, 高度)同时求解配平量
+
+        Args:
+            tas (float | np.ndarray): TAS，标量或(M,)的数组.
+            alt (float | np.ndarray): 高度，标量或(M,)的数组.
+            initial_guess (np.ndarray | None, optional): (3,)或(M, 3)的初值，为None时使用DEFAULT_TRIM_GUESS. Defaults to None.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: (M, 3)的配平量，列顺序与TRIM_FIELDS一致；(M,)的bool数组，表示是否收敛.
+        """
+        tas, alt = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(tas, dtype=np.float64)),
+            np.atleast_1d(np.asarray(alt, dtype=np.float64)),
+        )
+        num_points = len(tas)
+        if initial_guess is None:
+            initial_guess = DEFAULT_TRIM_GUESS
+        trims = np.array(
+            np.broadcast_to(initial_guess, (num_points, len(TRIM_FIELDS))),
+            dtype=np.float64,
+        )
+        converged = np.zeros(num_points, dtype=np.bool_)
+
+        # 每个目标点的基准点与3个扰动点
+        offsets = np.vstack([np.zeros(len(TRIM_FIELDS)), np.diag(self.perturbation)])
+        num_rows = len(offsets)
+        for i in range(self.max_iterations + 1):
+            active = np.flatnonzero(~converged)
+            if len(active) == 0:
+                break
+            points = trims[active, None, :] + offsets
+            residuals = self.residuals(
+                points.reshape(-1, len(TRIM_FIELDS)),
+                np.repeat(tas[active], num_rows),
+                np.repeat(alt[active], num_rows),
+            ).reshape(len(active), num_rows, -1)
+
+            base = residuals[:, 0]
+            done = np.max(np.abs(base), axis=1) < self.tolerance
+            converged[active[done]] = True
+            if i == self.max_iterations:
+                break
+
+            # jacobians[k, 残差, 配平量]，用伪逆求最小二乘意义下的牛顿步
+            jacobians = (residuals[:, 1:] - base[:, None]).transpose(0, 2, 1)
+            jacobians /= self.perturbation
+            steps = -np.linalg.pinv(jacobians) @ base[:, :, None]
+            update = active[~done]
+            trims[update] += steps[~done, :, 0]
+        return trims, converged
+
+    def trim_table(
+        self,
+        tas_grid: np.ndarray,
+        alt_grid: np.ndarray,
+        cache_dir: str | Path | None = None,
+    ) -> TrimTable:
+        """返回网格上的配平表，按(get_config_hash, 网格)记忆化
+
+        先查内存，再查cache_dir下的get_table_path文件，都没有时在整个网格上求解一次并写入cache_dir。
+
+        Args:
+            tas_grid (np.ndarray): (T,)的升序TAS网格.
+            alt_grid (np.ndarray): (A,)的升序高度网格.
+            cache_dir (str | Path | None, optional): 配平表的磁盘缓存目录，为None时只缓存在内存中. Defaults to None.
+        """
+        tas_grid = np.asarray(tas_grid, dtype=np.float64)
+        alt_grid = np.asarray(alt_grid, dtype=np.float64)
+        param_hash = self.get_config_hash()
+        key = (tas_grid.tobytes(), alt_grid.tobytes(), param_hash)
+        table = self._tables.get(key)
+        if table is not None:
+            return table
+
+        path = (
+            None
+            if cache_dir is None
+            else self.get_table_path(tas_grid, alt_grid, cache_dir)
+        )
+        if path is not None and path.exists():
+            table = TrimTable.load(path)
+            if not (
+                table.config_hash == param_hash
+                and np.array_equal(table.tas_grid, tas_grid)
+                and np.array_equal(table.alt_grid, alt_grid)
+            ):
+                table = None
+
+        if table is None:
+            tas, alt = np.meshgrid(tas_grid, alt_grid, indexing="ij")
+            trims, converged = self.solve(tas.reshape(-1), alt.reshape(-1))
+            assert np.all(converged), "trim solver did not converge!"
+            table = TrimTable(
+                tas_grid,
+                alt_grid,
+                trims.reshape(len(tas_grid), len(alt_grid), -1),
+                config_hash=param_hash,
+            )
+            if path is not None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                table.save(path)
+
+        self._tables[key] = table
+        return table
@@ -0,0 +1,224 @@
+import os
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from a430py.simulator.utils.a430_types import (
+    AircraftInput,
+    AircraftOutput,
+    TrajectoryRecord,
+)
+
+# 文件头：魔数、版本、单条记录字节数、单拍时间，补齐到HEADER_SIZE字节，之后是紧凑排列的TrajectoryRecord
+MAGIC = b"A430TRAJ"
+VERSION = 1
+HEADER_FORMAT = "<8sIId"
+HEADER_SIZE = 64
+
+TRAJECTORY_DTYPE = np.dtype(TrajectoryRecord)
+OUTPUT_OFFSET = TrajectoryRecord.dLon.offset
+INPUT_OFFSET = TrajectoryRecord.fStickLat.offset
+
+
+def _pack_header(step_time: float) -> bytes:
+    header = struct.pack(
+        HEADER_FORMAT, MAGIC, VERSION, TRAJECTORY_DTYPE.itemsize, step_time
+    )
+    return header.ljust(HEADER_SIZE, b"\0")
+
+
+def read_trajectory_header(path: str | Path) -> dict:
+    """读取并校验轨迹文件头
+
+    Returns:
+        dict: version, record_size, step_time.
+    """
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+    assert len(header) == HEADER_SIZE, f"{path} is not a trajectory file!"
+
+    magic, version, record_size, step_time = struct.unpack_from(HEADER_FORMAT, header)
+    assert magic == MAGIC, f"{path} is not a trajectory file!"
+    assert version == VERSION, f"unsupported trajectory file version: {version}!"
+    assert (
+        record_size == TRAJECTORY_DTYPE.itemsize
+    ), f"record size mismatch: {record_size} != {TRAJECTORY_DTYPE.itemsize}!"
+    return dict(version=version, record_size=record_size, step_time=step_time)
+
+
+class TrajectoryRecorder(object):
+    """把逐拍的(time, AircraftOutput, AircraftInput)以TrajectoryRecord的二进制布局流式写入文件
+
+    记录先写入大小为chunk_size的预分配缓冲区，写满后整块写入文件；用load_trajectory以np.memmap读取。
+    可以通过A430Simulator/A430Gym的recorder参数挂载，也可以直接调用record/record_batch。
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        step_time: float = 0.01,
+        chunk_size: int = 4096,
+        append: bool = False,
+    ) -> None:
+        """创建记录器
+
+        Args:
+            path (str | Path): 轨迹文件路径.
+            step_time (float, optional): 单拍时间，写入文件头. Defaults to 0.01.
+            chunk_size (int, optional): 缓冲区的记录条数. Defaults to 4096.
+            append (bool, optional): 为True且文件已存在时追加到文件末尾（先截掉不完整的尾部记录），否则覆盖. Defaults to False.
+        """
+        assert chunk_size > 0, "chunk_size must be positive!"
+
+        self.path = Path(path)
+        self.step_time = step_time
+        self.chunk_size = chunk_size
+        self.num_records = 0
+
+        if append and self.path.exists() and self.path.stat().st_size > 0:
+            read_trajectory_header(self.path)
+            self._file = open(self.path, "r+b")
+            num_bytes = self.path.stat().st_size - HEADER_SIZE
+            self.num_records = num_bytes // TRAJECTORY_DTYPE.itemsize
+            self._file.truncate(
+                HEADER_SIZE + self.num_records * TRAJECTORY_DTYPE.itemsize
+            )
+            self._file.seek(0, os.SEEK_END)
+        else:
+            self._file = open(self.path, "wb")
+            self._file.write(_pack_header(step_time))
+
+        self._chunk = np.zeros(chunk_size, dtype=TRAJECTORY_DTYPE)
+        self._chunk_bytes = self._chunk.view(np.uint8).reshape(chunk_size, -1)
+        self._chunk_time = self._chunk["time"]
+        self._size = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def record(
+        self,
+        time: float,
+        aircraft_output: AircraftOutput | np.ndarray,
+        aircraft_input: AircraftInput | np.ndarray,
+    ) -> None:
+        """记录一拍
+
+        Args:
+            time (float): 仿真时间，秒.
+            aircraft_output (AircraftOutput | np.ndarray): AircraftOutput结构体或对应的numpy结构化标量.
+            aircraft_input (AircraftInput | np.ndarray): AircraftInput结构体或对应的numpy结构化标量.
+        """
+        row = self._chunk_bytes[self._size]
+        self._chunk_time[self._size] = time
+        row[OUTPUT_OFFSET:INPUT_OFFSET] = np.frombuffer(aircraft_output, dtype=np.uint8)
+        row[INPUT_OFFSET:] = np.frombuffer(aircraft_input, dtype=np.uint8)
+
+        self._size += 1
+        if self._size == self.chunk_size:
+            self._write_chunk()
+
+    def record_batch(
+        self, times: np.ndarray, outputs: np.ndarray, inputs: np.ndarray
+    ) -> None:
+        """一次记录N拍
+
+        Args:
+            times (np.ndarray): (N,)的仿真时间.
+            outputs (np.ndarray): (N,)的AircraftOutput结构化数组.
+            inputs (np.ndarray): (N,)的AircraftInput结构化数组，或(N, 4)的控制量，列顺序为fStickLat, fStickLon, fThrottle, fRudder.
+        """
+        times = np.asarray(times, dtype=np.float64).reshape(-1)
+        num_records = len(times)
+        output_bytes = (
+            np.ascontiguousarray(outputs).view(np.uint8).reshape(num_records, -1)
+        )
+        inputs = np.asarray(inputs)
+        if inputs.dtype.names is None:
+            inputs = inputs.astype(np.float32, copy=False)
+        input_bytes = (
+            np.ascontiguousarray(inputs).view(np.uint8).reshape(num_records, -1)
+        )
+
+        start = 0
+        while start < num_records:
+            n = min(self.chunk_size - self._size, num_records - start)
+            rows = self._chunk_bytes[self._size : self._size + n]
+            self._chunk_time[self._size : self._size + n] = times[start : start + n]
+            rows[:, OUTPUT_OFFSET:INPUT_OFFSET] = output_bytes[start : start + n]
+            rows[:, INPUT_OFFSET:] = input_bytes[start : start + n]
+
+            self._size += n
+            start += n
+            if self._size == self.chunk_size:
+                self._write_chunk()
+
+    def write_records(self, records: np.ndarray) -> None:
+        """追加(N,)的TrajectoryRecord结构化数组，先写出缓冲区中的记录以保持顺序"""
+        if self._size > 0:
+            self._write_chunk()
+        self._file.write(memoryview(np.ascontiguousarray(records).view(np.uint8)))
+        self.num_records += len(records)
+
+    def _write_chunk(self) -> None:
+        self._file.write(memoryview(self._chunk_bytes[: self._size]))
+        self.num_records += self._size
+        self._size = 0
+
+    def flush(self) -> None:
+        """把缓冲区中的记录写入文件"""
+        if self._size > 0:
+            self._write_chunk()
+        self._file.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __len__(self) -> int:
+        return self.num_records + self._size
+
+    def __enter__(self) -> "TrajectoryRecorder":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        if hasattr(self, "_file"):
+            self.close()
+
+
+def load_trajectory(path: str | Path, mode: str = "r") -> np.ndarray:
+    """以np.memmap读取轨迹文件，不把数据读入内存
+
+    Args:
+        path (str | Path): 轨迹文件路径.
+        mode (str, optional): np.memmap的打开模式. Defaults to "r".
+
+    Returns:
+        np.ndarray: (N,)的TrajectoryRecord结构化数组（np.memmap），可以按字段名索引，如records["fTAS"].
+    """
+    read_trajectory_header(path)
+    num_records = (os.path.getsize(path) - HEADER_SIZE) // TRAJECTORY_DTYPE.itemsize
+    if num_records == 0:
+        return np.zeros(0, dtype=TRAJECTORY_DTYPE)
+    return np.memmap(
+        path,
+        dtype=TRAJECTORY_DTYPE,
+        mode=mode,
+        offset=HEADER_SIZE,
+        shape=(num_records,),
+    )
+
+
+def split_episodes(records: np.ndarray) -> list[np.ndarray]:
+    """按time回到0的位置把轨迹切分为各个episode，返回的是records的切片视图"""
+    starts = np.flatnonzero(records["time"] == 0.0)
+    if len(starts) == 0 or starts[0] != 0:
+        starts = np.concatenate([[0], starts])
+    ends = np.append(starts[1:], len(records))
+    return [records[start:end] for start, end in zip(starts, ends)]
@@ -110,3 +110,9 @@ class AircraftInput(Structure):
         ("fThrottle", c_float),  # 油门杆位移
         ("fRudder", c_float),  # 脚蹬位移
     ]
+
+
+# 轨迹记录结构体：时间、飞机输出、控制输入，紧凑排列（无填充）
+class TrajectoryRecord(Structure):
+    _pack_ = 1
+    _fields_ = [("time", c_double)] + AircraftOutput._fields_ + AircraftInput._fields_
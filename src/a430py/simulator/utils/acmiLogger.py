@@ -1,10 +1,30 @@
 class AcmiLogger:
-    def __init__(self, fname):
+    def __init__(self, fname, pilot="A618_{}", name="F-18"):
+        """逐架飞机写入Tacview ACMI文件，大量飞机请使用acmi_writer.AcmiBatchWriter
+
+        Args:
+            fname (str): 输出文件路径.
+            pilot (str, optional): 飞行员名称，"{}"会被替换为planeID. Defaults to "A618_{}".
+            name (str, optional): 机型名称. Defaults to "F-18".
+        """
+        self.pilot = pilot
+        self.name = name
         self.log = open(fname, "w")
         self.log.write("FileType=text/acmi/tacview\nFileVersion=2.1\n")
 
+    def close(self):
+        if not self.log.closed:
+            self.log.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def __del__(self):
-        self.log.close()
+        if hasattr(self, "log"):
+            self.close()
 
     def writeTime(self, time):
         self.log.write("#{:.2f}\n".format(time))
@@ -17,8 +37,8 @@ class AcmiLogger:
         )
         if detailFlag:
             self.log.write(
-                "Type=Air+FixedWing,Pilot=A618_{},Coalition=Allies,Color=Red,Country=ru,Name=F-18".format(
-                    planeID
+                ",Type=Air+FixedWing,Pilot={},Coalition=Allies,Color=Red,Country=ru,Name={}".format(
+                    self.pilot.format(planeID), self.name
                 )
             )
         self.log.write("\n")
@@ -0,0 +1,217 @@
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+ACMI_HEADER = "FileType=text/acmi/tacview\nFileVersion=2.1\n"
+
+# T=Lon|Lat|Alt|Roll|Pitch|Yaw各列保留的小数位数
+DEFAULT_DECIMALS = (7, 7, 3, 3, 3, 3)
+
+
+class AcmiBatchWriter(object):
+    """按帧写入N架飞机的Tacview ACMI 2.1文件
+
+    每帧输入(N, 6)的位置、姿态数组（列顺序为经度、纬度、高度、滚转、俯仰、偏航，角度单位为deg），
+    A430BatchSimulator的输出矩阵前6列恰好是dLon, dLat, fAlt, fRoll, fPitch, fYaw，可以直接传入。
+    数值按列整体舍入后，每行用预先生成的格式模板做一次%格式化，各列以定点格式保留decimals位小数（与AcmiLogger一致），
+    文本先在内存中累积，超过buffer_size个字符后一次写入文件。
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        num_planes: int,
+        plane_ids: list[int] | None = None,
+        frame_rate: float | None = None,
+        delta_encoding: bool = True,
+        compress: bool | None = None,
+        buffer_size: int = 1 << 22,
+        decimals: tuple[int, ...] = DEFAULT_DECIMALS,
+        name: str = "A430",
+        pilot: str = "A430_{}",
+        plane_type: str = "Air+FixedWing",
+        coalition: str = "Allies",
+        color: str = "Red",
+    ) -> None:
+        """创建ACMI写入器
+
+        Args:
+            path (str | Path): 输出文件路径.
+            num_planes (int): 飞机数量.
+            plane_ids (list[int] | None, optional): 各飞机在ACMI中的对象ID（以16进制写出），为None时依次为1..N. Defaults to None.
+            frame_rate (float | None, optional): 输出帧率，Hz，write_frame的调用频率更高时按时间抽帧，为None时每帧都写. Defaults to None.
+            delta_encoding (bool, optional): 为True时只写出舍入后发生变化的字段，没有变化的飞机整行省略. Defaults to True.
+            compress (bool | None, optional): 为True时写出zip压缩的.zip.acmi，为None时按文件名是否以.zip.acmi结尾判断. Defaults to None.
+            buffer_size (int, optional): 内存中累积的字符数上限. Defaults to 1<<22.
+            decimals (tuple[int, ...], optional): 6列各自保留的小数位数. Defaults to DEFAULT_DECIMALS.
+            name (str, optional): 机型名称. Defaults to "A430".
+            pilot (str, optional): 飞行员名称，"{}"会被替换为飞机下标. Defaults to "A430_{}".
+            plane_type (str, optional): ACMI中的Type属性. Defaults to "Air+FixedWing".
+            coalition (str, optional): ACMI中的Coalition属性. Defaults to "Allies".
+            color (str, optional): ACMI中的Color属性. Defaults to "Red".
+        """
+        assert num_planes > 0, "num_planes must be positive!"
+        assert len(decimals) == 6, "decimals must have 6 elements!"
+        if plane_ids is None:
+            plane_ids = list(range(1, num_planes + 1))
+        assert len(plane_ids) == num_planes, "plane_ids must have num_planes elements!"
+
+        self.path = Path(path)
+        self.num_planes = num_planes
+        self.frame_rate = frame_rate
+        self.delta_encoding = delta_encoding
+        self.buffer_size = buffer_size
+        self.decimals = decimals
+
+        # 预先生成每架飞机的行首与首帧的属性
+        self._line_prefixes = [f"{plane_id:x},T=" for plane_id in plane_ids]
+        self._properties = [
+            f",Type={plane_type},Pilot={pilot.format(i)},Coalition={coalition},Color={color},Name={name}"
+            for i in range(num_planes)
+        ]
+        self._removal_lines = [f"-{plane_id:x}\n" for plane_id in plane_ids]
+        # 按"哪些字段需要写出"的位掩码预先生成T=之后的格式模板，
+        # 不写出的字段用"%.0s"消耗对应的参数、输出空字符串
+        field_formats = [f"%.{d}f" for d in decimals]
+        self._templates = [
+            "|".join(
+                fmt if mask >> col & 1 else "%.0s"
+                for col, fmt in enumerate(field_formats)
+            )
+            for mask in range(1 << len(field_formats))
+        ]
+        self._field_bits = 1 << np.arange(len(field_formats))
+
+        if compress is None:
+            compress = self.path.name.endswith(".zip.acmi")
+        if compress:
+            # .zip.acmi是只包含一个.txt.acmi文件的zip压缩包
+            self._zip_file = zipfile.ZipFile(
+                self.path, mode="w", compression=zipfile.ZIP_DEFLATED
+            )
+            entry_name = self.path.name.removesuffix(".zip.acmi") + ".txt.acmi"
+            self._file = self._zip_file.open(entry_name, mode="w", force_zip64=True)
+        else:
+            self._zip_file = None
+            self._file = open(self.path, "wb")
+
+        self._buffer: list[str] = [ACMI_HEADER]
+        self._buffered_chars = len(ACMI_HEADER)
+        self._last_values: np.ndarray | None = None
+        self._alive = np.ones(num_planes, dtype=bool)
+        self._next_frame_time: float | None = None
+        self.num_frames = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def _round_values(self, values: np.ndarray) -> np.ndarray:
+        """按列舍入到decimals位小数（+0.0把-0.0转为0.0）"""
+        rounded = np.empty_like(values)
+        for col, decimals in enumerate(self.decimals):
+            np.round(values[:, col], decimals, out=rounded[:, col])
+        rounded += 0.0
+        return rounded
+
+    def write_frame(self, time: float, states: np.ndarray) -> bool:
+        """写入一帧
+
+        Args:
+            time (float): 仿真时间，秒.
+            states (np.ndarray): (N, 6)或(N, 6+)的数组，只使用前6列：经度、纬度、高度、滚转、俯仰、偏航.
+
+        Returns:
+            bool: 该帧是否被写出（设置了frame_rate时部分帧会被跳过）.
+        """
+        if self.frame_rate is not None:
+            if (
+                self._next_frame_time is not None
+                and time < self._next_frame_time - 1e-9
+            ):
+                return False
+            self._next_frame_time = time + 1.0 / self.frame_rate
+
+        states = np.asarray(states, dtype=np.float64)
+        assert (
+            states.shape[0] == self.num_planes and states.shape[1] >= 6
+        ), f"states must have shape ({self.num_planes}, 6)!"
+        rounded = self._round_values(states[:, :6])
+
+        if self._last_values is None:
+            changed = np.ones(rounded.shape, dtype=bool)
+            first_frame = True
+        else:
+            changed = rounded != self._last_values if self.delta_encoding else None
+            first_frame = False
+        self._last_values = rounded
+
+        if changed is not None:
+            rows = np.flatnonzero(changed.any(axis=1) & self._alive)
+            masks = changed[rows] @ self._field_bits
+        else:
+            rows = np.flatnonzero(self._alive)
+            masks = np.full(len(rows), len(self._templates) - 1)
+
+        # 没有任何变化的帧不写出时间行
+        if len(rows) == 0:
+            return True
+
+        prefixes = self._line_prefixes
+        templates = self._templates
+        row_items = zip(
+            rows.tolist(), masks.tolist(), map(tuple, rounded[rows].tolist())
+        )
+        lines = [f"#{time:.2f}\n"]
+        if first_frame:
+            properties = self._properties
+            lines.extend(
+                prefixes[i] + templates[mask] % values + properties[i] + "\n"
+                for i, mask, values in row_items
+            )
+        else:
+            lines.extend(
+                prefixes[i] + templates[mask] % values + "\n"
+                for i, mask, values in row_items
+            )
+        self._write("".join(lines))
+        self.num_frames += 1
+        return True
+
+    def remove_planes(self, plane_indices: list[int] | np.ndarray) -> None:
+        """在当前时刻把飞机从场景中移除（ACMI中的"-id"行），之后这些飞机不再写出"""
+        plane_indices = np.asarray(plane_indices, dtype=np.intp).reshape(-1)
+        plane_indices = plane_indices[self._alive[plane_indices]]
+        self._alive[plane_indices] = False
+        self._write("".join(self._removal_lines[i] for i in plane_indices.tolist()))
+
+    def _write(self, text: str) -> None:
+        self._buffer.append(text)
+        self._buffered_chars += len(text)
+        if self._buffered_chars >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """把内存中累积的文本写入文件"""
+        if self._buffer:
+            self._file.write("".join(self._buffer).encode("utf-8"))
+            self._buffer = []
+            self._buffered_chars = 0
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+            if self._zip_file is not None:
+                self._zip_file.close()
+
+    def __enter__(self) -> "AcmiBatchWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        if hasattr(self, "_file"):
+            self.close()
@@ -0,0 +1,302 @@
+import threading
+
+import numpy as np
+
+from a430py.simulator.utils.a430_trajectory import (
+    INPUT_OFFSET,
+    OUTPUT_OFFSET,
+    TRAJECTORY_DTYPE,
+)
+from a430py.simulator.utils.a430_types import AircraftInput, AircraftOutput
+from a430py.simulator.utils.acmiLogger import AcmiLogger
+
+DROP_POLICIES = ("block", "drop_newest", "drop_oldest")
+
+
+class AcmiSink(object):
+    """把TrajectoryRecord写入AcmiLogger的适配器，time回到0（新episode）时接着上一个episode的时间继续写，
+    新episode的第一帧比上一个episode的最后一帧晚step_time，两帧不重叠"""
+
+    def __init__(
+        self, acmi_logger: AcmiLogger, plane_id: int = 1, step_time: float = 0.01
+    ) -> None:
+        self.acmi_logger = acmi_logger
+        self.plane_id = plane_id
+        self.step_time = step_time
+        self._time_offset = 0.0
+        self._last_time = 0.0
+        self._first_record = True
+
+    def write_records(self, records: np.ndarray) -> None:
+        for record in records.tolist():
+            time, lon, lat, alt, roll, pitch, yaw = record[:7]
+            if time < self._last_time:
+                self._time_offset += self._last_time + self.step_time
+            self._last_time = time
+            self.acmi_logger.writeTime(self._time_offset + time)
+            self.acmi_logger.writeOnePlane(
+                self.plane_id,
+                lon,
+                lat,
+                alt,
+                roll,
+                pitch,
+                yaw,
+                detailFlag=self._first_record,
+            )
+            self._first_record = False
+
+    def flush(self) -> None:
+        self.acmi_logger.log.flush()
+
+    def close(self) -> None:
+        self.acmi_logger.close()
+
+
+class AsyncLogger(object):
+    """异步日志：调用方只把每拍的输出、控制量复制进有界环形缓冲区，后台线程批量取出后写入各个sink
+
+    接口与TrajectoryRecorder相同（record/record_batch），可以直接作为A430Simulator/A430Gym的recorder。
+    sink为实现了write_records(records)的对象，records为TrajectoryRecord结构化数组，
+    如TrajectoryRecorder、AcmiSink。文件写入会释放GIL，因此使用线程而不是进程。
+    """
+
+    def __init__(
+        self,
+        sinks: list,
+        capacity: int = 65536,
+        drop_policy: str = "block",
+        block_timeout: float | None = None,
+        batch_size: int = 4096,
+        close_sinks: bool = True,
+    ) -> None:
+        """创建并启动后台写线程
+
+        Args:
+            sinks (list): 实现了write_records的sink，可选实现flush、close.
+            capacity (int, optional): 环形缓冲区的记录条数. Defaults to 65536.
+            drop_policy (str, optional): 缓冲区满时的策略，"block"阻塞调用方直到有空位（背压），
+                "drop_newest"丢弃新记录，"drop_oldest"覆盖最早的未写出记录. Defaults to "block".
+            block_timeout (float | None, optional): "block"策略的最长等待时间，超时后丢弃新记录，为None时一直等待. Defaults to None.
+            batch_size (int, optional): 后台线程每次最多取出的记录条数. Defaults to 4096.
+            close_sinks (bool, optional): close时是否同时关闭sink. Defaults to True.
+        """
+        assert capacity > 0, "capacity must be positive!"
+        assert batch_size > 0, "batch_size must be positive!"
+        assert (
+            drop_policy in DROP_POLICIES
+        ), f"drop_policy must be one of {DROP_POLICIES}!"
+
+        self.sinks = list(sinks)
+        self.capacity = capacity
+        self.drop_policy = drop_policy
+        self.block_timeout = block_timeout
+        self.batch_size = batch_size
+        self.close_sinks = close_sinks
+
+        self.num_recorded = 0
+        self.num_dropped = 0
+        self.num_written = 0
+
+        self._ring = np.zeros(capacity, dtype=TRAJECTORY_DTYPE)
+        self._ring_bytes = self._ring.view(np.uint8).reshape(capacity, -1)
+        self._ring_time = self._ring["time"]
+        self._batch = np.zeros(batch_size, dtype=TRAJECTORY_DTYPE)
+        self._head = 0  # 下一条记录写入的位置
+        self._count = 0  # 未取出的记录条数
+        self._busy = False  # 后台线程正在写sink
+
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._drained = threading.Condition(self._lock)
+        self._closed = False
+        self._error: BaseException | None = None
+
+        self._thread = threading.Thread(
+            target=self._run, name="a430-async-logger", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __len__(self) -> int:
+        return self.num_recorded
+
+    def _reserve(self, num_records: int) -> int:
+        """在持有锁时为num_records条记录腾出空间，返回实际可以写入的条数"""
+        free = self.capacity - self._count
+        if free >= num_records:
+            return num_records
+
+        if self.drop_policy == "block":
+            self._not_full.wait_for(
+                lambda: self.capacity - self._count >= num_records
+                or self._error is not None,
+                timeout=self.block_timeout,
+            )
+            self._raise_error()
+            return min(num_records, self.capacity - self._count)
+        if self.drop_policy == "drop_newest":
+            return free
+
+        # drop_oldest：丢弃最早的未取出记录
+        num_overwritten = min(num_records - free, self._count)
+        self._count -= num_overwritten
+        self.num_dropped += num_overwritten
+        return min(num_records, self.capacity)
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("async logger writer thread failed!") from self._error
+
+    def record(
+        self,
+        time: float,
+        aircraft_output: AircraftOutput | np.ndarray,
+        aircraft_input: AircraftInput | np.ndarray,
+    ) -> None:
+        """把一拍复制进环形缓冲区，参数同TrajectoryRecorder.record"""
+        with self._lock:
+            self._raise_error()
+            assert not self._closed, "async logger is closed!"
+            self.num_recorded += 1
+            if self._reserve(1) == 0:
+                self.num_dropped += 1
+                return
+
+            row = self._head
+            self._ring_time[row] = time
+            self._ring_bytes[row, OUTPUT_OFFSET:INPUT_OFFSET] = np.frombuffer(
+                aircraft_output, dtype=np.uint8
+            )
+            self._ring_bytes[row, INPUT_OFFSET:] = np.frombuffer(
+                aircraft_input, dtype=np.uint8
+            )
+            self._head = (row + 1) % self.capacity
+            self._count += 1
+            # 后台线程只在缓冲区为空时等待
+            if self._count == 1:
+                self._not_empty.notify()
+
+    def record_batch(
+        self, times: np.ndarray, outputs: np.ndarray, inputs: np.ndarray
+    ) -> None:
+        """一次复制N拍，参数同TrajectoryRecorder.record_batch"""
+        times = np.asarray(times, dtype=np.float64).reshape(-1)
+        num_records = len(times)
+        output_bytes = (
+            np.ascontiguousarray(outputs).view(np.uint8).reshape(num_records, -1)
+        )
+        inputs = np.asarray(inputs)
+        if inputs.dtype.names is None:
+            inputs = inputs.astype(np.float32, copy=False)
+        input_bytes = (
+            np.ascontiguousarray(inputs).view(np.uint8).reshape(num_records, -1)
+        )
+
+        with self._lock:
+            self._raise_error()
+            assert not self._closed, "async logger is closed!"
+            self.num_recorded += num_records
+            start = 0
+            while start < num_records:
+                # 每次最多写入半个缓冲区，block策略下可以与后台线程交替进行
+                requested = min(num_records - start, max(self.capacity // 2, 1))
+                n = self._reserve(requested)
+                rows = (self._head + np.arange(n)) % self.capacity
+                self._ring_time[rows] = times[start : start + n]
+                self._ring_bytes[rows, OUTPUT_OFFSET:INPUT_OFFSET] = output_bytes[
+                    start : start + n
+                ]
+                self._ring_bytes[rows, INPUT_OFFSET:] = input_bytes[start : start + n]
+                self._head = (self._head + n) % self.capacity
+                self._count += n
+                start += n
+                self._not_empty.notify()
+
+                if n < requested:
+                    self.num_dropped += num_records - start
+                    break
+
+    def _take_batch(self) -> np.ndarray:
+        """在持有锁时取出最多batch_size条最早的记录，复制到_batch"""
+        n = min(self._count, self.batch_size)
+        tail = (self._head - self._count) % self.capacity
+        first = min(n, self.capacity - tail)
+        self._batch[:first] = self._ring[tail : tail + first]
+        self._batch[first:n] = self._ring[: n - first]
+        self._count -= n
+        return self._batch[:n]
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                self._not_empty.wait_for(lambda: self._count > 0 or self._closed)
+                if self._count == 0:
+                    # 已关闭且缓冲区已取空
+                    self._drained.notify_all()
+                    return
+                records = self._take_batch()
+                self._busy = True
+                self._not_full.notify_all()
+
+            try:
+                for sink in self.sinks:
+                    sink.write_records(records)
+            except BaseException as e:
+                with self._lock:
+                    self._error = e
+                    self._busy = False
+                    self._count = 0
+                    self._not_full.notify_all()
+                    self._drained.notify_all()
+                return
+
+            with self._lock:
+                self.num_written += len(records)
+                self._busy = False
+                if self._count == 0:
+                    self._drained.notify_all()
+
+    def flush(self, timeout: float | None = None) -> None:
+        """等待缓冲区中的记录全部写入sink，再调用各sink的flush"""
+        with self._lock:
+            self._drained.wait_for(
+                lambda: (self._count == 0 and not self._busy)
+                or self._error is not None
+                or not self._thread.is_alive(),
+                timeout=timeout,
+            )
+            self._raise_error()
+        for sink in self.sinks:
+            if hasattr(sink, "flush"):
+                sink.flush()
+
+    def close(self) -> None:
+        """写出剩余记录并停止后台线程"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._not_empty.notify_all()
+        self._thread.join()
+
+        for sink in self.sinks:
+            if self.close_sinks and hasattr(sink, "close"):
+                sink.close()
+            elif hasattr(sink, "flush"):
+                sink.flush()
+        self._raise_error()
+
+    def __enter__(self) -> "AsyncLogger":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        if hasattr(self, "_thread"):
+            self.close()
@@ -0,0 +1,182 @@
+import json
+import random
+import threading
+import time
+from typing import Callable
+
+import numpy as np
+
+# 直方图的桶上界，纳秒
+DEFAULT_BUCKETS_NS = (
+    1_000,
+    2_000,
+    5_000,
+    10_000,
+    20_000,
+    50_000,
+    100_000,
+    200_000,
+    500_000,
+    1_000_000,
+    10_000_000,
+)
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class StageStats(object):
+    """单个阶段的调用次数、累计耗时、最小/最大耗时，以及容量为reservoir_size的蓄水池采样"""
+
+    def __init__(self, reservoir_size: int = 1024) -> None:
+        self.reservoir_size = reservoir_size
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+        self.samples: list[int] = []
+
+    def add(self, elapsed_ns: int) -> None:
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if self.count == 1 or elapsed_ns < self.min_ns:
+            self.min_ns = elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+        # Algorithm R：第count个样本以reservoir_size/count的概率替换蓄水池中的一个样本
+        if len(self.samples) < self.reservoir_size:
+            self.samples.append(elapsed_ns)
+        else:
+            i = random.randrange(self.count)
+            if i < self.reservoir_size:
+                self.samples[i] = elapsed_ns
+
+    def summary(self, buckets_ns: tuple[int, ...] = DEFAULT_BUCKETS_NS) -> dict:
+        samples = np.asarray(self.samples, dtype=np.int64)
+        quantiles = (
+            np.quantile(samples, QUANTILES).tolist()
+            if len(samples) > 0
+            else [0.0] * len(QUANTILES)
+        )
+        # 直方图由蓄水池样本得到，counts为累计计数（与Prometheus的le桶一致），最后一个桶为+Inf
+        bucket_counts = np.searchsorted(
+            np.sort(samples), np.asarray(buckets_ns), side="right"
+        )
+        return dict(
+            count=self.count,
+            total_ns=self.total_ns,
+            mean_ns=self.total_ns / self.count if self.count > 0 else 0.0,
+            min_ns=self.min_ns,
+            max_ns=self.max_ns,
+            quantiles_ns={str(q): v for q, v in zip(QUANTILES, quantiles)},
+            histogram=dict(
+                le_ns=list(buckets_ns) + ["+Inf"],
+                counts=bucket_counts.tolist() + [len(samples)],
+                num_samples=len(samples),
+            ),
+        )
+
+
+class Profiler(object):
+    """按阶段统计耗时的计时器
+
+    通过timed包装函数或instrument包装对象的方法来计时；未启用时对象上不存在包装，没有任何额外开销。
+    """
+
+    def __init__(
+        self,
+        reservoir_size: int = 1024,
+        buckets_ns: tuple[int, ...] = DEFAULT_BUCKETS_NS,
+    ) -> None:
+        self.reservoir_size = reservoir_size
+        self.buckets_ns = buckets_ns
+        self.stages: dict[str, StageStats] = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name: str) -> StageStats:
+        stats = self.stages.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self.stages.setdefault(
+                    name, StageStats(reservoir_size=self.reservoir_size)
+                )
+        return stats
+
+    def timed(self, name: str, func: Callable) -> Callable:
+        """返回计时版本的func，每次调用的耗时计入阶段name"""
+        add = self.stage(name).add
+        perf_counter_ns = time.perf_counter_ns
+
+        def wrapper(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                add(perf_counter_ns() - start)
+
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def instrument(self, obj: object, method_names: list[str], prefix: str) -> None:
+        """用实例属性覆盖obj的方法，阶段名为"{prefix}.{method_name}"，用uninstrument恢复"""
+        for method_name in method_names:
+            setattr(
+                obj,
+                method_name,
+                self.timed(f"{prefix}.{method_name}", getattr(obj, method_name)),
+            )
+
+    @staticmethod
+    def uninstrument(obj: object, method_names: list[str]) -> None:
+        for method_name in method_names:
+            obj.__dict__.pop(method_name, None)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stages = {}
+
+    def stats(self) -> dict:
+        """各阶段的count, total_ns, mean_ns, min_ns, max_ns, quantiles_ns, histogram"""
+        return {
+            name: stats.summary(self.buckets_ns)
+            for name, stats in list(self.stages.items())
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.stats(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "a430") -> str:
+        """Prometheus文本格式的快照：每个阶段一组histogram（桶来自蓄水池样本，按调用次数缩放），以及min/max"""
+        metric = f"{prefix}_stage_duration_seconds"
+        lines = [
+            f"# HELP {metric} Duration of instrumented a430py stages.",
+            f"# TYPE {metric} histogram",
+        ]
+        extremes = []
+        for name, summary in self.stats().items():
+            histogram = summary["histogram"]
+            scale = summary["count"] / max(histogram["num_samples"], 1)
+            for le, count in zip(histogram["le_ns"], histogram["counts"]):
+                le_label = le if le == "+Inf" else repr(le / 1e9)
+                bucket_count = (
+                    summary["count"] if le == "+Inf" else round(count * scale)
+                )
+                lines.append(
+                    f'{metric}_bucket{{stage="{name}",le="{le_label}"}} {bucket_count}'
+                )
+            lines.append(
+                f'{metric}_sum{{stage="{name}"}} {summary["total_ns"] / 1e9!r}'
+            )
+            lines.append(f'{metric}_count{{stage="{name}"}} {summary["count"]}')
+            extremes.append((name, summary))
+
+        for kind in ["min", "max"]:
+            gauge = f"{prefix}_stage_{kind}_duration_seconds"
+            lines.append(
+                f"# HELP {gauge} {kind.capitalize()} duration of a430py stages."
+            )
+            lines.append(f"# TYPE {gauge} gauge")
+            for name, summary in extremes:
+                lines.append(
+                    f'{gauge}{{stage="{name}"}} {summary[f"{kind}_ns"] / 1e9!r}'
+                )
+        return "\n".join(lines) + "\n"
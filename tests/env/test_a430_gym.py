@@ -1,6 +1,6 @@
 import numpy as np
 
-from a430py.env.a430_gym import A430Gym
+from a430py.env.a430_gym import OBSERVATION_BOUNDS, A430Gym, RunningMeanStd
 
 
 def test_reset_1():
@@ -47,6 +47,203 @@ def test_step_2():
         # print(f"step {i}: {next_obs}")
 
 
+def test_zero_copy_step():
+    print("In test zero copy step: ")
+
+    env = A430Gym()
+    env_zero_copy = A430Gym(zero_copy=True)
+    obs, info = env.reset()
+    obs_zero_copy, info = env_zero_copy.reset()
+    assert np.allclose(obs, obs_zero_copy)
+
+    action = [0.0, -1.998228, 0.0, 0.689030]
+
+    for i in range(60):
+        next_obs, reward, terminated, truncated, info = env.step(action)
+        next_obs_zero_copy, reward, terminated, truncated, info = env_zero_copy.step(
+            action
+        )
+        assert next_obs_zero_copy is obs_zero_copy
+        assert np.allclose(next_obs, next_obs_zero_copy)
+
+
+def test_frame_skip():
+    print("In test frame skip: ")
+
+    frame_skip = 5
+    aggregate_keys = ["fAlt", "fTAS"]
+    env = A430Gym(max_steps=100 * frame_skip)
+    env_frame_skip = A430Gym(
+        frame_skip=frame_skip, frame_skip_aggregate_keys=aggregate_keys
+    )
+    env.reset()
+    env_frame_skip.reset()
+
+    action = [0.0, -1.998228, 0.0, 0.689030]
+
+    for i in range(12):
+        substeps = []
+        for _ in range(frame_skip):
+            next_obs, reward, terminated, truncated, info = env.step(action)
+            substeps.append(
+                [env.simulator.get_aircraft_output()[ky] for ky in aggregate_keys]
+            )
+        next_obs_frame_skip, reward, terminated, truncated, info = env_frame_skip.step(
+            action
+        )
+
+        assert np.allclose(next_obs, next_obs_frame_skip)
+        assert np.allclose(info["substep_min"], np.min(substeps, axis=0))
+        assert np.allclose(info["substep_max"], np.max(substeps, axis=0))
+        assert np.allclose(info["substep_mean"], np.mean(substeps, axis=0))
+
+    assert env_frame_skip.step_cnt == 12
+
+
+def test_observation_space():
+    print("In test observation space: ")
+
+    env = A430Gym()
+    obs, info = env.reset()
+    assert obs.dtype == np.float32
+    assert env.observation_space.shape == (len(env.observation_keys),)
+    assert env.observation_space.contains(obs)
+
+    next_obs, reward, terminated, truncated, info = env.step(
+        np.array([0.0, -1.998228, 0.0, 0.689030])
+    )
+    assert next_obs.dtype == np.float32
+    output = env.simulator.get_aircraft_output()
+    assert np.allclose(next_obs, [output[ky] for ky in env.observation_keys])
+
+
+def test_observation_normalization():
+    print("In test observation normalization: ")
+
+    action = [0.0, -1.998228, 0.0, 0.689030]
+    env = A430Gym()
+    env_bounds = A430Gym(observation_normalization="bounds")
+    env_running = A430Gym(observation_normalization="running", observation_clip=5.0)
+    env.reset()
+    env_bounds.reset()
+    env_running.reset()
+
+    observations = []
+    for i in range(20):
+        next_obs, reward, terminated, truncated, info = env.step(action)
+        next_obs_bounds, reward, terminated, truncated, info = env_bounds.step(action)
+        next_obs_running, reward, terminated, truncated, info = env_running.step(action)
+        observations.append(next_obs)
+
+        for i, ky in enumerate(env.observation_keys):
+            low, high = OBSERVATION_BOUNDS[ky]
+            if np.isfinite(low) and np.isfinite(high):
+                expected = (next_obs[i] - (high + low) / 2) / ((high - low) / 2)
+            else:
+                expected = next_obs[i]
+            assert np.isclose(next_obs_bounds[i], expected, atol=1e-5), ky
+        assert np.all(np.abs(next_obs_running) <= 5.0)
+
+    # 运行均值、方差包含reset时的观测
+    stats = env_running.observation_stats
+    assert stats.count == 21
+    assert np.allclose(stats.mean[6:], np.mean(observations, axis=0)[6:], rtol=0.2)
+    assert env_bounds.observation_space.contains(next_obs_bounds)
+
+    env_running.update_observation_stats = False
+    env_running.step(action)
+    assert stats.count == 21
+
+
+def test_observation_bounds_clip():
+    print("In test observation bounds clip: ")
+
+    # 高度超出OBSERVATION_BOUNDS时，归一化后的观测截断到observation_space内
+    env = A430Gym(initial_alt=150.0, observation_normalization="bounds")
+    obs, info = env.reset()
+    assert obs[env.observation_keys.index("fAlt")] == 1.0
+    assert env.observation_space.contains(obs)
+    for i in range(10):
+        obs = env.step([0.0, -1.998228, 0.0, 0.689030])[0]
+        assert env.observation_space.contains(obs)
+
+
+def test_running_mean_std_update_batch():
+    print("In test running mean std update batch: ")
+
+    # 按批合并与逐个样本更新的结果一致
+    rng = np.random.default_rng(0)
+    samples = rng.normal(3.0, 2.0, (50, 4)).astype(np.float32)
+    stats = RunningMeanStd((4,))
+    stats_batch = RunningMeanStd((4,))
+    for sample in samples:
+        stats.update(sample)
+    for batch in np.split(samples, [0, 1, 8, 30]):
+        stats_batch.update_batch(batch)
+    assert stats_batch.count == stats.count
+    assert np.allclose(stats_batch.mean, stats.mean)
+    assert np.allclose(stats_batch.var, stats.var)
+    assert np.allclose(stats_batch.scale, stats.scale)
+    assert np.allclose(stats_batch.offset, stats.offset)
+
+
+def test_normalize_action():
+    print("In test normalize action: ")
+
+    env = A430Gym()
+    env_normalized = A430Gym(normalize_action=True)
+    env.reset()
+    env_normalized.reset()
+    assert np.allclose(env_normalized.action_space.low, -1.0)
+
+    action = np.array([0.0, -1.998228, 0.0, 0.689030])
+    low, high = env.action_space.low, env.action_space.high
+    normalized_action = (action - (high + low) / 2) / ((high - low) / 2)
+    for i in range(20):
+        next_obs, reward, terminated, truncated, info = env.step(action)
+        next_obs_normalized, reward, terminated, truncated, info = env_normalized.step(
+            normalized_action
+        )
+        assert np.allclose(next_obs, next_obs_normalized, atol=1e-4)
+
+
+def test_initial_condition_pool():
+    print("In test initial condition pool: ")
+
+    pool = [dict(fTAS=8.0), dict(fTAS=9.0, fAlt=20.0), dict(fYaw=0.0)]
+    env = A430Gym(backend="numpy", reset_cache_size=3, initial_condition_pool=pool)
+    env_fresh = A430Gym(backend="numpy", initial_condition_pool=pool)
+    env.reset(seed=3)
+    env_fresh.reset(seed=3)
+
+    # 同一种子抽取同样的初始条件，命中缓存时观测与新建飞机逐位相同
+    action = np.array([0.0, -1.998228, 0.0, 0.689030])
+    for episode in range(8):
+        obs, info = env.reset()
+        obs_fresh, info = env_fresh.reset()
+        assert np.array_equal(obs, obs_fresh)
+        for i in range(5):
+            obs = env.step(action)[0]
+            obs_fresh = env_fresh.step(action)[0]
+            assert np.array_equal(obs, obs_fresh)
+    assert len(env.simulator._reset_cache) == 3
+
+
+def test_reset_cache_without_snapshot():
+    print("In test reset cache without snapshot: ")
+
+    env = A430Gym(reset_cache_size=4)
+    env_fresh = A430Gym()
+    action = np.array([0.5, -1.0, 0.1, 0.9])
+    for episode in range(3):
+        obs, info = env.reset()
+        obs_fresh, info = env_fresh.reset()
+        assert np.array_equal(obs, obs_fresh)
+        for i in range(30):
+            env.step(action)
+            env_fresh.step(action)
+
+
 def test_check_config():
     print(f"In test check_config: ")
 
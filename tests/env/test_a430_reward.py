@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from a430py.env.a430_gym import A430Gym
+from a430py.env.a430_reward import RewardSpec
+from a430py.env.a430_vector_env import A430VectorEnv
+
+REWARD_SPEC = {
+    "tracking": {
+        "fTAS": dict(target=8.0, weight=1.0, scale=2.0),
+        "fRoll": dict(target=0.0, weight=0.1),
+    },
+    "alive_reward": 1.0,
+    "termination_reward": -100.0,
+    "altitude_floor": 1.0,
+    "attitude_limits": {"fRoll": 60.0, "fPitch": 45.0},
+    "stall_alpha": 15.0,
+}
+
+
+def test_reward_spec_evaluate():
+    print("In test reward spec evaluate: ")
+
+    fields = ["fAlt", "fRoll", "fPitch", "fAlpha", "fTAS"]
+    spec = RewardSpec(REWARD_SPEC, fields)
+    values = np.array(
+        [
+            [10.0, 2.0, 0.0, 5.0, 10.0],  # 正常飞行
+            [0.5, 0.0, 0.0, 5.0, 8.0],  # 低于最低高度
+            [10.0, -70.0, 0.0, 5.0, 8.0],  # 滚转超限
+            [10.0, 0.0, 0.0, 20.0, 8.0],  # 失速
+        ],
+        dtype=np.float32,
+    )
+    rewards, terminations = spec.evaluate(values)
+
+    assert terminations.tolist() == [False, True, True, True]
+    assert np.isclose(rewards[0], 1.0 - ((10.0 - 8.0) / 2.0) ** 2 - 0.1 * 2.0**2)
+    assert np.isclose(rewards[1], 1.0 - 100.0)
+    assert np.isclose(rewards[2], 1.0 - 0.1 * 70.0**2 - 100.0)
+
+    spec_abs = RewardSpec({**REWARD_SPEC, "error": "abs"}, fields)
+    rewards, terminations = spec_abs.evaluate(values[:1])
+    assert np.isclose(rewards[0], 1.0 - 1.0 - 0.1 * 2.0)
+
+    with pytest.raises(AssertionError):
+        RewardSpec({"tracking": {"fVelocity": dict(target=1.0)}}, fields)
+    with pytest.raises(AssertionError):
+        RewardSpec({"stall": 15.0}, fields)
+
+
+def test_gym_reward_spec():
+    print("In test gym reward spec: ")
+
+    env = A430Gym(reward_spec=REWARD_SPEC, max_steps=1000)
+    env.reset()
+
+    # 配平动作：飞机保持平飞，不终止
+    action = np.array([0.0, -1.998228, 0.0, 0.689030])
+    for i in range(20):
+        obs, reward, terminated, truncated, info = env.step(action)
+        assert isinstance(reward, float)
+        assert not terminated
+
+    # 大幅拉杆使迎角超过失速迎角
+    for i in range(500):
+        obs, reward, terminated, truncated, info = env.step(
+            np.array([0.0, -30.0, 0.0, 1.0])
+        )
+        if terminated:
+            break
+    assert terminated and not truncated
+    assert reward < -50.0
+
+
+def test_vector_env_reward_spec_matches_gym():
+    print("In test vector env reward spec matches gym: ")
+
+    num_envs = 3
+    vec_env = A430VectorEnv(num_envs=num_envs, max_steps=1000, reward_spec=REWARD_SPEC)
+    envs = [A430Gym(reward_spec=REWARD_SPEC, max_steps=1000) for _ in range(num_envs)]
+    vec_env.reset()
+    for env in envs:
+        env.reset()
+
+    actions = np.array(
+        [
+            [0.0, -1.998228, 0.0, 0.689030],
+            [0.5, -1.0, 0.1, 0.9],
+            [-0.5, -3.0, 0.0, 0.5],
+        ]
+    )
+    for i in range(30):
+        obs, rewards, terminations, truncations, info = vec_env.step(actions)
+        for env_id, env in enumerate(envs):
+            obs, reward, terminated, truncated, info = env.step(actions[env_id])
+            assert np.isclose(rewards[env_id], reward)
+            assert terminations[env_id] == terminated
@@ -0,0 +1,88 @@
+import gymnasium as gym
+import numpy as np
+
+import a430py  # noqa: F401
+from a430py.env.a430_sharded_vector_env import A430ShardedVectorEnv
+from a430py.env.a430_vector_env import A430VectorEnv
+
+
+def test_step_matches_vector_env():
+    print("In test sharded vector step: ")
+
+    num_envs = 5
+    max_steps = 20
+    sharded_env = A430ShardedVectorEnv(
+        num_envs=num_envs, num_workers=2, max_steps=max_steps
+    )
+    vec_env = A430VectorEnv(num_envs=num_envs, max_steps=max_steps)
+
+    obs, info = sharded_env.reset(seed=0)
+    vec_obs, info = vec_env.reset(seed=0)
+    assert np.allclose(obs, vec_obs)
+
+    actions = np.tile([0.0, -1.998228, 0.0, 0.689030], (num_envs, 1))
+    actions[:, 0] = np.linspace(-1.0, 1.0, num_envs)
+
+    # 跨过一次自动重置
+    for i in range(max_steps + 5):
+        obs, rewards, terminations, truncations, info = sharded_env.step(actions)
+        vec_obs, vec_rewards, vec_terminations, vec_truncations, info = vec_env.step(
+            actions
+        )
+        assert np.allclose(obs, vec_obs)
+        assert np.array_equal(terminations, vec_terminations)
+        assert np.array_equal(truncations, vec_truncations)
+
+    sharded_env.close()
+
+
+def test_autoreset_same_step_final_info():
+    print("In test sharded vector autoreset same step: ")
+
+    # 嵌套的final_info按环境合并，各进程中结束的环境都带有步数
+    num_envs = 4
+    sharded_env = A430ShardedVectorEnv(
+        num_envs=num_envs, num_workers=2, max_steps=3, autoreset_mode="SameStep"
+    )
+    sharded_env.reset()
+
+    actions = np.tile([0.0, -1.998228, 0.0, 0.689030], (num_envs, 1))
+    for i in range(3):
+        obs, rewards, terminations, truncations, info = sharded_env.step(actions)
+    assert info["_final_info"].all()
+    assert info["final_info"]["step_cnt"].tolist() == [3] * num_envs
+    assert (
+        sharded_env.single_observation_space == A430VectorEnv().single_observation_space
+    )
+
+    sharded_env.close()
+
+
+def test_reset_mask():
+    print("In test sharded vector reset_mask: ")
+
+    num_envs = 4
+    sharded_env = A430ShardedVectorEnv(
+        num_envs=num_envs, num_workers=2, autoreset_mode="Disabled"
+    )
+    init_obs, info = sharded_env.reset()
+
+    actions = np.tile([0.5, -1.998228, 0.0, 0.689030], (num_envs, 1))
+    for i in range(10):
+        obs, rewards, terminations, truncations, info = sharded_env.step(actions)
+
+    reset_mask = np.array([True, False, False, True])
+    obs, info = sharded_env.reset(options={"reset_mask": reset_mask})
+    assert np.allclose(obs[reset_mask], init_obs[reset_mask])
+    assert not np.allclose(obs[~reset_mask], init_obs[~reset_mask])
+
+    sharded_env.close()
+
+
+def test_make_vec():
+    print("In test sharded make_vec: ")
+
+    vec_env = gym.make_vec("A430Gym-sharded-vec-v0", num_envs=3, num_workers=3)
+    obs, info = vec_env.reset(seed=0)
+    assert obs.shape == (3, 12)
+    vec_env.close()
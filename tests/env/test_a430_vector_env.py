@@ -0,0 +1,143 @@
+import gymnasium as gym
+import numpy as np
+import pytest
+
+import a430py  # noqa: F401
+from a430py.env.a430_gym import A430Gym
+from a430py.env.a430_vector_env import A430VectorEnv
+from a430py.simulator.a430_config_sampler import ConfigSampler
+
+
+def test_step_matches_single_env():
+    print("In test vector step: ")
+
+    num_envs = 3
+    vec_env = A430VectorEnv(num_envs=num_envs, max_steps=1000)
+    envs = [A430Gym(max_steps=1000) for _ in range(num_envs)]
+
+    obs, info = vec_env.reset()
+    assert obs.shape == (num_envs, len(vec_env.observation_keys))
+    assert obs.dtype == np.float32
+    for env_id, env in enumerate(envs):
+        single_obs, info = env.reset()
+        assert np.allclose(obs[env_id], single_obs)
+
+    # 动作列顺序：fStickLat, fStickLon, fRudder, fThrottle
+    actions = np.array(
+        [
+            [0.0, -1.998228, 0.0, 0.689030],
+            [0.5, -1.0, 0.0, 0.5],
+            [-0.5, -3.0, 0.1, 0.9],
+        ]
+    )
+
+    for i in range(60):
+        obs, rewards, terminations, truncations, info = vec_env.step(actions)
+        for env_id, env in enumerate(envs):
+            single_obs, reward, terminated, truncated, info = env.step(actions[env_id])
+            assert np.allclose(obs[env_id], single_obs)
+
+
+def test_autoreset_next_step():
+    print("In test vector autoreset: ")
+
+    max_steps = 5
+    vec_env = A430VectorEnv(num_envs=2, max_steps=max_steps)
+    init_obs, info = vec_env.reset()
+
+    actions = np.tile([0.0, -1.998228, 0.0, 0.689030], (2, 1))
+    for i in range(max_steps):
+        obs, rewards, terminations, truncations, info = vec_env.step(actions)
+    assert terminations.all() and truncations.all()
+
+    # 下一步重置，动作被忽略
+    obs, rewards, terminations, truncations, info = vec_env.step(actions)
+    assert np.allclose(obs, init_obs)
+    assert not terminations.any() and not truncations.any()
+    assert np.allclose(rewards, 0.0)
+    assert (vec_env.step_cnts == 0).all()
+
+
+def test_autoreset_same_step():
+    print("In test vector autoreset same step: ")
+
+    max_steps = 5
+    vec_env = A430VectorEnv(num_envs=2, max_steps=max_steps, autoreset_mode="SameStep")
+    init_obs, info = vec_env.reset()
+
+    actions = np.tile([0.0, -1.998228, 0.0, 0.689030], (2, 1))
+    for i in range(max_steps):
+        obs, rewards, terminations, truncations, info = vec_env.step(actions)
+
+    assert terminations.all()
+    assert np.allclose(obs, init_obs)
+    assert info["_final_obs"].all()
+    assert not np.allclose(info["final_obs"], init_obs)
+    assert info["_final_info"].all()
+    assert info["final_info"]["step_cnt"].tolist() == [max_steps] * 2
+    assert info["final_info"]["_step_cnt"].all()
+
+    # 没有环境结束时不返回final_obs、final_info
+    obs, rewards, terminations, truncations, info = vec_env.step(actions)
+    assert "final_obs" not in info and "final_info" not in info
+
+
+@pytest.mark.parametrize("observation_normalization", [None, "bounds", "running"])
+def test_observation_normalization(observation_normalization: str | None):
+    print("In test vector observation normalization: ")
+
+    # 观测空间、归一化后的观测与A430Gym一致
+    num_envs = 2
+    kwargs = dict(max_steps=1000, observation_normalization=observation_normalization)
+    vec_env = A430VectorEnv(num_envs=num_envs, **kwargs)
+    envs = [A430Gym(**kwargs) for _ in range(num_envs)]
+    assert vec_env.single_observation_space == envs[0].observation_space
+    assert np.all(np.isfinite(vec_env.single_observation_space.low[:6]))
+
+    obs, info = vec_env.reset()
+    single_obs = [env.reset()[0] for env in envs]
+    actions = np.array([[0.0, -1.998228, 0.0, 0.689030], [0.5, -1.0, 0.0, 0.5]])
+    for i in range(20):
+        obs, rewards, terminations, truncations, info = vec_env.step(actions)
+        single_obs = [env.step(actions[j])[0] for j, env in enumerate(envs)]
+        if observation_normalization != "running":
+            assert np.allclose(obs, single_obs, atol=1e-6)
+        assert vec_env.observation_space.contains(obs)
+    if observation_normalization == "running":
+        # 统计量由两个环境共享，样本数为两者之和
+        assert vec_env.observation_stats.count == 21 * num_envs
+
+
+def test_make_vec():
+    print("In test make_vec: ")
+
+    vec_env = gym.make_vec("A430Gym-vec-v0", num_envs=4)
+    obs, info = vec_env.reset(seed=0)
+    assert obs.shape == (4, 12)
+
+    obs, rewards, terminations, truncations, info = vec_env.step(
+        vec_env.action_space.sample()
+    )
+    assert obs.shape == (4, 12)
+    vec_env.close()
+
+
+def test_config_sampler():
+    print("In test config sampler: ")
+
+    sampler = ConfigSampler({"m": dict(dist="uniform", scale=0.3)})
+    vec_env = A430VectorEnv(num_envs=4, max_steps=2, config_sampler=sampler)
+
+    vec_env.reset(seed=0)
+    masses = vec_env.simulator.plane_consts_array["m"].copy()
+    assert len(np.unique(masses)) == 4
+
+    # 只有被重置的环境重新采样参数
+    vec_env.reset(options={"reset_mask": np.array([True, False, False, False])})
+    new_masses = vec_env.simulator.plane_consts_array["m"]
+    assert new_masses[0] != masses[0]
+    assert np.array_equal(new_masses[1:], masses[1:])
+
+    # 相同的种子得到相同的参数
+    vec_env.reset(seed=0)
+    assert np.array_equal(vec_env.simulator.plane_consts_array["m"], masses)
@@ -0,0 +1,159 @@
+import numpy as np
+import pytest
+
+from a430py.env.a430_gym import A430Gym
+from a430py.simulator.a430_backend import (
+    BACKENDS,
+    A430Backend,
+    A430CtypesBackend,
+    A430NumpyBackend,
+    get_dll_path,
+    load_library,
+    register_backend,
+)
+from a430py.simulator.a430_batch_sim import A430BatchSimulator
+from a430py.simulator.a430_sim import A430Simulator
+
+
+class CountingBackend(A430NumpyBackend):
+    """逐架调用单机接口的numpy后端，并统计update的调用次数"""
+
+    vectorized = False
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.update_cnt = 0
+
+    def update(self, plane: int, update_times: int = 1) -> None:
+        self.update_cnt += update_times
+        super().update(plane, update_times)
+
+    # 使用A430Backend中逐架调用的默认实现
+    create_batch = A430Backend.create_batch
+    reset_batch = A430Backend.reset_batch
+    step_batch = A430Backend.step_batch
+    read_output_batch = A430Backend.read_output_batch
+    terminate_batch = A430Backend.terminate_batch
+
+
+@pytest.fixture
+def counting_backend():
+    register_backend("counting", CountingBackend)
+    yield "counting"
+    BACKENDS.pop("counting")
+
+
+@pytest.mark.parametrize("backend", ["ctypes", "numpy"])
+def test_simulator_backend(backend: str):
+    print("In test simulator backend: ")
+
+    sim = A430Simulator(config={}, backend=backend)
+    assert isinstance(sim.backend, A430Backend)
+
+    obs = sim.reset(dLon=120, dLat=30, fAlt=10, fTAS=8, fYaw=90)
+    assert np.isclose(obs["fTAS"], 8.0)
+    for _ in range(10):
+        obs = sim.step(fStickLon=-1.998228, fThrottle=0.689030)
+
+    assert np.isclose(sim.get_plane_const()["m"], 0.1)
+    assert np.isclose(sim.get_aero_coeffs()["CLal"], 4.235972)
+
+
+def test_numpy_read_params_multi_plane():
+    print("In test numpy read params multi plane: ")
+
+    # 多架飞机共用一个后端，逐架读回的参数与各自设置的一致
+    backend = A430NumpyBackend()
+    configs = [{}, {"m": 0.2, "Cmq": -5.0}, {"m": 0.5, "S": 0.1, "Cnda": 0.01}]
+    sims = [A430Simulator(config=config, backend=backend) for config in configs]
+    for sim in sims:
+        sim.reset(fTAS=8)
+    assert len({sim.planePtr for sim in sims}) == len(sims)
+
+    for sim in sims:
+        assert sim.get_plane_const() == {
+            ky: getattr(sim.plane_consts, ky) for ky in sim.plane_const_fields
+        }
+        assert sim.get_aero_coeffs() == {
+            ky: getattr(sim.aero_coeffs, ky) for ky in sim.aero_coeff_fields
+        }
+    assert sims[2].get_plane_const()["m"] == 0.5
+    assert sims[2].get_plane_const()["S"] == 0.1
+    assert sims[1].get_aero_coeffs()["Cmq"] == -5.0
+
+
+def test_batch_default_implementation_matches_vectorized(counting_backend: str):
+    print("In test batch default implementation: ")
+
+    num_planes = 4
+    batch_sims = [
+        A430BatchSimulator(num_planes=num_planes, config={}, backend=backend)
+        for backend in [counting_backend, "numpy"]
+    ]
+    actions = np.tile([0.0, -1.998228, 0.689030, 0.0], (num_planes, 1))
+    actions[:, 0] = np.linspace(-1.0, 1.0, num_planes)
+
+    outputs = []
+    for batch_sim in batch_sims:
+        batch_sim.reset(fTAS=8)
+        for _ in range(5):
+            batch_sim.step(actions)
+        batch_sim.reset_planes([1, 2], fTAS=9)
+        outputs.append(batch_sim.step(actions).copy())
+
+    assert batch_sims[0].backend.update_cnt == 6 * num_planes
+    assert np.allclose(outputs[0], outputs[1])
+
+
+def test_gym_backend_by_name(counting_backend: str):
+    print("In test gym backend by name: ")
+
+    env = A430Gym(backend=counting_backend)
+    env.reset()
+    for _ in range(3):
+        env.step(np.array([0.0, -1.998228, 0.0, 0.689030]))
+
+    assert env.simulator.backend.update_cnt == 3
+
+
+def test_library_loaded_once():
+    print("In test library loaded once: ")
+
+    sims = [A430Simulator(config={}) for _ in range(3)]
+    assert all(sim.backend.a430_model is load_library() for sim in sims)
+    assert A430CtypesBackend().a430_model is load_library()
+
+
+@pytest.mark.parametrize("backend", ["ctypes", "numpy"])
+def test_simulator_close(backend: str):
+    print("In test simulator close: ")
+
+    with A430Simulator(config={}, backend=backend) as sim:
+        sim.reset(fTAS=8)
+        sim.step(fStickLon=-1.998228, fThrottle=0.689030)
+    assert not hasattr(sim, "planePtr")
+    sim.close()
+
+    # close之后可以重新reset
+    obs = sim.reset(fTAS=9)
+    assert np.isclose(obs["fTAS"], 9.0)
+    sim.close()
+
+    with A430BatchSimulator(num_planes=3, config={}, backend=backend) as batch_sim:
+        batch_sim.reset(fTAS=8)
+    assert len(batch_sim.planePtrs) == 0
+
+
+def test_dll_path_cached_and_validated(monkeypatch: pytest.MonkeyPatch, tmp_path):
+    print("In test dll path cached and validated: ")
+
+    assert get_dll_path() is get_dll_path()
+
+    monkeypatch.setenv("A430PY_LIB_PATH", str(tmp_path / "missing.so"))
+    get_dll_path.cache_clear()
+    try:
+        with pytest.raises(FileNotFoundError):
+            get_dll_path()
+    finally:
+        monkeypatch.delenv("A430PY_LIB_PATH")
+        get_dll_path.cache_clear()
@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+from a430py.simulator.a430_batch_sim import A430BatchSimulator
+from a430py.simulator.a430_sim import A430Simulator
+
+
+def test_batch_step_matches_single_simulator():
+    print("In test batch step: ")
+
+    num_planes = 3
+    custom_config = {"m": 0.5}
+    batch_sim = A430BatchSimulator(num_planes=num_planes, config=custom_config)
+    batch_sim.reset(dLon=120, dLat=30, fAlt=10, fTAS=np.array([8.0, 9.0, 10.0]))
+
+    sims = [A430Simulator(config=custom_config) for _ in range(num_planes)]
+    for sim, tas in zip(sims, [8.0, 9.0, 10.0]):
+        sim.reset(dLon=120, dLat=30, fAlt=10, fTAS=tas)
+
+    # 列顺序：fStickLat, fStickLon, fThrottle, fRudder
+    actions = np.array(
+        [
+            [0.0, -1.998228, 0.689030, 0.0],
+            [0.5, -1.0, 0.5, 0.0],
+            [-0.5, -3.0, 0.9, 0.1],
+        ]
+    )
+
+    for i in range(60):
+        batch_output = batch_sim.step(actions)
+        for plane_id, sim in enumerate(sims):
+            next_state = sim.step(
+                fStickLat=actions[plane_id, 0],
+                fStickLon=actions[plane_id, 1],
+                fThrottle=actions[plane_id, 2],
+                fRudder=actions[plane_id, 3],
+            )
+            assert np.allclose(
+                batch_output[plane_id],
+                [next_state[ky] for ky in batch_sim.output_fields],
+            )
+
+    assert batch_output.shape == (num_planes, len(batch_sim.output_fields))
+
+
+def test_batch_reset():
+    print("In test batch reset: ")
+
+    batch_sim = A430BatchSimulator(num_planes=2, config={})
+    obs = batch_sim.reset(dLon=120, dLat=30, fAlt=10, fTAS=8, fYaw=90)
+
+    assert np.allclose(obs[:, batch_sim.output_fields.index("fnpos")], 0.0)
+    assert np.allclose(obs[:, batch_sim.output_fields.index("fepos")], 0.0)
+
+
+@pytest.mark.parametrize("backend", ["ctypes", "numpy"])
+def test_batch_update_config(backend: str):
+    print("In test batch update config: ")
+
+    batch_sim = A430BatchSimulator(num_planes=3, config={}, backend=backend)
+    batch_sim.reset(fTAS=8)
+    default_m = batch_sim.get_config()["m"]
+
+    masses = np.array([0.5, default_m, 0.7])
+    assert batch_sim.update_config({"m": masses}).tolist() == [0, 2]
+    assert batch_sim.update_config({"m": masses}).tolist() == []
+    assert np.array_equal(batch_sim.plane_consts_array["m"], masses)
+
+    # 整体替换第2架飞机的参数
+    plane_consts = batch_sim.plane_consts_array[[0]]
+    aero_coeffs = batch_sim.aero_coeffs_array[[0]]
+    assert batch_sim.set_plane_params(plane_consts, aero_coeffs, [1]).tolist() == [1]
+
+    batch_sim.reset(fTAS=8)
+    sims = [A430Simulator(config={"m": m}, backend=backend) for m in [0.5, 0.5, 0.7]]
+    for sim in sims:
+        sim.reset(fTAS=8)
+
+    actions = np.tile([0.5, -1.0, 0.9, 0.1], (3, 1))
+    for i in range(20):
+        batch_output = batch_sim.step(actions)
+        for plane_id, sim in enumerate(sims):
+            next_state = sim.step(*actions[plane_id])
+            assert np.allclose(
+                batch_output[plane_id],
+                [next_state[ky] for ky in batch_sim.output_fields],
+            )
+
+
+def test_batch_snapshot_restore():
+    print("In test batch snapshot restore: ")
+
+    batch_sim = A430BatchSimulator(num_planes=3, config={}, backend="numpy")
+    batch_sim.reset(fTAS=np.array([8.0, 9.0, 10.0]))
+    actions = np.tile([0.5, -1.0, 0.9, 0.1], (3, 1))
+    for i in range(10):
+        batch_sim.step(actions)
+
+    snapshots = batch_sim.get_snapshots()
+    assert snapshots.shape[0] == 3
+    outputs = [batch_sim.step(actions).copy() for i in range(5)]
+
+    batch_sim.restore_snapshots(snapshots)
+    for output in outputs:
+        assert np.array_equal(batch_sim.step(actions), output)
+
+    # 从第1架飞机的状态分支出3个rollout
+    batch_sim.restore_snapshots(snapshots[0])
+    branch_output = batch_sim.step(actions)
+    assert np.array_equal(branch_output[1], outputs[0][0])
+    assert np.array_equal(branch_output[2], outputs[0][0])
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from a430py.simulator.a430_batch_sim import A430BatchSimulator
+from a430py.simulator.a430_config_sampler import (
+    PARAM_FIELDS,
+    ConfigSampler,
+    params_to_configs,
+    split_params,
+)
+from a430py.simulator.a430_sim import A430Simulator
+
+
+def test_sample_distributions():
+    print("In test sample distributions: ")
+
+    default_config = A430Simulator.get_default_config()
+    sampler = ConfigSampler(
+        distributions={
+            "m": dict(dist="uniform", scale=0.2),
+            "Cmq": dict(dist="normal", scale=0.1, high=-6.0),
+            "Jx": dict(dist="lognormal", scale=0.1),
+        },
+        base_config={"S": 0.05},
+        seed=0,
+    )
+    params = sampler.sample(10000)
+    assert params.shape == (10000, len(PARAM_FIELDS))
+    assert params.flags.c_contiguous
+
+    column = {ky: params[:, PARAM_FIELDS.index(ky)] for ky in PARAM_FIELDS}
+    assert np.all(column["S"] == 0.05)
+    assert np.all(column["CL0"] == default_config["CL0"])
+    assert np.all(np.abs(column["m"] - 0.1) <= 0.02 + 1e-12)
+    assert np.all(column["Cmq"] <= -6.0)
+    assert np.all(column["Jx"] > 0.0)
+    assert np.isclose(np.median(column["Jx"]), default_config["Jx"], rtol=0.01)
+
+    # 相同种子的采样结果相同
+    params_again = ConfigSampler(sampler.distributions, {"S": 0.05}, seed=0).sample(
+        10000
+    )
+    assert np.array_equal(params, params_again)
+
+
+def test_sample_invalid_spec():
+    print("In test sample invalid spec: ")
+
+    with pytest.raises(AssertionError):
+        ConfigSampler({"mass": dict(dist="uniform", scale=0.1)})
+    with pytest.raises(AssertionError):
+        ConfigSampler({"m": dict(dist="beta", scale=0.1)})
+
+
+def test_sampled_params_feed_simulators():
+    print("In test sampled params feed simulators: ")
+
+    num_planes = 4
+    sampler = ConfigSampler({"m": dict(dist="uniform", scale=0.3)}, seed=1)
+    params = sampler.sample(num_planes)
+    plane_consts, aero_coeffs = split_params(params)
+    assert plane_consts["m"].tolist() == params[:, PARAM_FIELDS.index("m")].tolist()
+
+    batch_sim = A430BatchSimulator(num_planes=num_planes, config={}, backend="numpy")
+    batch_sim.set_plane_params(plane_consts, aero_coeffs)
+    batch_sim.reset(fTAS=8)
+
+    sims = [
+        A430Simulator(config=config, backend="numpy")
+        for config in params_to_configs(params)
+    ]
+    for sim in sims:
+        sim.reset(fTAS=8)
+
+    actions = np.tile([0.5, -1.0, 0.9, 0.1], (num_planes, 1))
+    for i in range(20):
+        batch_output = batch_sim.step(actions)
+        for plane_id, sim in enumerate(sims):
+            next_state = sim.step(*actions[plane_id])
+            assert np.allclose(
+                batch_output[plane_id],
+                [next_state[ky] for ky in batch_sim.output_fields],
+                atol=1e-4,
+            )
@@ -0,0 +1,150 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from a430py.simulator.a430_batch_sim import A430BatchSimulator
+from a430py.simulator.a430_sim import A430Simulator
+
+PROJECT_ROOT_DIR = Path(__file__).parent.parent.parent
+STATE_KEYS = [
+    "fTAS",
+    "fAlpha",
+    "fBeta",
+    "fRoll",
+    "fPitch",
+    "fYaw",
+    "fP",
+    "fQ",
+    "fR",
+    "fAlt",
+]
+ACTION_KEYS = ["fStickLat", "fStickLon", "fThrottle", "fRudder"]
+
+
+@pytest.mark.parametrize(
+    "csv_path, eps",
+    [
+        (PROJECT_ROOT_DIR / "tests/simulator/trajectories/down_up_trace.csv", 1e-5),
+    ],
+)
+def test_numpy_single_step(csv_path: Path, eps: float):
+    print("In test numpy single step: ")
+
+    obs_df = pd.read_csv(csv_path)
+    observations = obs_df[STATE_KEYS].to_numpy()[:-1]
+    actions = obs_df[ACTION_KEYS].to_numpy()[:-1]
+
+    sim = A430Simulator(config={}, backend="numpy")
+    next_observations = sim.step_from_customized_observations(
+        observations, actions, update_times=2
+    )
+
+    expected = obs_df.iloc[1:]
+    for ky in STATE_KEYS:
+        assert np.allclose(
+            next_observations[:, sim.output_fields.index(ky)],
+            expected[ky].to_numpy(),
+            atol=eps,
+        )
+    assert np.allclose(
+        obs_df["fnpos"].to_numpy()[:-1]
+        + next_observations[:, sim.output_fields.index("fnpos")],
+        expected["fnpos"].to_numpy(),
+        atol=eps,
+    )
+
+
+@pytest.mark.parametrize(
+    "csv_path, eps",
+    [
+        (PROJECT_ROOT_DIR / "tests/simulator/trajectories/down_up_trace.csv", 1e-3),
+    ],
+)
+def test_numpy_trajectory(csv_path: Path, eps: float):
+    print("In test numpy trajectory: ")
+
+    obs_df = pd.read_csv(csv_path)
+    first_row = obs_df.iloc[0]
+
+    # 从轨迹的第一个状态出发开环仿真整条轨迹，误差会累积，容差放宽
+    sim = A430Simulator(config={}, backend="numpy")
+    sim.reset(dLon=120, dLat=30)
+    sim.set_aircraft_state(
+        vt=first_row["fTAS"],
+        alpha=first_row["fAlpha"],
+        beta=first_row["fBeta"],
+        phi=first_row["fRoll"],
+        theta=first_row["fPitch"],
+        psi=first_row["fYaw"],
+        p=first_row["fP"],
+        q=first_row["fQ"],
+        r=first_row["fR"],
+        h=first_row["fAlt"],
+    )
+    outputs = sim.rollout(obs_df[ACTION_KEYS].to_numpy())
+
+    for ky in STATE_KEYS + ["fnpos"]:
+        assert np.allclose(
+            outputs[:, sim.output_fields.index(ky)], obs_df[ky].to_numpy(), atol=eps
+        )
+
+
+@pytest.mark.parametrize("order", [1, 2, 3, 4])
+def test_numpy_batch_matches_single_simulator(order: int):
+    print("In test numpy batch: ")
+
+    num_planes = 3
+    custom_config = {"m": 0.12}
+    batch_sim = A430BatchSimulator(
+        num_planes=num_planes, config=custom_config, backend="numpy"
+    )
+    batch_sim.order = order
+    batch_sim.reset(dLon=120, dLat=30, fAlt=10, fTAS=np.array([8.0, 9.0, 10.0]))
+
+    sims = []
+    for tas in [8.0, 9.0, 10.0]:
+        sim = A430Simulator(config=custom_config, backend="numpy")
+        sim.order = order
+        sim.reset(dLon=120, dLat=30, fAlt=10, fTAS=tas)
+        sims.append(sim)
+
+    # 列顺序：fStickLat, fStickLon, fThrottle, fRudder
+    actions = np.array(
+        [
+            [0.0, -1.998228, 0.689030, 0.0],
+            [0.5, -1.0, 0.5, 0.0],
+            [-0.5, -3.0, 0.9, 0.1],
+        ]
+    )
+
+    for i in range(60):
+        batch_output = batch_sim.step(actions)
+        for plane_id, sim in enumerate(sims):
+            next_state = sim.step(*actions[plane_id])
+            assert np.allclose(
+                batch_output[plane_id],
+                [next_state[ky] for ky in batch_sim.output_fields],
+            )
+
+    assert np.all(np.isfinite(batch_output))
+
+
+def test_numpy_batch_many_planes():
+    print("In test numpy batch with many planes: ")
+
+    num_planes = 10000
+    batch_sim = A430BatchSimulator(num_planes=num_planes, config={}, backend="numpy")
+    obs = batch_sim.reset(dLon=120, dLat=30, fAlt=10, fTAS=8, fYaw=90)
+    assert obs.shape == (num_planes, len(batch_sim.output_fields))
+
+    actions = np.tile([0.0, -1.998228, 0.689030, 0.0], (num_planes, 1))
+    actions[:, 0] = np.linspace(-1.0, 1.0, num_planes)
+    for _ in range(10):
+        obs = batch_sim.step(actions)
+
+    assert np.all(np.isfinite(obs))
+    # 副翼指令关于0对称，滚转角也关于0对称
+    roll = obs[:, batch_sim.output_fields.index("fRoll")]
+    assert np.allclose(roll, -roll[::-1], atol=1e-5)
@@ -0,0 +1,32 @@
+import numpy as np
+
+from a430py.simulator.a430_oracle import step_from_customized_observations
+from a430py.simulator.a430_sim import A430Simulator
+
+
+def test_parallel_matches_single_process():
+    print("In test parallel oracle: ")
+
+    rng = np.random.default_rng(0)
+    num_samples = 50
+    observations = np.column_stack(
+        [
+            rng.uniform(6.0, 10.0, num_samples),
+            rng.uniform(-5.0, 5.0, (num_samples, 8)),
+            rng.uniform(1.0, 5.0, num_samples),
+        ]
+    )
+    actions = rng.uniform(-1.0, 1.0, (num_samples, 4))
+
+    next_observations = step_from_customized_observations(
+        observations, actions, update_times=2, num_workers=1
+    )
+    next_observations_parallel = step_from_customized_observations(
+        observations, actions, update_times=2, num_workers=2, chunk_size=16
+    )
+
+    assert next_observations_parallel.shape == (
+        num_samples,
+        len(A430Simulator(config={}).output_fields),
+    )
+    assert np.array_equal(next_observations, next_observations_parallel)
@@ -4,7 +4,11 @@ import numpy as np
 import pandas as pd
 import pytest
 
+from a430py.simulator.a430_oracle import (
+    step_from_customized_observations as oracle_step,
+)
 from a430py.simulator.a430_sim import A430Simulator
+from a430py.simulator.utils.a430_trajectory import TrajectoryRecorder
 
 PROJECT_ROOT_DIR = Path(__file__).parent.parent.parent
 
@@ -112,6 +116,381 @@ def test_reset_simulator():
         )
 
 
+def test_zero_copy_step():
+    print("In test zero copy step: ")
+
+    sim = A430Simulator(config={})
+    sim_zero_copy = A430Simulator(config={}, zero_copy=True)
+
+    sim.reset(dLon=120, dLat=30, fAlt=10, fTAS=8, fYaw=90)
+    obs_view = sim_zero_copy.reset(dLon=120, dLat=30, fAlt=10, fTAS=8, fYaw=90)
+
+    for i in range(60):
+        next_state = sim.step(
+            fStickLat=0.0,
+            fStickLon=-1.998228,
+            fThrottle=0.689030,
+            fRudder=0,
+        )
+        next_state_view = sim_zero_copy.step(
+            fStickLat=0.0,
+            fStickLon=-1.998228,
+            fThrottle=0.689030,
+            fRudder=0,
+        )
+
+        # 返回的始终是同一块缓冲区
+        assert next_state_view is obs_view
+        for ky in sim.output_fields:
+            assert next_state[ky] == next_state_view[ky]
+
+
+@pytest.mark.parametrize("record_every", [1, 7])
+def test_rollout(record_every: int):
+    print("In test rollout: ")
+
+    num_ticks = 60
+    actions = np.zeros((num_ticks, 4))
+    actions[:, 1] = -1.998228
+    actions[:, 2] = 0.689030
+    actions[20:40, 0] = 0.5  # 中间一段压杆
+
+    sim = A430Simulator(config={})
+    sim_rollout = A430Simulator(config={})
+    sim.reset(dLon=120, dLat=30, fAlt=10, fTAS=8, fYaw=90)
+    sim_rollout.reset(dLon=120, dLat=30, fAlt=10, fTAS=8, fYaw=90)
+
+    trajectory = sim_rollout.rollout(actions, record_every=record_every)
+    assert trajectory.shape == (num_ticks // record_every, len(sim.output_fields))
+
+    for tick in range(num_ticks):
+        next_state = sim.step(
+            fStickLat=actions[tick, 0],
+            fStickLon=actions[tick, 1],
+            fThrottle=actions[tick, 2],
+            fRudder=actions[tick, 3],
+        )
+        if (tick + 1) % record_every == 0:
+            assert np.allclose(
+                trajectory[(tick + 1) // record_every - 1],
+                [next_state[ky] for ky in sim.output_fields],
+            )
+
+    final_state = sim_rollout.get_aircraft_output()
+    for ky in sim.output_fields:
+        assert final_state[ky] == next_state[ky]
+
+
+@pytest.mark.parametrize("num_ticks", [0, 3])
+def test_rollout_without_records(tmp_path: Path, num_ticks: int):
+    print("In test rollout without records: ")
+
+    # 拍数为0或小于record_every时不记录输出，但飞机照常推进
+    recorder = TrajectoryRecorder(tmp_path / "trace.a430traj")
+    sim = A430Simulator(config={}, recorder=recorder)
+    sim_step = A430Simulator(config={})
+    sim.reset(fTAS=8)
+    sim_step.reset(fTAS=8)
+    num_recorded = len(recorder)
+
+    actions = np.tile([0.0, -1.998228, 0.689030, 0.0], (num_ticks, 1))
+    trajectory = sim.rollout(actions, record_every=5)
+    assert trajectory.shape == (0, len(sim.output_fields))
+    assert sim.tick_cnt == num_ticks
+    assert len(recorder) == num_recorded
+
+    state = sim_step.get_aircraft_output()
+    for action in actions:
+        state = sim_step.step(*action)
+    assert sim.get_aircraft_output() == state
+
+
+def test_in_place_reset():
+    print("In test in place reset: ")
+
+    sim = A430Simulator(config={})
+    init_state = sim.reset(dLon=120, dLat=30, fAlt=10, fTAS=8, fYaw=90)
+    plane_ptr = sim.planePtr
+
+    for episode in range(3):
+        for i in range(30):
+            sim.step(fStickLat=0.5, fStickLon=-1.0, fThrottle=0.9, fRudder=0.1)
+
+        state = sim.reset(dLon=120, dLat=30, fAlt=10, fTAS=8, fYaw=90, in_place=True)
+        assert sim.planePtr == plane_ptr
+
+        # dll不能重置位置，其余字段回到初始值
+        for ky in sim.output_fields:
+            if ky not in ["dLon", "dLat", "fnpos", "fepos"]:
+                assert np.allclose(state[ky], init_state[ky], atol=1e-4), ky
+
+    # 初始状态改变时退化为重新创建飞机
+    sim.reset(dLon=120, dLat=30, fAlt=10, fTAS=9, fYaw=90, in_place=True)
+    assert sim.get_aircraft_output()["fnpos"] == 0.0
+
+
+@pytest.mark.parametrize("backend", ["ctypes", "numpy"])
+def test_step_array(backend: str):
+    print("In test step array: ")
+
+    sim = A430Simulator(config={}, backend=backend)
+    sim.reset(fTAS=8)
+    sim_array = A430Simulator(config={}, backend=backend)
+    sim_array.reset(fTAS=8)
+
+    # 列顺序：fStickLat, fStickLon, fThrottle, fRudder
+    actions = np.array([[0.5, -1.0, 0.9, 0.1], [0.0, -1.998228, 0.689030, 0.0]])
+    for i in range(30):
+        action = actions[i % 2]
+        next_state = sim.step(*action.astype(np.float32))
+        output = sim_array.step_array(action)
+        assert output is sim_array.aircraft_output_array
+        for ky in sim.output_fields:
+            assert output[ky] == next_state[ky], ky
+    assert sim_array.tick_cnt == 30
+
+    # 飞机重建后重新绑定
+    sim.reset(fTAS=8)
+    sim_array.reset(fTAS=8)
+    assert sim_array.step_array(actions[0])["fTAS"] == sim.step(*actions[0])["fTAS"]
+
+
+@pytest.mark.parametrize("backend", ["ctypes", "numpy"])
+def test_update_config(backend: str):
+    print("In test update config: ")
+
+    sim = A430Simulator(config={}, backend=backend)
+    sim.reset(fTAS=8)
+    default_m = sim.get_config()["m"]
+
+    # 取值未变化时不做任何事
+    assert sim.update_config({"m": default_m}) == []
+    assert not sim.set_plane_params(sim.plane_consts, sim.aero_coeffs)
+
+    assert sim.update_config({"m": 0.5, "Cmq": -10.0, "S": sim.plane_consts.S}) == [
+        "m",
+        "Cmq",
+    ]
+    assert sim.get_config()["m"] == 0.5
+    if sim.backend.can_set_params:
+        # 不重建飞机，参数立即生效
+        assert sim.get_plane_const()["m"] == 0.5
+
+    sim.reset(fTAS=8, in_place=True)
+    sim_new = A430Simulator(config={"m": 0.5, "Cmq": -10.0}, backend=backend)
+    sim_new.reset(fTAS=8)
+    for i in range(20):
+        state = sim.step(fStickLat=0.5, fStickLon=-1.0, fThrottle=0.9, fRudder=0.1)
+        state_new = sim_new.step(
+            fStickLat=0.5, fStickLon=-1.0, fThrottle=0.9, fRudder=0.1
+        )
+    for ky in sim.output_fields:
+        if ky not in ["dLon", "dLat", "fnpos", "fepos"]:
+            assert np.allclose(state[ky], state_new[ky], atol=1e-4), ky
+
+
+def test_snapshot_restore():
+    print("In test snapshot restore: ")
+
+    sim = A430Simulator(config={}, backend="numpy")
+    sim.reset(fTAS=8)
+    for i in range(10):
+        sim.step(fStickLat=0.5, fStickLon=-1.0, fThrottle=0.9, fRudder=0.1)
+
+    snapshot = sim.get_snapshot()
+    states = [
+        sim.step(fStickLat=0.0, fStickLon=-2.0, fThrottle=0.7, fRudder=0.0)
+        for i in range(20)
+    ]
+
+    # 同一架飞机与另一架飞机（参数相同）从快照继续仿真，结果逐位相同（含位置）
+    sim_other = A430Simulator(config={}, backend="numpy")
+    sim_other.reset(fTAS=12)
+    for target in [sim, sim_other]:
+        target.restore(snapshot)
+        for state in states:
+            next_state = target.step(
+                fStickLat=0.0, fStickLon=-2.0, fThrottle=0.7, fRudder=0.0
+            )
+            assert next_state == state
+
+    # 原生库没有读写完整状态的接口
+    with pytest.raises(AssertionError):
+        A430Simulator(config={}).get_snapshot()
+
+
+def test_reset_cache():
+    print("In test reset cache: ")
+
+    sim = A430Simulator(config={}, backend="numpy", reset_cache_size=2)
+    sim_fresh = A430Simulator(config={}, backend="numpy")
+    sim.reset(fTAS=8)
+    for fTAS in [8, 9, 8, 10, 8, 9]:
+        for i in range(10):
+            sim.step(fStickLat=0.5, fStickLon=-1.0, fThrottle=0.9, fRudder=0.1)
+        # 命中缓存时不新建飞机，结果与新建飞机逐位相同（含位置）
+        state = sim.reset(fTAS=fTAS)
+        state_fresh = sim_fresh.reset(fTAS=fTAS)
+        assert state == state_fresh
+        for i in range(10):
+            assert sim.step(
+                fStickLat=0.0, fStickLon=-2.0, fThrottle=0.7, fRudder=0.0
+            ) == sim_fresh.step(
+                fStickLat=0.0, fStickLon=-2.0, fThrottle=0.7, fRudder=0.0
+            )
+    # LRU：容量为2，最近使用的是fTAS=8、9，fTAS=10已被淘汰
+    assert len(sim._reset_cache) == 2
+    profiler = sim.enable_profiling()
+    sim.reset(fTAS=8)
+    sim.reset(fTAS=9)
+    assert profiler.stats()["backend.create"]["count"] == 0
+    sim.reset(fTAS=10)
+    assert profiler.stats()["backend.create"]["count"] == 1
+    sim.disable_profiling()
+
+    # set_config后缓存失效，按新参数新建飞机
+    sim.set_config({"m": 0.5})
+    assert len(sim._reset_cache) == 0
+    state = sim.reset(fTAS=10)
+    sim_fresh = A430Simulator(config={"m": 0.5}, backend="numpy")
+    assert state == sim_fresh.reset(fTAS=10)
+    assert sim.get_plane_const()["m"] == 0.5
+
+
+def test_reset_cache_without_snapshot():
+    print("In test reset cache without snapshot: ")
+
+    # ctypes后端不支持快照，缓存不生效，reset结果与不使用缓存时相同（含位置）
+    sim = A430Simulator(config={}, reset_cache_size=4)
+    sim_fresh = A430Simulator(config={})
+    assert not sim.backend.can_snapshot
+    sim.reset(fTAS=8)
+    sim_fresh.reset(fTAS=8)
+    for episode in range(3):
+        for i in range(30):
+            sim.step(fStickLat=0.5, fStickLon=-1.0, fThrottle=0.9, fRudder=0.1)
+            sim_fresh.step(fStickLat=0.5, fStickLon=-1.0, fThrottle=0.9, fRudder=0.1)
+        state = sim.reset(fTAS=8)
+        assert state == sim_fresh.reset(fTAS=8)
+        assert state["fnpos"] == 0.0 and state["fepos"] == 0.0
+    assert len(sim._reset_cache) == 0
+
+
+@pytest.mark.parametrize("backend", ["ctypes", "numpy"])
+def test_step_from_customized_observations_empty(backend: str):
+    print("In test step from customized observations empty: ")
+
+    # 未创建飞机、已有飞机时，空批次都返回(0, 22)的数组
+    sim = A430Simulator(config={}, backend=backend)
+    next_states = sim.step_from_customized_observations(
+        np.zeros((0, 10)), np.zeros((0, 4))
+    )
+    assert next_states.shape == (0, len(sim.output_fields))
+
+    state = sim.reset(fTAS=8)
+    next_states = sim.step_from_customized_observations(
+        np.zeros((0, 10)), np.zeros((0, 4)), in_place_reset=True
+    )
+    assert next_states.shape == (0, len(sim.output_fields))
+    assert sim.get_aircraft_output() == state
+    assert oracle_step(np.zeros((0, 10)), np.zeros((0, 4)), backend=backend).shape == (
+        0,
+        len(sim.output_fields),
+    )
+
+
+def test_step_from_customized_observation_in_place():
+    print("In test step from customized observation in place: ")
+
+    sim = A430Simulator(config={})
+    sim_in_place = A430Simulator(config={})
+
+    for i in range(5):
+        kwargs = dict(
+            obs_vt=8.0 + i,
+            obs_alpha=5.0,
+            obs_theta=5.0 + i,
+            obs_q=1.0,
+            obs_h=2.0,
+            act_fStickLon=-1.998228,
+            act_fThrottle=0.689030,
+            update_times=2,
+        )
+        next_obs = sim.step_from_customized_observation(**kwargs)
+        next_obs_in_place = sim_in_place.step_from_customized_observation(
+            in_place_reset=True, **kwargs
+        )
+        for ky in sim.output_fields:
+            if ky not in ["dLon", "dLat"]:
+                assert np.allclose(next_obs[ky], next_obs_in_place[ky], atol=1e-4), ky
+
+
+@pytest.mark.parametrize("backend", ["ctypes", "numpy"])
+@pytest.mark.parametrize("in_place_reset", [False, True])
+def test_step_from_customized_observations(in_place_reset: bool, backend: str):
+    print("In test step from customized observations: ")
+
+    rng = np.random.default_rng(0)
+    num_samples = 20
+    observations = np.column_stack(
+        [
+            rng.uniform(6.0, 10.0, num_samples),  # vt
+            rng.uniform(-5.0, 5.0, (num_samples, 8)),  # alpha ~ r
+            rng.uniform(1.0, 5.0, num_samples),  # h
+        ]
+    )
+    actions = np.column_stack(
+        [
+            rng.uniform(-1.0, 1.0, num_samples),
+            rng.uniform(-3.0, 0.0, num_samples),
+            rng.uniform(0.0, 1.0, num_samples),
+            rng.uniform(-1.0, 1.0, num_samples),
+        ]
+    )
+
+    sim = A430Simulator(config={}, backend=backend)
+    next_observations = sim.step_from_customized_observations(
+        observations, actions, update_times=2, in_place_reset=in_place_reset
+    )
+    assert next_observations.shape == (num_samples, len(sim.output_fields))
+
+    for i in range(num_samples):
+        next_obs = sim.step_from_customized_observation(
+            *observations[i], *actions[i], update_times=2
+        )
+        for j, ky in enumerate(sim.output_fields):
+            if not (in_place_reset and ky in ["dLon", "dLat"]):
+                assert np.allclose(next_observations[i, j], next_obs[ky], atol=1e-4)
+
+
+@pytest.mark.parametrize("backend", ["ctypes", "numpy"])
+def test_step_from_customized_observations_keeps_plane(backend: str):
+    print("In test step from customized observations keeps plane: ")
+
+    # 样本在临时飞机上计算，调用方的飞机与初始状态不受影响
+    sim = A430Simulator(config={}, backend=backend)
+    sim_ref = A430Simulator(config={}, backend=backend)
+    for target in [sim, sim_ref]:
+        target.reset(fTAS=8)
+        for i in range(10):
+            target.step(fStickLat=0.5, fStickLon=-1.0, fThrottle=0.9, fRudder=0.1)
+    plane_key = sim._plane_key
+
+    observations = np.tile([8.0, 5.0, 0, 0, 5.0, 0, 0, 0, 0, 2.0], (5, 1))
+    actions = np.tile([0.0, -2.0, 0.7, 0.0], (5, 1))
+    for in_place_reset in [False, True]:
+        sim.step_from_customized_observations(
+            observations, actions, update_times=2, in_place_reset=in_place_reset
+        )
+    assert sim._plane_key == plane_key
+    assert sim.get_aircraft_output() == sim_ref.get_aircraft_output()
+    for i in range(10):
+        assert sim.step(fStickLon=-2.0, fThrottle=0.7) == sim_ref.step(
+            fStickLon=-2.0, fThrottle=0.7
+        )
+    assert sim.reset(fTAS=8, in_place=True) == sim_ref.reset(fTAS=8, in_place=True)
+
+
 @pytest.mark.parametrize(
     "csv_path, eps",
     [
@@ -201,6 +580,64 @@ def test_simulator_single_step(csv_path: Path, eps: float):
             )
 
 
+@pytest.mark.parametrize(
+    "csv_path, eps",
+    [
+        (PROJECT_ROOT_DIR / "tests/simulator/trajectories/down_up_trace.csv", 1e-7),
+    ],
+)
+def test_simulator_single_step_batch(csv_path: Path, eps: float):
+    print("In test single step batch: ")
+
+    obs_df = pd.read_csv(csv_path)
+    observations = obs_df[
+        [
+            "fTAS",
+            "fAlpha",
+            "fBeta",
+            "fRoll",
+            "fPitch",
+            "fYaw",
+            "fP",
+            "fQ",
+            "fR",
+            "fAlt",
+        ]
+    ].to_numpy()[:-1]
+    actions = obs_df[["fStickLat", "fStickLon", "fThrottle", "fRudder"]].to_numpy()[:-1]
+
+    sim = A430Simulator(config={})
+    next_observations = sim.step_from_customized_observations(
+        observations, actions, update_times=2
+    )
+
+    expected = obs_df.iloc[1:]
+    for ky in [
+        "fTAS",
+        "fAlpha",
+        "fBeta",
+        "fRoll",
+        "fPitch",
+        "fYaw",
+        "fP",
+        "fQ",
+        "fR",
+        "fAlt",
+    ]:
+        assert np.allclose(
+            next_observations[:, sim.output_fields.index(ky)],
+            expected[ky].to_numpy(),
+            atol=eps,
+        )
+    for ky in ["fnpos", "fepos"]:
+        assert np.allclose(
+            obs_df[ky].to_numpy()[:-1]
+            + next_observations[:, sim.output_fields.index(ky)],
+            expected[ky].to_numpy(),
+            atol=eps,
+        )
+
+
 if __name__ == "__main__":
     test_init_simulator_from_customized_config()
     test_reset_simulator()
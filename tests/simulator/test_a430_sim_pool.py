@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from a430py.simulator.a430_backend import A430NumpyBackend
+from a430py.simulator.a430_sim_pool import A430SimulatorPool
+
+
+def test_pool_reuses_planes():
+    print("In test simulator pool: ")
+
+    # ctypes后端显式开启in_place_reset时，归还不新建飞机
+    pool = A430SimulatorPool(size=2, config={}, fTAS=8.0, in_place_reset=True)
+    plane_ptrs = {sim.planePtr for sim in pool.simulators}
+
+    with pool.simulator() as sim:
+        init_state = sim.get_aircraft_output()
+        for i in range(30):
+            sim.step(fStickLat=0.5, fStickLon=-1.0, fThrottle=0.9, fRudder=0.1)
+
+    with pool.simulator() as sim_1, pool.simulator() as sim_2:
+        for sim in [sim_1, sim_2]:
+            state = sim.get_aircraft_output()
+            assert np.allclose(state["fTAS"], init_state["fTAS"], atol=1e-4)
+            assert np.allclose(state["fRoll"], init_state["fRoll"], atol=1e-4)
+
+    assert {sim.planePtr for sim in pool.simulators} == plane_ptrs
+
+
+def test_pool_parallel():
+    print("In test simulator pool parallel: ")
+
+    pool = A430SimulatorPool(size=4, config={}, fTAS=8.0)
+
+    def run(fStickLat: float) -> float:
+        with pool.simulator() as sim:
+            for i in range(30):
+                next_state = sim.step(
+                    fStickLat=fStickLat, fStickLon=-1.998228, fThrottle=0.689030
+                )
+            return next_state["fRoll"]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        rolls = list(executor.map(run, [0.0, 0.5, 0.0, 0.5] * 4))
+
+    assert np.allclose(rolls[0::2], rolls[0])
+    assert np.allclose(rolls[1::2], rolls[1])
+
+
+@pytest.mark.parametrize(
+    "backend, pool_kwargs",
+    [("ctypes", {}), ("numpy", {}), ("numpy", {"in_place_reset": True})],
+)
+def test_pool_release_restores_initial_state(backend: str, pool_kwargs: dict):
+    print("In test simulator pool release restores initial state: ")
+
+    # 默认重新创建飞机或恢复快照，包括位置在内完全回到初始状态
+    pool = A430SimulatorPool(
+        size=1, config={}, fTAS=8.0, backend=backend, **pool_kwargs
+    )
+    with pool.simulator() as sim:
+        init_state = sim.get_aircraft_output()
+        for i in range(30):
+            sim.step(fStickLat=0.5, fStickLon=-1.0, fThrottle=0.9, fRudder=0.1)
+        assert sim.get_aircraft_output()["fepos"] != init_state["fepos"]
+
+    with pool.simulator() as sim:
+        assert sim.get_aircraft_output() == init_state
+        assert sim.tick_cnt == 0
+
+
+def test_pool_rejects_shared_backend():
+    print("In test simulator pool rejects shared backend: ")
+
+    with pytest.raises(AssertionError):
+        A430SimulatorPool(size=2, config={}, backend=A430NumpyBackend())
+    pool = A430SimulatorPool(size=1, config={}, backend=A430NumpyBackend())
+    assert len(pool.simulators) == 1
@@ -0,0 +1,87 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from a430py.env.a430_gym import A430Gym
+from a430py.simulator.a430_sim import A430Simulator
+from a430py.simulator.utils.a430_trajectory import (
+    TrajectoryRecorder,
+    load_trajectory,
+    read_trajectory_header,
+    split_episodes,
+)
+
+
+@pytest.mark.parametrize("backend", ["ctypes", "numpy"])
+def test_recorder_matches_simulator(tmp_path: Path, backend: str):
+    print("In test recorder matches simulator: ")
+
+    path = tmp_path / "trace.a430traj"
+    expected = []
+    with TrajectoryRecorder(path, chunk_size=7) as recorder:
+        sim = A430Simulator(config={}, backend=backend, recorder=recorder)
+        for _ in range(2):
+            expected.append(sim.reset(fTAS=8))
+            for _ in range(10):
+                expected.append(sim.step(fStickLon=-1.998228, fThrottle=0.689030))
+        sim.close()
+
+    assert read_trajectory_header(path)["step_time"] == 0.01
+
+    records = load_trajectory(path)
+    assert isinstance(records, np.memmap)
+    assert len(records) == 22
+    for ky in sim.output_fields:
+        assert np.allclose(records[ky], [obs[ky] for obs in expected])
+    assert np.allclose(records["time"][:11], np.arange(11) * 0.01)
+    assert np.all(records["fThrottle"][[0, 11]] == 0.0)
+    assert np.allclose(records["fThrottle"][1:11], 0.689030)
+
+    episodes = split_episodes(records)
+    assert [len(episode) for episode in episodes] == [11, 11]
+
+
+def test_recorder_rollout_and_append(tmp_path: Path):
+    print("In test recorder rollout and append: ")
+
+    path = tmp_path / "trace.a430traj"
+    actions = np.tile([0.0, -1.998228, 0.689030, 0.0], (20, 1))
+    actions[10:, 0] = 0.5
+
+    with TrajectoryRecorder(path, chunk_size=8) as recorder:
+        sim = A430Simulator(config={}, backend="numpy", recorder=recorder)
+        sim.reset(fTAS=8)
+        outputs = sim.rollout(actions, record_every=2)
+
+    # 追加一个episode
+    with TrajectoryRecorder(path, append=True) as recorder:
+        sim.recorder = recorder
+        sim.reset(fTAS=8)
+        sim.step(*actions[0])
+        assert len(recorder) == 1 + 10 + 2
+
+    records = load_trajectory(path)
+    assert len(records) == 1 + 10 + 2
+    assert np.allclose(records["time"][1:11], np.arange(2, 21, 2) * 0.01)
+    for i, ky in enumerate(sim.output_fields):
+        assert np.allclose(records[ky][1:11], outputs[:, i])
+    assert np.allclose(records["fStickLat"][1:11], actions[1::2, 0])
+    assert [len(episode) for episode in split_episodes(records)] == [11, 2]
+
+
+def test_gym_recorder(tmp_path: Path):
+    print("In test gym recorder: ")
+
+    path = tmp_path / "trace.a430traj"
+    with TrajectoryRecorder(path) as recorder:
+        env = A430Gym(frame_skip=3, recorder=recorder)
+        env.reset()
+        for _ in range(4):
+            obs, *_ = env.step(np.array([0.0, -1.998228, 0.0, 0.689030]))
+        env.close()
+
+    records = load_trajectory(path)
+    assert len(records) == 1 + 4 * 3
+    assert np.isclose(records["time"][-1], 0.12)
+    assert np.allclose([records[ky][-1] for ky in env.observation_keys], obs, atol=1e-6)
@@ -0,0 +1,128 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from a430py.simulator.a430_sim import A430Simulator
+from a430py.simulator.a430_trim import G, TrimSolver, TrimTable
+
+
+def test_solve_reference_trim():
+    print("In test solve reference trim: ")
+
+    solver = TrimSolver(backend="numpy")
+    trims, converged = solver.solve(8.0, 2.0)
+    assert converged.tolist() == [True]
+    assert np.allclose(trims[0], [-1.998228, 0.689030, 5.344264], atol=1e-4)
+
+    # 以配平量仿真，速度、高度、姿态基本不变
+    stick_lon, throttle, alpha = trims[0]
+    sim = A430Simulator(config={}, backend="numpy")
+    sim.reset(fTAS=8, fAlt=2)
+    sim.set_aircraft_state(vt=8.0, alpha=alpha, theta=alpha, h=2.0)
+    for i in range(200):
+        state = sim.step(fStickLon=stick_lon, fThrottle=throttle)
+    assert abs(state["fTAS"] - 8.0) < 1e-3
+    assert abs(state["fAlt"] - 2.0) < 1e-3
+    assert abs(state["fAlpha"] - alpha) < 1e-3
+
+
+def test_solve_batch():
+    print("In test solve batch: ")
+
+    solver = TrimSolver(backend="numpy")
+    tas = np.array([6.0, 8.0, 12.0])
+    trims, converged = solver.solve(tas, 5.0)
+    assert np.all(converged)
+    for i in range(len(tas)):
+        trim, _ = solver.solve(tas[i], 5.0)
+        assert np.allclose(trims[i], trim[0], atol=1e-6)
+    # 速度越大，所需迎角越小
+    assert np.all(np.diff(trims[:, 2]) < 0)
+
+
+@pytest.mark.parametrize("backend", ["ctypes", "numpy"])
+def test_residuals_match_single_step(backend: str):
+    print("In test residuals match single step: ")
+
+    # 批量残差(ctypes上原地复用飞机)与逐点新建飞机的step_from_customized_observation一致
+    solver = TrimSolver(backend=backend)
+    trims = np.array([[-2.0, 0.7, 5.3], [-1.5, 0.5, 3.0], [-2.5, 0.9, 8.0]])
+    tas = np.array([8.0, 10.0, 6.0])
+    alt = np.array([2.0, 5.0, 0.0])
+    residuals = solver.residuals(trims, tas, alt)
+
+    sim = A430Simulator(config={}, backend=backend)
+    for i in range(len(trims)):
+        stick_lon, throttle, alpha = trims[i]
+        output = sim.step_from_customized_observation(
+            obs_vt=tas[i],
+            obs_alpha=alpha,
+            obs_theta=alpha,
+            obs_h=alt[i],
+            act_fStickLon=stick_lon,
+            act_fThrottle=throttle,
+            update_times=solver.update_times,
+        )
+        pitch = np.deg2rad(output["fPitch"])
+        expected = [
+            output["fAccBx"] - G * np.sin(pitch),
+            output["fAccBz"] + G * np.cos(pitch),
+            output["fQ"],
+        ]
+        assert np.allclose(residuals[i], expected, atol=1e-5)
+
+
+def test_trim_table(tmp_path: Path):
+    print("In test trim table: ")
+
+    solver = TrimSolver(backend="numpy")
+    tas_grid = np.linspace(6.0, 12.0, 7)
+    alt_grid = np.array([0.0, 10.0])
+    table = solver.trim_table(tas_grid, alt_grid, cache_dir=tmp_path)
+    assert solver.trim_table(tas_grid, alt_grid, cache_dir=tmp_path) is table
+    assert solver.get_table_path(tas_grid, alt_grid, tmp_path).exists()
+
+    # 网格点上与直接求解一致，网格点之间为插值，与求解结果接近
+    trims, _ = solver.solve([8.0, 8.5], [10.0, 5.0])
+    assert np.allclose(table.lookup(8.0, 10.0), trims[0])
+    assert np.allclose(table.lookup(8.5, 5.0), trims[1], rtol=0.02)
+    assert table.lookup(tas_grid[:, None], alt_grid).shape == (7, 2, 3)
+
+    # 新的求解器从磁盘加载，不再求解
+    solver_new = TrimSolver(backend="numpy")
+    solver_new.solve = None
+    table_loaded = solver_new.trim_table(tas_grid, alt_grid, cache_dir=tmp_path)
+    assert np.array_equal(table_loaded.trims, table.trims)
+    assert table_loaded.config_hash == table.config_hash
+
+    # 参数改变后哈希不同，重新求解
+    solver.simulator.set_config({"m": 0.12})
+    table_heavy = solver.trim_table(tas_grid, alt_grid, cache_dir=tmp_path)
+    assert table_heavy.config_hash != table.config_hash
+    assert np.all(table_heavy.trims[..., 1] > table.trims[..., 1])
+    assert len(list(tmp_path.glob("trim_*.npz"))) == 2
+
+    # 其他网格写入另一个文件，不覆盖已有的配平表
+    table_coarse = TrimSolver(backend="numpy").trim_table(
+        tas_grid[::2], alt_grid, cache_dir=tmp_path
+    )
+    assert len(list(tmp_path.glob("trim_*.npz"))) == 3
+    assert np.array_equal(
+        TrimTable.load(solver_new.get_table_path(tas_grid, alt_grid, tmp_path)).trims,
+        table.trims,
+    )
+    assert np.allclose(table_coarse.trims, table.trims[::2])
+
+    # 后端、求解设置不同时哈希不同
+    assert TrimSolver(backend="ctypes").get_config_hash() != table.config_hash
+    assert TrimSolver(backend="numpy", update_times=3).get_config_hash() != (
+        table.config_hash
+    )
+    solver_profiled = TrimSolver(backend="numpy")
+    solver_profiled.simulator.enable_profiling()
+    assert solver_profiled.get_config_hash() == table.config_hash
+
+    # 手工构造的表
+    table_manual = TrimTable([0.0, 1.0], [0.0], np.array([[[0.0] * 3], [[1.0] * 3]]))
+    assert np.allclose(table_manual.lookup(0.25, 0.0), 0.25)
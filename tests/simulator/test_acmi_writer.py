@@ -0,0 +1,94 @@
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+from a430py.simulator.a430_batch_sim import A430BatchSimulator
+from a430py.simulator.utils.acmi_writer import AcmiBatchWriter
+from a430py.simulator.utils.acmiLogger import AcmiLogger
+
+
+def test_acmi_batch_writer(tmp_path: Path):
+    print("In test acmi batch writer: ")
+
+    num_planes = 3
+    batch_sim = A430BatchSimulator(num_planes=num_planes, config={}, backend="numpy")
+    outputs = batch_sim.reset(fTAS=8, fYaw=np.array([0.0, 90.0, 45.0]))
+
+    path = tmp_path / "trace.acmi"
+    with AcmiBatchWriter(path, num_planes=num_planes, pilot="P{}") as writer:
+        writer.write_frame(0.0, outputs)
+        # 与上一帧完全相同的帧不写出
+        writer.write_frame(0.01, outputs)
+        actions = np.tile([0.0, -1.998228, 0.689030, 0.0], (num_planes, 1))
+        for _ in range(2):
+            outputs = batch_sim.step(actions)
+        writer.write_frame(0.02, outputs)
+        writer.remove_planes([1])
+        writer.write_frame(0.03, outputs + 1.0)
+
+    lines = path.read_text().splitlines()
+    assert lines[:3] == ["FileType=text/acmi/tacview", "FileVersion=2.1", "#0.00"]
+    assert lines[3].startswith("1,T=120.0000000|30.0000000|")
+    assert lines[3].endswith(",Pilot=P0,Coalition=Allies,Color=Red,Name=A430")
+    assert "#0.01" not in lines
+
+    frame = lines[lines.index("#0.02") + 1 : lines.index("#0.03")]
+    assert len(frame) == num_planes + 1 and frame[-1] == "-2"
+    # 航向不变，增量编码中偏航一列为空
+    assert all(line.endswith("|") for line in frame[:-1])
+
+    frame = lines[lines.index("#0.03") + 1 :]
+    assert [line.split(",")[0] for line in frame] == ["1", "3"]
+    assert "||" not in frame[0]
+
+
+def test_acmi_batch_writer_zip_and_decimation(tmp_path: Path):
+    print("In test acmi batch writer zip and decimation: ")
+
+    path = tmp_path / "trace.zip.acmi"
+    states = np.zeros((2, 6))
+    with AcmiBatchWriter(path, num_planes=2, frame_rate=10.0) as writer:
+        written = [writer.write_frame(i * 0.01, states + i) for i in range(100)]
+    assert sum(written) == 10 and writer.num_frames == 10
+
+    with zipfile.ZipFile(path) as zip_file:
+        assert zip_file.namelist() == ["trace.txt.acmi"]
+        text = zip_file.read("trace.txt.acmi").decode("utf-8")
+    assert [line for line in text.splitlines() if line.startswith("#")] == [
+        f"#{i / 10:.2f}" for i in range(10)
+    ]
+
+
+def test_acmi_batch_writer_fixed_point(tmp_path: Path):
+    print("In test acmi batch writer fixed point: ")
+
+    path = tmp_path / "trace.acmi"
+    states = np.array([[1e-7, 1.23e-5, 1e16, -1e-4, 2.5, 0.0]])
+    with AcmiBatchWriter(path, num_planes=1, decimals=(7, 7, 3, 3, 3, 0)) as writer:
+        writer.write_frame(0.0, states)
+
+    line = path.read_text().splitlines()[3]
+    fields = line.split(",")[1][len("T=") :].split("|")
+    assert fields == [
+        "0.0000001",
+        "0.0000123",
+        "10000000000000000.000",
+        "0.000",
+        "2.500",
+        "0",
+    ]
+    assert "e" not in ",".join(fields)
+
+
+def test_acmi_logger(tmp_path: Path):
+    print("In test acmi logger: ")
+
+    path = tmp_path / "trace.acmi"
+    with AcmiLogger(str(path), pilot="P{}", name="A430") as logger:
+        logger.writeTime(0.0)
+        logger.writeOnePlane(1, 120.0, 30.0, 10.0, 0.0, 0.0, 90.0, detailFlag=True)
+
+    line = path.read_text().splitlines()[-1]
+    assert line.startswith("1,T=120.0|30.0|10.000|0.000|0.000|90.000,Type=")
+    assert ",Pilot=P1," in line and line.endswith(",Name=A430")
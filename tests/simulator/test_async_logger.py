@@ -0,0 +1,114 @@
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from a430py.env.a430_gym import A430Gym
+from a430py.simulator.utils.a430_trajectory import (
+    TRAJECTORY_DTYPE,
+    TrajectoryRecorder,
+    load_trajectory,
+)
+from a430py.simulator.utils.acmiLogger import AcmiLogger
+from a430py.simulator.utils.async_logger import AcmiSink, AsyncLogger
+
+
+class BlockingSink(object):
+    """在release之前阻塞后台线程的sink"""
+
+    def __init__(self) -> None:
+        self.released = threading.Event()
+        self.times: list[float] = []
+
+    def write_records(self, records: np.ndarray) -> None:
+        self.released.wait()
+        self.times.extend(records["time"].tolist())
+
+
+def test_async_logger_with_gym(tmp_path: Path):
+    print("In test async logger with gym: ")
+
+    def run(recorder) -> None:
+        env = A430Gym(frame_skip=2, backend="numpy", recorder=recorder)
+        for _ in range(3):
+            env.reset()
+            for _ in range(20):
+                env.step(np.array([0.1, -1.998228, 0.0, 0.689030]))
+        recorder.close()
+
+    run(TrajectoryRecorder(tmp_path / "sync.a430traj"))
+    run(
+        AsyncLogger(
+            sinks=[
+                TrajectoryRecorder(tmp_path / "async.a430traj"),
+                AcmiSink(AcmiLogger(str(tmp_path / "async.acmi"))),
+            ],
+            capacity=16,
+            batch_size=5,
+        )
+    )
+
+    expected = load_trajectory(tmp_path / "sync.a430traj")
+    records = load_trajectory(tmp_path / "async.a430traj")
+    assert len(records) == 3 * (1 + 20 * 2)
+    assert np.array_equal(records, expected)
+
+    acmi_lines = (tmp_path / "async.acmi").read_text().splitlines()
+    time_lines = [line for line in acmi_lines if line.startswith("#")]
+    assert len(time_lines) == len(records)
+    # 每个episode 0.40s，episode之间相隔一拍(0.01s)
+    assert time_lines[-1] == f"#{2 * 0.41 + 0.40:.2f}"
+
+
+def test_acmi_sink_episodes(tmp_path: Path):
+    print("In test acmi sink episodes: ")
+
+    # 两个episode：新episode的第一帧不与上一个episode的最后一帧重叠
+    records = np.zeros(6, dtype=TRAJECTORY_DTYPE)
+    records["time"] = [0.0, 0.01, 0.02, 0.0, 0.01, 0.02]
+    sink = AcmiSink(AcmiLogger(str(tmp_path / "episodes.acmi")), step_time=0.01)
+    sink.write_records(records[:4])
+    sink.write_records(records[4:])
+    sink.close()
+
+    time_lines = [
+        line
+        for line in (tmp_path / "episodes.acmi").read_text().splitlines()
+        if line.startswith("#")
+    ]
+    assert time_lines == ["#0.00", "#0.01", "#0.02", "#0.03", "#0.04", "#0.05"]
+
+
+@pytest.mark.parametrize("drop_policy", ["drop_newest", "drop_oldest", "block"])
+def test_async_logger_drop_policy(drop_policy: str):
+    print("In test async logger drop policy: ")
+
+    sink = BlockingSink()
+    logger = AsyncLogger(
+        sinks=[sink],
+        capacity=4,
+        drop_policy=drop_policy,
+        block_timeout=0.05,
+        batch_size=1,
+    )
+    output = np.zeros((), dtype=np.dtype([("x", np.uint8, 96)]))
+    aircraft_input = np.zeros(4, dtype=np.float32)
+
+    # 后台线程取走第0条后阻塞，缓冲区再容纳4条
+    logger.record(0.0, output, aircraft_input)
+    while logger._count > 0:
+        time.sleep(0.001)
+    for i in range(1, 10):
+        logger.record(float(i), output, aircraft_input)
+
+    sink.released.set()
+    logger.close()
+
+    assert logger.num_recorded == 10
+    assert logger.num_dropped == 5
+    if drop_policy == "drop_oldest":
+        assert sink.times == [0.0, 6.0, 7.0, 8.0, 9.0]
+    else:
+        assert sink.times == [0.0, 1.0, 2.0, 3.0, 4.0]
@@ -0,0 +1,82 @@
+import json
+
+import numpy as np
+import pytest
+
+from a430py.env.a430_gym import A430Gym
+from a430py.simulator.a430_backend import A430Backend, A430ProfiledBackend
+from a430py.simulator.a430_sim import A430Simulator
+from a430py.simulator.utils.profiler import Profiler, StageStats
+
+
+def test_stage_stats_reservoir():
+    print("In test stage stats reservoir: ")
+
+    stats = StageStats(reservoir_size=100)
+    for elapsed_ns in range(1, 10001):
+        stats.add(elapsed_ns)
+
+    assert stats.count == 10000 and stats.total_ns == 10000 * 10001 // 2
+    assert stats.min_ns == 1 and stats.max_ns == 10000
+    assert len(stats.samples) == 100
+
+    summary = stats.summary(buckets_ns=(5000,))
+    assert summary["histogram"]["counts"][-1] == 100
+    assert 3000 < summary["quantiles_ns"]["0.5"] < 7000
+
+
+@pytest.mark.parametrize("backend", ["ctypes", "numpy"])
+def test_simulator_profiling(backend: str):
+    print("In test simulator profiling: ")
+
+    sim = A430Simulator(config={}, backend=backend)
+    sim.reset(fTAS=8)
+    assert sim.stats() == {}
+
+    profiler = sim.enable_profiling()
+    assert isinstance(sim.backend, A430ProfiledBackend)
+    assert isinstance(sim.backend, A430Backend)
+    for _ in range(5):
+        sim.step(fStickLon=-1.998228, fThrottle=0.689030)
+    sim.reset(fTAS=8, in_place=True)
+
+    stats = sim.stats()
+    assert stats["sim.step"]["count"] == 5
+    assert stats["backend.update"]["count"] == 5
+    assert stats["backend.set_input"]["count"] == 6
+    # step通过绑定的推进函数直接读取输出
+    assert stats["backend.read_output"]["count"] == 6
+    assert stats["sim.get_aircraft_output"]["count"] == 1
+    assert stats["sim.step"]["total_ns"] >= stats["backend.update"]["total_ns"]
+
+    json.loads(profiler.to_json())
+    text = profiler.to_prometheus()
+    assert 'a430_stage_duration_seconds_count{stage="sim.step"} 5' in text
+    assert 'a430_stage_duration_seconds_bucket{stage="sim.step",le="+Inf"} 5' in text
+
+    sim.disable_profiling()
+    assert "step" not in sim.__dict__
+    assert not isinstance(sim.backend, A430ProfiledBackend)
+    sim.step()
+    assert profiler.stats()["sim.step"]["count"] == 5
+
+
+def test_gym_profiling():
+    print("In test gym profiling: ")
+
+    env = A430Gym(frame_skip=2)
+    profiler = Profiler()
+    assert env.enable_profiling(profiler) is profiler
+    env.reset()
+    for _ in range(3):
+        env.step(np.array([0.0, -1.998228, 0.0, 0.689030]))
+
+    stats = env.stats()
+    assert stats["gym.step"]["count"] == 3
+    assert stats["gym.get_observation"]["count"] == 4
+    assert stats["sim.update"]["count"] == 3
+    # frame_skip的2拍在一次backend.update调用中完成
+    assert stats["backend.update"]["count"] == 3
+
+    env.disable_profiling()
+    assert env.stats() == {}
@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT_DIR = Path(__file__).parent.parent
+
+# import a430py的冷启动耗时上限，秒
+IMPORT_TIME_BUDGET = 0.05
+
+
+def run_python(code: str) -> str:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(PROJECT_ROOT_DIR / "src"), env.get("PYTHONPATH", "")]
+    )
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+def test_import_is_lazy():
+    print("In test import is lazy: ")
+
+    output = run_python(
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "import a430py\n"
+        "elapsed = time.perf_counter() - start\n"
+        "print(elapsed, 'gymnasium' in sys.modules, 'numpy' in sys.modules)\n"
+    )
+    elapsed, gymnasium_imported, numpy_imported = output.split()
+    assert gymnasium_imported == "False"
+    assert numpy_imported == "False"
+    assert float(elapsed) < IMPORT_TIME_BUDGET
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import a430py\nimport gymnasium as gym\n",
+        "import gymnasium as gym\nimport a430py\n",
+        "import a430py.env.a430_gym\nimport gymnasium as gym\n",
+    ],
+)
+def test_envs_registered(code: str):
+    print("In test envs registered: ")
+
+    output = run_python(
+        code + "print(sorted(k for k in gym.registry if k.startswith('A430')))\n"
+        "print(type(gym.make('A430Gym-v0', backend='numpy').unwrapped).__name__)\n"
+        "print(a430py.A430Simulator.__name__)\n"
+    )
+    assert output.split() == [
+        "['A430Gym-sharded-vec-v0',",
+        "'A430Gym-v0',",
+        "'A430Gym-vec-v0']",
+        "A430Gym",
+        "A430Simulator",
+    ]